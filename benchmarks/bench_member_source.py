@@ -0,0 +1,79 @@
+"""Benchmark for building a draw from the SQLite member source.
+
+Creates a member file with 500k members, a mix of statuses, join dates and
+suspensions, then times building a compact and a list RandomGenerator from
+the eligible ranges (the fast path) and from the streamed ids.
+
+Typical usage example:
+
+  python benchmarks/bench_member_source.py
+  python benchmarks/bench_member_source.py --members 100000 --repeat 3
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from datetime import date, timedelta
+from random import Random
+from statistics import median
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from member_source import SQLiteMemberSource
+from random_generator import RandomGenerator
+
+DRAW_DATE = date(2024, 6, 1)
+
+
+def member_rows(count: int, seed: int = 1):
+    """Yields (id, join_date, status, suspended_until) rows, about 85% of members are active"""
+    rng = Random(seed)
+    for member_id in range(1, count + 1):
+        join_date = DRAW_DATE - timedelta(days=rng.randrange(0, 3650))
+        roll = rng.random()
+        status = "active" if roll < 0.85 else "lapsed" if roll < 0.95 else "cancelled"
+        suspended_until = DRAW_DATE + timedelta(days=rng.randrange(-60, 60)) if rng.random() < 0.03 else None
+        yield member_id, join_date, status, suspended_until
+
+
+def timed(function, repeat: int) -> tuple:
+    """Returns (median seconds, last result) of calling function repeat times"""
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        result = function()
+        times.append(perf_counter() - start)
+    return median(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time building a draw from a SQLite member file")
+    parser.add_argument("--members", type=int, default=500000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        source = SQLiteMemberSource(os.path.join(directory, "members.db"), min_membership_days=30)
+        start = perf_counter()
+        source.add_members(member_rows(args.members))
+        print(f"loaded {args.members} members in {perf_counter() - start:.2f} s")
+
+        seconds, ranges = timed(lambda: source.eligible_ranges(DRAW_DATE), args.repeat)
+        print(f"eligible_ranges: {len(ranges)} ranges in {seconds*1000:.1f} ms")
+        seconds, count = timed(lambda: source.count(DRAW_DATE), args.repeat)
+        print(f"count: {count} eligible in {seconds*1000:.1f} ms")
+
+        for compact in (True, False):
+            seconds, ran_gen = timed(lambda: RandomGenerator.from_ranges(source.eligible_ranges(DRAW_DATE),
+                                                                         compact=compact), args.repeat)
+            print(f"from_ranges compact={compact}: {ran_gen.size} members in {seconds*1000:.1f} ms")
+            seconds, ran_gen = timed(lambda: RandomGenerator.from_numbers(source.eligible_ids(DRAW_DATE),
+                                                                          compact=compact), args.repeat)
+            print(f"from_numbers compact={compact}: {ran_gen.size} members in {seconds*1000:.1f} ms")
+        source.close()
+
+
+if __name__ == "__main__":
+    main()
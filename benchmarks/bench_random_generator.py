@@ -0,0 +1,131 @@
+"""Microbenchmark for RandomGenerator draw throughput.
+
+Compares the original pop-at-random-index pool with the swap-with-last
+pool in src/random_generator.py across pool sizes from 1e3 to 1e7, and times pool construction for a 1e6
+member range with 1e5 blacklisted numbers. Finally it compares start-up
+time and memory of the list pool and the compact pool for a 1e7 range.
+
+Typical usage example:
+
+  python benchmarks/bench_random_generator.py
+  python benchmarks/bench_random_generator.py --sizes 1000 100000 --draws 50000
+"""
+
+import argparse
+import os
+import sys
+import tracemalloc
+from random import randrange, sample
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from random_generator import RandomGenerator
+
+
+class LegacyRandomGenerator:
+    """The pool as it was before the swap-with-last engine, kept for comparison"""
+
+    def __init__(self, number_list):
+        self.number_list = list(number_list)
+        self.deleted_number_list = []
+        self.count = 0
+
+    def generate_number(self) -> str:
+        index = randrange(0,len(self.number_list),1)
+        value = self.number_list[index]
+        if (len(self.number_list) <= 1) or (self.count >= 20):
+            self.regenerate()
+        else:
+            self.deleted_number_list.append(value)
+            self.number_list.pop(index)
+            self.count += 1
+        return value
+
+    def regenerate(self) -> None:
+        for number in self.deleted_number_list:
+            self.number_list.append(number)
+        self.deleted_number_list = []
+        self.count = 0
+
+
+def draws_per_second(generator, draws: int) -> float:
+    """Returns how many generate_number calls the generator manages per second"""
+    generate_number = generator.generate_number
+    start = perf_counter()
+    for _ in range(draws):
+        generate_number()
+    return draws / (perf_counter() - start)
+
+
+def legacy_construction_seconds(min: int, max: int, blacklist: list) -> float:
+    """Times the original list-membership filter over the range, in seconds"""
+    start = perf_counter()
+    number_list = []
+    for number in range(min,max+1):
+        if number not in blacklist:
+            number_list.append(str(number))
+    return perf_counter() - start
+
+
+def construction_seconds(min: int, max: int, blacklist: list) -> float:
+    """Times RandomGenerator construction over the range, in seconds"""
+    start = perf_counter()
+    RandomGenerator(min, max, blacklist)
+    return perf_counter() - start
+
+
+def pool_footprint(min: int, max: int, blacklist: list, compact: bool) -> tuple:
+    """Returns (construction seconds, peak traced bytes) for building a pool"""
+    tracemalloc.start()
+    start = perf_counter()
+    generator = RandomGenerator(min, max, blacklist, compact=compact)
+    seconds = perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del generator
+    return seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[10**3, 10**4, 10**5, 10**6, 10**7])
+    parser.add_argument("--draws", type=int, default=20000)
+    parser.add_argument("--build-range", type=int, default=10**6)
+    parser.add_argument("--build-blacklist", type=int, default=10**5)
+    parser.add_argument("--memory-range", type=int, default=10**7)
+    parser.add_argument("--memory-blacklist", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{'pool size':>10} {'before (draws/s)':>18} {'after (draws/s)':>18} {'speedup':>8}")
+    for size in args.sizes:
+        after = RandomGenerator(1, size, ())
+        after_rate = draws_per_second(after, args.draws)
+        before = LegacyRandomGenerator(after.number_list)
+        del after
+        before_rate = draws_per_second(before, args.draws)
+        del before
+        print(f"{size:>10} {before_rate:>18,.0f} {after_rate:>18,.0f} {after_rate / before_rate:>7.1f}x")
+
+    # The old filter is O(range x blacklist), so it is timed on 1% of the
+    # range and scaled up rather than left to run for hours
+    blacklist = sample(range(1, args.build_range + 1), args.build_blacklist)
+    after_build = construction_seconds(1, args.build_range, blacklist)
+    sample_range = max(1, args.build_range // 100)
+    before_build = legacy_construction_seconds(1, sample_range, blacklist) * args.build_range / sample_range
+    print()
+    print(f"construction, range {args.build_range:,} with {args.build_blacklist:,} blacklisted:")
+    print(f"  before (estimated): {before_build:10.3f} s")
+    print(f"  after:              {after_build:10.3f} s")
+
+    blacklist = sample(range(1, args.memory_range + 1), args.memory_blacklist)
+    print()
+    print(f"start-up, range {args.memory_range:,} with {args.memory_blacklist:,} blacklisted:")
+    for label, compact in (("list pool", False), ("compact pool", True)):
+        seconds, peak = pool_footprint(1, args.memory_range, blacklist, compact)
+        print(f"  {label + ':':<14} {seconds:10.3f} s {peak / 1024:14,.1f} KiB peak")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark for the time from process start to the first StartPage frame.
+
+Launches src/main.py with --exit-after-first-frame, which quits as soon
+as the StartPage has been drawn, and times each launch from spawning the
+process until it exits cleanly. It also times importing main on
+its own, which is the part of startup that does not need a display.
+
+The launches share a new, empty asset cache in a temporary folder, so the
+first launch renders the static layers with PIL however warm the real
+cache is. It is reported on its own as the cold launch, and the launches
+after it read the layers from the cache.
+
+Typical usage example:
+
+  xvfb-run python benchmarks/bench_startup.py
+  python benchmarks/bench_startup.py --imports-only
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from statistics import median
+from time import perf_counter
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+
+def time_launch(cache: str) -> float:
+    """Returns the seconds from spawning main.py to it exiting after the first frame
+
+    Args:
+        cache: the folder the launch keeps its asset cache in
+    """
+    #asset_cache.cache_dir puts the cache under LOCALAPPDATA on Windows and XDG_CACHE_HOME elsewhere
+    env = dict(os.environ, LOCALAPPDATA=cache, XDG_CACHE_HOME=cache)
+    start = perf_counter()
+    process = subprocess.run([sys.executable, os.path.join(SRC_DIR, "main.py"), "--exit-after-first-frame"], env=env)
+    elapsed = perf_counter() - start
+    if process.returncode != 0:
+        raise RuntimeError(f"main.py exited with {process.returncode} before drawing the StartPage")
+    return elapsed
+
+
+def time_import() -> float:
+    """Returns the seconds a fresh interpreter takes to start and import main"""
+    start = perf_counter()
+    subprocess.run([sys.executable, "-c", "import main"], cwd=SRC_DIR, check=True)
+    return perf_counter() - start
+
+
+def time_interpreter() -> float:
+    """Returns the seconds a fresh interpreter takes to start and exit, the floor for the other timings"""
+    start = perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], check=True)
+    return perf_counter() - start
+
+
+def report(label: str, times: list) -> None:
+    print(f"{label}: median {median(times)*1000:.0f} ms, min {min(times)*1000:.0f} ms, max {max(times)*1000:.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time startup to the first StartPage frame")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--imports-only", action="store_true", help="only time importing main, no display needed")
+    args = parser.parse_args()
+
+    report("interpreter", [time_interpreter() for _ in range(args.repeat)])
+    report("import main", [time_import() for _ in range(args.repeat)])
+    if args.imports_only:
+        return
+
+    with tempfile.TemporaryDirectory() as cache:
+        print(f"cold launch: {time_launch(cache)*1000:.0f} ms")
+        report("first frame", [time_launch(cache) for _ in range(args.repeat)])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+"""Fairness harness for the draw.
+
+Runs millions of simulated draws across a process pool and tests whether
+every eligible member wins as often as they should. Five models are
+simulated:
+
+  generator         the numbers RandomGenerator.generate_number shows on
+                    the reel, including its take-20-then-regenerate cycle
+  session           the predetermined winners, drawn by DrawSession for
+                    every prize tier of a session, as the app draws them
+  weighted_session  the same with weights, as when weights.csv exists
+  exhaustive_session
+                    weighted sessions that draw all but one member of a
+                    small pool, so the alias table is rebuilt mid-session as
+                    most of its weight is won
+  reel              the free spin: the reel wraps in numbers from
+                    generate_number as it idles and spins, and the winner is
+                    whichever box stops under the pointer, the same
+                    arithmetic as Reel.move, Reel.box_under and Reel.next_box
+
+Each model reports a chi-square goodness-of-fit test of its counts against
+their expected values, with the p-value from the Wilson-Hilferty normal
+approximation, and a per-member table of counts and standardised
+residuals. The generator and reel models are expected to be uniform. In a
+session, draw k picks member m with probability weight(m)/W_k, where W_k is
+the weight of the members that have not won yet (every weight is 1 without
+weights), so each member's expected count is the sum of those
+probabilities over the draws before they won. The session models also
+count sessions in which a member won twice, which must never happen.
+
+Draws from the generator and within a session are not independent (they
+are without replacement), so their counts vary a little less than a
+multinomial's and their p-values lean high. Any number that should never
+come up, such as a blacklisted one or one with a weight of zero, counts as
+an ineligible hit.
+
+Counting is done with collections.Counter over C-level iterators rather
+than one Python call per draw, in place of array-vectorised counting, so
+the harness needs only the standard library.
+
+Typical usage example:
+
+  python benchmarks/fairness.py --output fairness_report.json --report-dir fairness
+  python benchmarks/fairness.py --draws 1000000 --sessions 100000 --spins 100000 --weights weights.csv
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import Counter
+from itertools import islice
+from math import erfc, sqrt
+from multiprocessing import Pool
+from random import Random
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from blacklist import load_blacklist
+from draw_session import DrawSession
+from random_generator import RandomGenerator
+from spin_curve import SpinCurve
+from weighted_generator import WeightedGenerator, load_weights
+
+NUM_BOXES = 7
+#Idle scroll speed in pixels per second, as GenerationPage.IDLE_SPEED
+IDLE_SPEED = 1/0.016
+
+
+def reel_geometry(screen_width: int, num_boxes: int = NUM_BOXES) -> tuple:
+    """Returns (box_width, pitch) of the reel's boxes on a screen, as NumberBox and Reel compute them"""
+    padding = screen_width//100
+    border_width = screen_width//150
+    rectangle_width = (screen_width - border_width*(num_boxes - 2) - padding*(num_boxes - 1))/(num_boxes - 2)
+    box_width = rectangle_width + border_width
+    return box_width, box_width + padding
+
+
+def free_spin_distance() -> float:
+    """Returns how far the free spin travels at exactly 16 ms a frame, as GenerationPage.run_normal_animation moves it"""
+    distance = 0
+    elapsed = 0
+    while True:
+        elapsed += 0.016
+        dx = 150*pow(2,-0.6*elapsed) - 0.3
+        if dx <= 0:
+            return distance
+        distance += dx
+
+
+def count_generator(ran_gen: RandomGenerator, draws: int, rng: Random, options: dict) -> Counter:
+    """Counts draws numbers from generate_number"""
+    return Counter(islice(iter(ran_gen.generate_number, None), draws))
+
+
+def count_reel(ran_gen: RandomGenerator, spins: int, rng: Random, options: dict) -> Counter:
+    """Counts the winners of spins free spins, each after a random idle time
+
+    The reel state carries over from spin to spin as it does on screen.
+    """
+    box_width, pitch = options["box_width"], options["pitch"]
+    pointer_x = options["pointer_x"]
+    spin_distance = options["spin_distance"]
+    idle_min, idle_max = options["idle_seconds"]
+    generate_number = ran_gen.generate_number
+
+    numbers = [generate_number() for _ in range(NUM_BOXES)]
+    head = 0
+    head_x = -box_width
+    winners = Counter()
+    for _ in range(spins):
+        distance = rng.uniform(idle_min, idle_max)*IDLE_SPEED + spin_distance
+        head_x -= distance
+        #Every box that leaves the left edge wraps to the right with a new number
+        while head_x <= -box_width:
+            numbers[head] = generate_number()
+            head = (head + 1) % NUM_BOXES
+            head_x += pitch
+        offset = pointer_x - head_x
+        slot = int(offset // pitch)
+        if offset - slot*pitch >= box_width:
+            #Stopped in a gap, check_final_pos brings the next box up to the pointer
+            slot += 1
+        winners[numbers[(head + slot) % NUM_BOXES]] += 1
+    return winners
+
+
+def count_sessions(sessions: int, rng: Random, min_number: int, max_number: int, blacklist: list,
+                   weights: dict, tiers: list) -> dict:
+    """Counts the winners of sessions DrawSessions, and what each member is expected to win
+
+    Returns a tally with:
+      counts       winner -> wins
+      inverse_sum  the sum of 1/W_k over every draw, W_k the weight left before draw k
+      after_win    member -> the sum of 1/W_k over the draws after they won
+      repeats      sessions in which a member won more than once
+    A member's expected wins are weight*(inverse_sum - after_win[member]).
+    """
+    total_weight = (WeightedGenerator(min_number, max_number, blacklist, weights, 0).total_weight
+                    if weights is not None else RandomGenerator(min_number, max_number, blacklist, compact=True).size)
+    counts = Counter()
+    after_win = Counter()
+    inverse_sum = 0
+    repeats = 0
+    for _ in range(sessions):
+        session = DrawSession(min_number, max_number, blacklist, tiers, weights, rng.getrandbits(64))
+        left = total_weight
+        won = []
+        inverses = []
+        while not session.finished():
+            number = session.draw_winner()[1]
+            inverses.append(1/left)
+            if number not in won:
+                #A repeat winner's weight was already taken off
+                left -= 1 if weights is None else weights.get(int(number), 1)
+            won.append(number)
+        counts.update(won)
+        inverse_sum += sum(inverses)
+        for draw, number in enumerate(won):
+            after_win[number] += sum(inverses[draw + 1:])
+        repeats += len(won) != len(set(won))
+    return {"counts": counts, "inverse_sum": inverse_sum, "after_win": after_win, "repeats": repeats}
+
+
+MODELS = {"generator": count_generator, "session": count_sessions, "weighted_session": count_sessions,
+          "exhaustive_session": count_sessions, "reel": count_reel}
+SESSION_MODELS = ("session", "weighted_session", "exhaustive_session")
+
+
+def run_chunk(task: tuple) -> dict:
+    """Worker: runs one chunk of a model with its own seeded generator, returns its tally"""
+    model, seed, draws, min_number, max_number, blacklist, options = task
+    rng = Random(seed ^ 0x5DEECE66D)
+    if model in SESSION_MODELS:
+        weights = None if model == "session" else options["weights"]
+        tiers = options["exhaustive_tiers"] if model == "exhaustive_session" else options["tiers"]
+        return count_sessions(draws, rng, min_number, max_number, blacklist, weights, tiers)
+    ran_gen = RandomGenerator(min_number, max_number, blacklist, compact=options["compact"], seed=seed)
+    return {"counts": MODELS[model](ran_gen, draws, rng, options)}
+
+
+def merge(tally: dict, chunk: dict) -> None:
+    """Adds a chunk's tally to the model's tally"""
+    for key, value in chunk.items():
+        if isinstance(value, Counter):
+            tally.setdefault(key, Counter()).update(value)
+        else:
+            tally[key] = tally.get(key, 0) + value
+
+
+def expected_counts(model: str, tally: dict, eligible: list, weights: dict) -> dict:
+    """Returns number string -> expected count for every member that can come up"""
+    if model not in SESSION_MODELS:
+        draws = sum(tally["counts"].values())
+        return {number: draws/len(eligible) for number in eligible}
+    inverse_sum, after_win = tally["inverse_sum"], tally["after_win"]
+    expected = {}
+    for number in eligible:
+        weight = 1 if model == "session" else weights.get(int(number), 1)
+        if weight > 0:
+            expected[number] = weight*(inverse_sum - after_win.get(number, 0))
+    return expected
+
+
+def chi_square_p_value(statistic: float, dof: int) -> float:
+    """Returns the upper tail p-value of a chi-square statistic, by the Wilson-Hilferty approximation"""
+    if dof <= 0:
+        return 1.0
+    z = ((statistic/dof)**(1/3) - (1 - 2/(9*dof))) / sqrt(2/(9*dof))
+    return 0.5*erfc(z/sqrt(2))
+
+
+def fit_report(counts: Counter, expected: dict) -> tuple:
+    """Returns (summary, rows) for counts of draws against each member's expected count
+
+    rows are (number, count, expected, z) with z the standardised residual of the count.
+    """
+    draws = sum(counts.values())
+    members = len(expected)
+    rows = []
+    statistic = 0
+    for number, expected_count in expected.items():
+        count = counts.get(number, 0)
+        statistic += (count - expected_count)**2/expected_count
+        sigma = sqrt(expected_count*(1 - expected_count/draws)) if draws > expected_count else 1
+        rows.append((number, count, expected_count, (count - expected_count)/sigma))
+    over_3_sigma = sum(1 for row in rows if abs(row[3]) > 3)
+    summary = {
+        "draws": draws,
+        "members": members,
+        "expected_per_member": draws/members,
+        "chi_square": statistic,
+        "dof": members - 1,
+        "p_value": chi_square_p_value(statistic, members - 1),
+        "min_count": min(row[1] for row in rows),
+        "max_count": max(row[1] for row in rows),
+        "max_abs_z": max(abs(row[3]) for row in rows),
+        "members_over_3_sigma": over_3_sigma,
+        #Two-sided tail of the normal beyond 3 sigma
+        "expected_over_3_sigma": members*erfc(3/sqrt(2)),
+        "ineligible_hits": sum(count for number, count in counts.items() if number not in expected),
+    }
+    return summary, rows
+
+
+def split(total: int, chunk: int) -> list:
+    """Splits total draws into chunk sized pieces"""
+    return [min(chunk, total - start) for start in range(0, total, chunk)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate many draws and test that every member wins as often as they should")
+    parser.add_argument("--min", type=int, default=1)
+    parser.add_argument("--max", type=int, default=600)
+    parser.add_argument("--blacklist", nargs="*", default=[os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                                        "..", "blacklist.csv")])
+    parser.add_argument("--models", nargs="+", choices=list(MODELS), default=list(MODELS))
+    parser.add_argument("--draws", type=int, default=20_000_000, help="generate_number draws")
+    parser.add_argument("--sessions", type=int, default=500_000, help="draw sessions of the session model")
+    parser.add_argument("--weighted-sessions", type=int, default=100_000,
+                        help="draw sessions of the weighted session model, each builds an alias table")
+    parser.add_argument("--exhaustive-sessions", type=int, default=100_000,
+                        help="draw sessions of the exhaustive session model")
+    parser.add_argument("--exhaustive-members", type=int, default=20,
+                        help="numbers from --min in the exhaustive session's pool")
+    parser.add_argument("--tiers", default="3,2,1", help="winners per prize tier of each session")
+    parser.add_argument("--weights", help="weights csv for the weighted session, by default 1 to 4 entries by number")
+    parser.add_argument("--spins", type=int, default=1_000_000, help="free spins of the reel model")
+    parser.add_argument("--chunk", type=int, default=500_000, help="draws per worker task")
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=20240601, help="base seed, each chunk gets its own")
+    parser.add_argument("--compact", action="store_true", help="simulate the compact pool instead of the list pool")
+    parser.add_argument("--screen-width", type=int, default=1920)
+    parser.add_argument("--output", default="fairness_report.json")
+    parser.add_argument("--report-dir", help="write a per-member csv for each model here")
+    args = parser.parse_args()
+
+    blacklist = load_blacklist(*args.blacklist) if args.blacklist else []
+    exhaustive_max = args.min + args.exhaustive_members - 1
+    eligible_gen = RandomGenerator(args.min, args.max, blacklist, compact=True)
+    eligible = [eligible_gen.select(rank) for rank in range(eligible_gen.size)]
+    exhaustive_eligible = [number for number in eligible if int(number) <= exhaustive_max]
+    if args.weights:
+        weights = load_weights(args.weights)
+    else:
+        weights = {number: number % 4 + 1 for number in range(args.min, args.max + 1)}
+    box_width, pitch = reel_geometry(args.screen_width)
+    options = {
+        "compact": args.compact,
+        "box_width": box_width,
+        "pitch": pitch,
+        "pointer_x": args.screen_width//2,
+        "spin_distance": free_spin_distance(),
+        "idle_seconds": (2, 60),
+        "tiers": DrawSession.numbered_tiers([int(count) for count in args.tiers.split(",")]),
+        "weights": weights,
+        #Leaves one member, zero weight members can not win
+        "exhaustive_tiers": [("All", sum(1 for number in exhaustive_eligible if weights.get(int(number), 1) > 0) - 1)],
+    }
+    totals = {"generator": args.draws, "session": args.sessions, "weighted_session": args.weighted_sessions,
+              "exhaustive_session": args.exhaustive_sessions, "reel": args.spins}
+    #Reel and session chunks are far slower per draw, keep their tasks a similar length
+    chunks = {"generator": args.chunk, "session": max(1, args.chunk//50), "weighted_session": max(1, args.chunk//100),
+              "exhaustive_session": max(1, args.chunk//50), "reel": max(1, args.chunk//50)}
+
+    results = {
+        "min": args.min,
+        "max": args.max,
+        "blacklisted": len(blacklist),
+        "processes": args.processes,
+        "predetermined_spin_distance": SpinCurve.natural_distance(),
+        "options": {key: value for key, value in options.items() if key != "weights"},
+        "weights": args.weights,
+        "models": {},
+    }
+    if args.report_dir:
+        os.makedirs(args.report_dir, exist_ok=True)
+    with Pool(args.processes) as pool:
+        for model in args.models:
+            max_number = exhaustive_max if model == "exhaustive_session" else args.max
+            tasks = [(model, args.seed*1_000_003 + index, draws, args.min, max_number, list(blacklist), options)
+                     for index, draws in enumerate(split(totals[model], chunks[model]))]
+            start = perf_counter()
+            tally = {}
+            for chunk in pool.imap_unordered(run_chunk, tasks):
+                merge(tally, chunk)
+            seconds = perf_counter() - start
+            model_eligible = exhaustive_eligible if model == "exhaustive_session" else eligible
+            summary, rows = fit_report(tally["counts"], expected_counts(model, tally, model_eligible, weights))
+            if "repeats" in tally:
+                summary["sessions_with_repeat_winners"] = tally["repeats"]
+            summary["seconds"] = seconds
+            summary["draws_per_s"] = summary["draws"]/seconds
+            results["models"][model] = summary
+            print(f"{model}: {summary['draws']} draws in {seconds:.1f} s, chi-square {summary['chi_square']:.1f} "
+                  f"on {summary['dof']} dof, p = {summary['p_value']:.4f}, "
+                  f"{summary['members_over_3_sigma']} members beyond 3 sigma "
+                  f"(expected {summary['expected_over_3_sigma']:.1f}), {summary['ineligible_hits']} ineligible hits"
+                  + (f", {tally['repeats']} sessions with a repeat winner" if "repeats" in tally else ""))
+            if args.report_dir:
+                with open(os.path.join(args.report_dir, f"{model}.csv"), "w", newline="") as report_file:
+                    report_writer = csv.writer(report_file)
+                    report_writer.writerow(["number", "count", "expected", "z"])
+                    report_writer.writerows(rows)
+
+    with open(args.output, "w") as output_file:
+        json.dump(results, output_file, indent=2)
+    print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
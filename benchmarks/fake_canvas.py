@@ -0,0 +1,107 @@
+"""A stand-in for tk.Canvas that keeps item coordinates in Python.
+
+It lets the reel code be timed without a display. Every call is counted
+so benchmarks can also report how many canvas operations a frame costs.
+"""
+
+
+class FakeCanvas:
+    """Records canvas items and counts the calls made against them
+
+    Attributes:
+        calls: the number of canvas methods called since creation or reset_calls
+        items: a dict of item id -> dict with "coords", "tags" and options
+    """
+
+    def __init__(self, width: int = 1920, height: int = 432, char_width: float = 0.6):
+        self.width = width
+        self.height = height
+        self.char_width = char_width
+        self.calls = 0
+        self.items = {}
+        self._next_id = 1
+
+    def reset_calls(self) -> None:
+        self.calls = 0
+
+    def _create(self, coords, options) -> int:
+        self.calls += 1
+        item = self._next_id
+        self._next_id += 1
+        tags = options.pop("tags", ())
+        if isinstance(tags, str):
+            tags = (tags,)
+        self.items[item] = {"coords": list(coords), "tags": tuple(tags), "options": options}
+        return item
+
+    def _find(self, tag_or_id) -> list:
+        if tag_or_id in self.items:
+            return [self.items[tag_or_id]]
+        return [item for item in self.items.values() if tag_or_id in item["tags"]]
+
+    def create_rectangle(self, *coords, **options) -> int:
+        return self._create(coords, options)
+
+    def create_text(self, *coords, **options) -> int:
+        return self._create(coords, options)
+
+    def create_image(self, *coords, **options) -> int:
+        return self._create(coords, options)
+
+    def create_polygon(self, *coords, **options) -> int:
+        return self._create(coords, options)
+
+    def bbox(self, tag_or_id):
+        self.calls += 1
+        item = self._find(tag_or_id)[0]
+        x, y = item["coords"][:2]
+        font = item["options"].get("font")
+        size = abs(font["size"]) if font is not None else 12
+        width = size * self.char_width * len(str(item["options"].get("text", "")))
+        return (int(x - width/2), int(y - size/2), int(x + width/2), int(y + size/2))
+
+    def move(self, tag_or_id, dx, dy) -> None:
+        self.calls += 1
+        for item in self._find(tag_or_id):
+            coords = item["coords"]
+            for i in range(0, len(coords), 2):
+                coords[i] += dx
+                coords[i + 1] += dy
+
+    def moveto(self, tag_or_id, x, y) -> None:
+        self.calls += 1
+        for item in self._find(tag_or_id):
+            coords = item["coords"]
+            dx = x - coords[0]
+            dy = y - coords[1]
+            for i in range(0, len(coords), 2):
+                coords[i] += dx
+                coords[i + 1] += dy
+
+    def coords(self, tag_or_id, *coords):
+        self.calls += 1
+        item = self._find(tag_or_id)[0]
+        if coords:
+            item["coords"] = list(coords)
+        return item["coords"]
+
+    def itemconfig(self, tag_or_id, **options) -> None:
+        self.calls += 1
+        tags = options.pop("tags", None)
+        for item in self._find(tag_or_id):
+            if tags is not None:
+                item["tags"] = (tags,) if isinstance(tags, str) else tuple(tags)
+            item["options"].update(options)
+
+    def itemcget(self, tag_or_id, option):
+        self.calls += 1
+        return self._find(tag_or_id)[0]["options"][option]
+
+    def tag_raise(self, tag_or_id, above=None) -> None:
+        self.calls += 1
+
+    def delete(self, tag_or_id) -> None:
+        self.calls += 1
+        for item_id in [item_id for item_id, item in self.items.items()
+                        if item_id == tag_or_id or tag_or_id in item["tags"]]:
+            del self.items[item_id]
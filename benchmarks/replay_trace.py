@@ -0,0 +1,156 @@
+"""Replays a recorded draw and reports its frame cost and Tcl calls.
+
+Record a run by launching the app with --record-trace, which writes the
+trace when the app closes. Replaying it drives a real GenerationPage with
+the recorded clock, space presses and seeds (see src/draw_trace.py), so
+every version of the code replays the exact same frames and winners and
+only their cost changes. Frames run back to back with no waiting, each
+followed by one app.update() for the redraw and idle work.
+
+For each frame it times the frame loop's callbacks and the update after it,
+and counts the Tcl commands the frame called, through a proxy in front of
+the app's Tcl interpreter. The replay's winners are checked against the
+recorded ones. Winners go to a temporary journal and nothing is saved to
+the session snapshot.
+
+Needs a display, use xvfb-run on a headless machine.
+
+Typical usage example:
+
+  python src/main.py --record-trace spin.trace
+  xvfb-run python benchmarks/replay_trace.py spin.trace --output replay_results.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from collections import Counter
+from statistics import mean
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from draw_journal import DrawJournal
+from draw_trace import TraceReplayer, load_trace
+from frame_stats import FrameStats
+from generator_app import GeneratorApp
+from generation_page import GenerationPage
+from start_page import StartPage
+
+
+class CountingTk:
+    """Forwards to a Tcl interpreter, counting the commands called through it while counting is True
+
+    Widget commands are counted by their subcommand, e.g. "<widget> coords".
+
+    Attributes:
+        tkapp: the real interpreter
+        counting: whether calls are counted
+        commands: command name -> number of calls
+        calls: the total number of calls counted
+    """
+
+    def __init__(self, tkapp) -> None:
+        self.tkapp = tkapp
+        self.counting = False
+        self.commands = Counter()
+        self.calls = 0
+
+    def call(self, *args):
+        if self.counting:
+            #tkinter sometimes passes the whole command as one tuple
+            words = args[0] if len(args) == 1 and isinstance(args[0], tuple) else args
+            name = str(words[0])
+            if name.startswith(".") and len(words) > 1:
+                name = f"<widget> {words[1]}"
+            self.commands[name] += 1
+            self.calls += 1
+        return self.tkapp.call(*args)
+
+    def __getattr__(self, name):
+        return getattr(self.tkapp, name)
+
+
+def summary(values: list) -> dict:
+    """Returns the mean, median, p95, p99 and max of values"""
+    return {
+        "mean": mean(values) if values else 0.0,
+        "p50": FrameStats.percentile(values, 0.5),
+        "p95": FrameStats.percentile(values, 0.95),
+        "p99": FrameStats.percentile(values, 0.99),
+        "max": max(values, default=0.0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded draw and report its frame cost and Tcl calls")
+    parser.add_argument("trace", help="a trace written by main.py --record-trace")
+    parser.add_argument("--output", default="replay_results.json")
+    parser.add_argument("--top", type=int, default=15, help="how many of the most called Tcl commands to report")
+    args = parser.parse_args()
+
+    trace = load_trace(args.trace)
+    fonts = {"title": ("Poppins", 40, "bold"), "start_page": ("Poppins", 22), "instruction": ("Poppins", 12)}
+    app = GeneratorApp()
+    #Widgets take their interpreter from their master, so the proxy goes in before the pages are created
+    tcl = CountingTk(app.tk)
+    app.tk = tcl
+    app.frame.tk = tcl
+    start_page = StartPage(parent=app.frame, app=app, fonts=fonts, background_colour="#253556")
+    page = GenerationPage(parent=app.frame, app=app, start_page=start_page, background_colour="#253556")
+    app.add_frame(start_page, "StartPage")
+    app.add_frame(page, "GenerationPage")
+    journal_dir = tempfile.TemporaryDirectory()
+    page.journal = DrawJournal(os.path.join(journal_dir.name, "draws.journal"))
+    replayer = TraceReplayer(trace, page)
+    app.show_frame("GenerationPage")
+    app.update()
+
+    frame_ms = []
+    update_ms = []
+    tcl_calls = []
+    while True:
+        replayer.fire_due_events()
+        app.update()
+        tcl.counting = True
+        calls = tcl.calls
+        start = perf_counter()
+        ran = replayer.run_frame()
+        frame_end = perf_counter()
+        tcl.counting = False
+        if not ran:
+            break
+        app.update()
+        frame_ms.append((frame_end - start)*1000)
+        update_ms.append((perf_counter() - frame_end)*1000)
+        tcl_calls.append(tcl.calls - calls)
+    page.journal.close()
+    app.destroy()
+    journal_dir.cleanup()
+
+    results = {
+        "trace": args.trace,
+        "recorded_frames": replayer.frames,
+        "replayed_frames": len(frame_ms),
+        "winners_match": replayer.winners == trace["winners"],
+        "event_mismatches": replayer.mismatches,
+        "frame_ms": summary(frame_ms),
+        "update_ms": summary(update_ms),
+        "tcl_calls_per_frame": summary(tcl_calls),
+        "tcl_calls": sum(tcl_calls),
+        "top_tcl_commands": dict(tcl.commands.most_common(args.top)),
+    }
+    with open(args.output, "w") as output_file:
+        json.dump(results, output_file, indent=2)
+    print(f"replayed {results['replayed_frames']} of {results['recorded_frames']} frames, "
+          f"frame p50 {results['frame_ms']['p50']:.2f} ms p99 {results['frame_ms']['p99']:.2f} ms, "
+          f"{results['tcl_calls_per_frame']['mean']:.1f} Tcl calls a frame, "
+          f"winners {'match' if results['winners_match'] else 'DIFFER'}")
+    print(f"wrote {args.output}")
+    sys.exit(0 if results["winners_match"] and results["event_mismatches"] == 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Soak test for repeated draws on one GenerationPage.
+
+Runs many full draw cycles (StartPage.next_page, idle frames, a spin, the
+winner window and the reset) against a real Tk app and checks that memory,
+widgets, canvas items and scheduled callbacks stay flat. Spins and the winner
+reveal are shortened so 1,000 cycles finish in a few minutes.
+
+Needs a display, use xvfb-run on a headless machine.
+
+Typical usage example:
+
+  xvfb-run python benchmarks/soak_generation_page.py --cycles 1000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+from time import sleep
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from draw_journal import DrawJournal
+from generator_app import GeneratorApp
+from generation_page import GenerationPage
+from start_page import StartPage
+
+
+def pump(app, frames: int) -> None:
+    """Runs the Tk event loop for roughly frames animation frames"""
+    for _ in range(frames):
+        app.update()
+        sleep(0.016)
+
+
+def snapshot(app, page, cycle: int) -> dict:
+    """Returns the resource counts that must stay flat across draw cycles"""
+    return {
+        "cycle": cycle,
+        "traced_kib": tracemalloc.get_traced_memory()[0] / 1024,
+        "widgets": len(page.winfo_children()),
+        "reel_canvas_items": len(page.number_canvas.find_all()),
+        "scheduled_callbacks": len(app.tk.splitlist(app.tk.call("after", "info"))),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run repeated draws and check resources stay flat")
+    parser.add_argument("--cycles", type=int, default=1000)
+    parser.add_argument("--every", type=int, default=100, help="record resource counts every N cycles")
+    parser.add_argument("--max-growth-kib", type=float, default=512)
+    args = parser.parse_args()
+
+    fonts = {"title": ("Poppins", 40, "bold"), "start_page": ("Poppins", 22), "instruction": ("Poppins", 12)}
+    app = GeneratorApp()
+    start_page = StartPage(parent=app.frame, app=app, fonts=fonts, background_colour="#253556")
+    page = GenerationPage(parent=app.frame, app=app, start_page=start_page,
+                          background_colour="#253556", predetermined_winner=True)
+    app.add_frame(start_page, "StartPage")
+    app.add_frame(page, "GenerationPage")
+    page.spin_duration = 0.05
+    page.winner_reveal_delay = 1
+    #Keep the soak's winners out of the real draw journal
+    journal_dir = tempfile.TemporaryDirectory()
+    page.journal = DrawJournal(os.path.join(journal_dir.name, "draws.journal"))
+
+    tracemalloc.start()
+    samples = []
+    for cycle in range(1, args.cycles + 1):
+        start_page.next_page("600")
+        pump(app, 3)
+        page.space_pressed(None)
+        while not page.winner_shown:
+            pump(app, 1)
+        page.space_pressed(None)
+        pump(app, 1)
+        if cycle == 1 or cycle % args.every == 0:
+            samples.append(snapshot(app, page, cycle))
+            print(json.dumps(samples[-1]))
+    app.destroy()
+    journal_dir.cleanup()
+
+    #The first cycle builds the page, so growth is measured from the first recorded sample after it
+    baseline = samples[1] if len(samples) > 2 else samples[0]
+    last = samples[-1]
+    growth = last["traced_kib"] - baseline["traced_kib"]
+    flat = (growth <= args.max_growth_kib
+            and all(last[key] == baseline[key] for key in ("widgets", "reel_canvas_items", "scheduled_callbacks")))
+    print(f"memory growth {growth:.1f} KiB from cycle {baseline['cycle']} to {last['cycle']}: {'flat' if flat else 'GROWING'}")
+    sys.exit(0 if flat else 1)
+
+
+if __name__ == "__main__":
+    main()
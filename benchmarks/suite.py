@@ -0,0 +1,246 @@
+"""Benchmark suite for the draw engine and the reel frame loop.
+
+Writes the results to a JSON file so releases can be compared. Under each
+result key it times:
+
+  generator    RandomGenerator construction and generate_number throughput
+  weighted     the same for WeightedGenerator's alias table
+  blacklist    blacklist csv parsing
+  frame        moving all 7 number boxes for one frame
+  final_pos    finding the box under the pointer when a spin stops
+  glyph_tiles  rendering a reel number tile, and with --tk a glyph cache miss and hit
+
+The reel benchmarks use benchmarks/fake_canvas.py by default. Pass --tk to
+time them against a real Tk canvas instead (e.g. under xvfb-run).
+
+Typical usage example:
+
+  python benchmarks/suite.py --output bench_results.json
+  xvfb-run python benchmarks/suite.py --tk --quick
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+from datetime import datetime, timezone
+from random import randint, sample
+from statistics import median
+from time import perf_counter
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARK_DIR, "..", "src"))
+sys.path.insert(0, BENCHMARK_DIR)
+
+from blacklist import load_blacklist
+from fake_canvas import FakeCanvas
+from glyph_cache import GlyphCache
+from number_box import NumberBox
+from random_generator import RandomGenerator
+from reel import Reel
+from weighted_generator import WeightedGenerator
+
+NUM_BOXES = 7
+
+
+def measure(function, repeat: int, number: int = 1) -> dict:
+    """Times number calls of function, repeat times, and summarises the per-call seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = perf_counter()
+        for _ in range(number):
+            function()
+        timings.append((perf_counter() - start) / number)
+    return {"min": min(timings), "median": median(timings), "max": max(timings),
+            "repeat": repeat, "number": number}
+
+
+def bench_generator(ranges: list, blacklist_sizes: list, draws: int, repeat: int) -> list:
+    """RandomGenerator construction time and draws per second for each range and blacklist size"""
+    results = []
+    for max_number in ranges:
+        for blacklist_size in blacklist_sizes:
+            if blacklist_size >= max_number:
+                continue
+            blacklist = sample(range(1, max_number + 1), blacklist_size)
+            for compact in (False, True):
+                construction = measure(lambda: RandomGenerator(1, max_number, blacklist, compact=compact), repeat)
+                ran_gen = RandomGenerator(1, max_number, blacklist, compact=compact)
+                draw = measure(ran_gen.generate_number, repeat, draws)
+                results.append({"range": max_number, "blacklist": blacklist_size, "compact": compact,
+                                "construction_s": construction, "draw_s": draw,
+                                "draws_per_s": 1 / draw["median"]})
+    return results
+
+
+def bench_weighted(ranges: list, draws: int, repeat: int) -> list:
+    """WeightedGenerator build time, draws per second, and draws per second after a tenth of the weight was removed"""
+    results = []
+    for max_number in ranges:
+        #One member in ten holds 2 to 5 entries
+        weights = {number: randint(2, 5) for number in range(1, max_number + 1, 10)}
+        construction = measure(lambda: WeightedGenerator(1, max_number, [], weights), repeat)
+        ran_gen = WeightedGenerator(1, max_number, [], weights)
+        draw = measure(ran_gen.generate_number, repeat, draws)
+        ran_gen.exclude(range(1, max_number + 1, 10))
+        draw_after_exclude = measure(ran_gen.generate_number, repeat, draws)
+        results.append({"range": max_number, "weighted_members": len(weights),
+                        "construction_s": construction, "draw_s": draw,
+                        "draws_per_s": 1 / draw["median"],
+                        "draws_per_s_after_exclude": 1 / draw_after_exclude["median"]})
+    return results
+
+
+def write_blacklist_csv(filepath: str, numbers: list, columns: int = 10) -> None:
+    """Writes numbers to a csv laid out like blacklist.csv, with some empty cells"""
+    with open(filepath, "w", newline="") as csv_file:
+        for start in range(0, len(numbers), columns):
+            row = [str(number) for number in numbers[start:start + columns]]
+            csv_file.write(",".join(row) + ",,\n")
+
+
+def bench_blacklist(sizes: list, repeat: int) -> list:
+    """load_blacklist parse time for generated csv files of each size, uncached and cached"""
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            filepath = os.path.join(directory, f"blacklist_{size}.csv")
+            write_blacklist_csv(filepath, sample(range(1, size * 10 + 1), size))
+            parse = measure(lambda: load_blacklist(filepath, cache=False), repeat)
+            cached = measure(lambda: load_blacklist(filepath), repeat)
+            results.append({"numbers": size, "bytes": os.path.getsize(filepath), "parse_s": parse,
+                            "cached_s": cached})
+    return results
+
+
+def make_canvas(use_tk: bool, width: int, height: int):
+    """Returns (canvas, font, root) for the reel benchmarks, root is None for the fake canvas"""
+    font_size = -(int((width/(NUM_BOXES-2))/2.5))
+    if not use_tk:
+        return FakeCanvas(width, height), {"size": font_size}, None
+    import tkinter as tk
+    from tkinter.font import Font
+    root = tk.Tk()
+    canvas = tk.Canvas(root, width=width, height=height, borderwidth=0, highlightthickness=0)
+    canvas.pack()
+    font = Font(root, family="Segoe")
+    font["size"] = font_size
+    root.update()
+    return canvas, font, root
+
+
+def build_reel(canvas, font, width: int, height: int) -> Reel:
+    """Creates and places the 7 number boxes the same way GenerationPage.setup does"""
+    ran_gen = RandomGenerator(1, 600, [])
+    numbers = [NumberBox(canvas, font, NUM_BOXES, width, height, ran_gen) for _ in range(NUM_BOXES)]
+    reel = Reel(canvas, numbers)
+    reel.place(-numbers[0].get_width(), height/2)
+    return reel
+
+
+def bench_frame(use_tk: bool, width: int, height: int, frames: int, repeat: int) -> dict:
+    """Time to move the reel of 7 number boxes for one frame at spin and idle speeds"""
+    canvas, font, root = make_canvas(use_tk, width, height)
+    try:
+        reel = build_reel(canvas, font, width, height)
+        results = {"canvas": "tk" if use_tk else "fake", "width": width, "height": height}
+        for label, dx in (("spin", 40.0), ("idle", 1.0)):
+            results[label] = measure(lambda: reel.move(dx), repeat, frames)
+            if root is not None:
+                root.update()
+        if not use_tk:
+            canvas.reset_calls()
+            for _ in range(frames):
+                reel.move(40.0)
+            results["canvas_calls_per_frame"] = canvas.calls / frames
+        return results
+    finally:
+        if root is not None:
+            root.destroy()
+
+
+def bench_final_pos(width: int, height: int, repeat: int) -> dict:
+    """Time for the Reel lookups check_final_pos makes when a spin stops
+
+    The Reel is timed directly rather than through GenerationPage, which
+    also journals and saves the winner.
+    """
+    canvas = FakeCanvas(width, height)
+    reel = build_reel(canvas, {"size": -(int((width/(NUM_BOXES-2))/2.5))}, width, height)
+    pointer_x = width//2
+    return {
+        "box_under_s": measure(lambda: reel.box_under(pointer_x), repeat, 1000),
+        "next_box_s": measure(lambda: reel.next_box(pointer_x), repeat, 1000),
+    }
+
+
+def bench_glyph_tiles(use_tk: bool, width: int, height: int, repeat: int) -> dict:
+    """Time to render a number tile on a glyph cache miss, and to return a cached one
+
+    Without Tk only the PIL rendering of a miss is timed, creating the
+    PhotoImage needs a Tk interpreter.
+    """
+    try:
+        import PIL
+    except ImportError:
+        return {"skipped": "PIL is not installed"}
+    canvas, font, root = make_canvas(use_tk, width, height)
+    try:
+        box = build_reel(FakeCanvas(width, height), {"size": font["size"]}, width, height).numbers[0]
+        size = (round(box.box_width), round(box.box_height))
+        font_size = abs(int(font["size"]))
+        glyph_cache = GlyphCache(os.path.join(BENCHMARK_DIR, "..", "data", "Poppins.ttf"), maxsize=1000)
+        numbers = iter(f"{number:04d}" for number in range(10**6))
+        results = {
+            "render_s": measure(lambda: glyph_cache.render(next(numbers), size, font_size, box.border_width),
+                                repeat, 50),
+        }
+        if root is not None:
+            results["tile_miss_s"] = measure(lambda: glyph_cache.tile(next(numbers), size, font_size,
+                                                                      box.border_width), repeat, 50)
+            results["tile_hit_s"] = measure(lambda: glyph_cache.tile("0001", size, font_size, box.border_width),
+                                            repeat, 1000)
+        return results
+    finally:
+        if root is not None:
+            root.destroy()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the benchmark suite and write the results as JSON")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--tk", action="store_true", help="time the reel against a real Tk canvas")
+    parser.add_argument("--quick", action="store_true", help="use small sizes for a fast smoke run")
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    args = parser.parse_args()
+
+    if args.quick:
+        ranges, blacklist_sizes, blacklist_files = [10**3, 10**4], [0, 100], [10**3]
+        draws, frames, repeat = 1000, 100, 3
+    else:
+        ranges, blacklist_sizes, blacklist_files = [10**3, 10**5, 10**6], [0, 10**3, 10**5], [10**3, 10**5, 10**6]
+        draws, frames, repeat = 20000, 1000, 5
+    number_canvas_height = args.height/2.5
+
+    results = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "generator": bench_generator(ranges, blacklist_sizes, draws, repeat),
+        "weighted": bench_weighted(ranges, draws, repeat),
+        "blacklist": bench_blacklist(blacklist_files, repeat),
+        "frame": bench_frame(args.tk, args.width, number_canvas_height, frames, repeat),
+        "final_pos": bench_final_pos(args.width, number_canvas_height, repeat),
+        "glyph_tiles": bench_glyph_tiles(args.tk, args.width, number_canvas_height, repeat),
+    }
+
+    with open(args.output, "w") as output_file:
+        json.dump(results, output_file, indent=2)
+    print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Scaled copies of the image assets, cached on disk.
+
+The logos are resized for the screen once and saved as PNG files keyed by
+the source file's hash and the target size, so later launches read them
+without any resampling. static_layers.py composites them into each page's
+cached layers.
+
+Typical usage example:
+
+  logo_path = scaled_image_path("../data/avh_logo_png.png", (960, 280))
+"""
+
+import os
+import sys
+from hashlib import sha1
+
+#Source file hashes, so each file is only read once per run
+_source_hashes = {}
+
+def resource_path(relative_path):
+    """Get absolute path to resource, works for dev and for PyInstaller"""
+    base_path = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base_path, relative_path)
+
+def cache_dir() -> str:
+    """Returns the folder the scaled images are kept in, outside any PyInstaller bundle"""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA", os.path.expanduser("~"))
+    else:
+        base = os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(base, "avh_number_generator")
+
+def source_hash(filepath: str) -> str:
+    """Returns the sha1 hex digest of a file's contents"""
+    if filepath not in _source_hashes:
+        with open(filepath, "rb") as source_file:
+            _source_hashes[filepath] = sha1(source_file.read()).hexdigest()
+    return _source_hashes[filepath]
+
+def scaled_image_path(relative_path: str, size: tuple) -> str:
+    """Returns the path of a PNG of the asset resized to size, creating it if it is not cached
+
+    Args:
+        relative_path: the asset's path relative to this file, e.g. "../data/avh_logo_png.png"
+        size: the (width, height) to resize to in pixels
+    """
+    source = resource_path(relative_path)
+    width, height = size
+    name = os.path.splitext(os.path.basename(source))[0]
+    cached = os.path.join(cache_dir(), f"{name}_{source_hash(source)[:16]}_{width}x{height}.png")
+    if not os.path.exists(cached):
+        #PIL is only needed the first time an asset is scaled to a size
+        from PIL import Image
+        os.makedirs(os.path.dirname(cached), exist_ok=True)
+        temporary = f"{cached}.{os.getpid()}.tmp"
+        with Image.open(source) as image:
+            image.resize(size).save(temporary, format="PNG")
+        os.replace(temporary, cached)
+    return cached
@@ -0,0 +1,168 @@
+import logging
+import os
+from array import array
+from bisect import bisect_right
+from csv import reader
+
+logger = logging.getLogger(__name__)
+
+#Parsed files, absolute path -> ((mtime_ns, size), intervals, errors)
+_cache = {}
+
+class BlacklistIndex:
+    """The blacklisted numbers as sorted, non-overlapping inclusive intervals
+
+    A range like 100-250 is stored as one interval however many numbers it
+    covers, and membership is a binary search over the interval starts, so
+    the index stays small for large ranges and checks are O(log intervals).
+
+    Attributes:
+        starts: the first number of each interval, ascending
+        ends: the last number of each interval (inclusive)
+        errors: (source, line, cell) for every cell that was skipped as invalid
+    """
+
+    def __init__(self, intervals, errors: list = None) -> None:
+        """Merges (start, end) pairs into an index, overlapping and touching intervals are joined
+
+        Args:
+            intervals: an iterable of inclusive (start, end) pairs in any order
+            errors: (source, line, cell) for every cell that was skipped while parsing
+        """
+        self.starts = array("q")
+        self.ends = array("q")
+        for start, end in sorted(intervals):
+            if self.ends and start <= self.ends[-1] + 1:
+                if end > self.ends[-1]:
+                    self.ends[-1] = end
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+        self.errors = list(errors) if errors is not None else []
+
+    @classmethod
+    def from_numbers(cls, numbers) -> "BlacklistIndex":
+        """Returns the index of an iterable of single numbers
+
+        Runs of consecutive numbers are folded into one interval as they are
+        read, so an ascending stream only holds one pair per run.
+        """
+        intervals = []
+        for number in numbers:
+            if intervals and intervals[-1][1] + 1 == number:
+                intervals[-1][1] = number
+            else:
+                intervals.append([number, number])
+        return cls(intervals)
+
+    def union(self, numbers) -> "BlacklistIndex":
+        """Returns a new index of these intervals and an iterable of single numbers, e.g. recent winners"""
+        return BlacklistIndex([*self.intervals(), *((number, number) for number in numbers)], self.errors)
+
+    def __contains__(self, number) -> bool:
+        interval = bisect_right(self.starts, number) - 1
+        return interval >= 0 and number <= self.ends[interval]
+
+    def __iter__(self):
+        """Yields every blacklisted number in ascending order"""
+        for start, end in zip(self.starts, self.ends):
+            yield from range(start, end + 1)
+
+    def __len__(self) -> int:
+        return sum(end - start + 1 for start, end in zip(self.starts, self.ends))
+
+    def intervals(self, min: int = None, max: int = None):
+        """Yields the (start, end) intervals, clipped to min to max when they are given"""
+        for start, end in zip(self.starts, self.ends):
+            if min is not None:
+                if end < min:
+                    continue
+                start = start if start > min else min
+            if max is not None:
+                if start > max:
+                    break
+                end = end if end < max else max
+            yield start, end
+
+def parse_cell(cell: str):
+    """Returns the (start, end) interval of a cell holding a number or a range like 100-250, None if it is invalid"""
+    first, dash, last = cell.partition("-")
+    try:
+        start = int(first)
+        end = int(last) if dash else start
+    except ValueError:
+        return None
+    return (start, end) if start <= end else None
+
+def parse_file(filepath: str) -> tuple:
+    """Reads one csv or text file, returns (intervals, errors)
+
+    Csv files are read cell by cell. Text files hold numbers or ranges separated
+    by commas or whitespace, and anything after a # on a line is a comment.
+    Empty cells are skipped, invalid cells are skipped and returned as errors.
+    """
+    intervals = []
+    errors = []
+    with open(filepath, newline='') as blacklist_file:
+        if filepath.lower().endswith(".csv"):
+            rows = reader(blacklist_file)
+        else:
+            rows = (line.split("#", 1)[0].replace(",", " ").split() for line in blacklist_file)
+        for line_number, row in enumerate(rows, start=1):
+            for cell in row:
+                cell = cell.strip()
+                if cell == "":
+                    continue
+                interval = parse_cell(cell)
+                if interval is None:
+                    errors.append((filepath, line_number, cell))
+                else:
+                    intervals.append(interval)
+    return intervals, errors
+
+def cached_parse_file(filepath: str, cache: bool = True) -> tuple:
+    """parse_file, reusing the last result while the file's mtime and size are unchanged
+
+    Invalid cells are logged when the file is parsed, a cached result does not log them again.
+    """
+    stat = os.stat(filepath)
+    key = (stat.st_mtime_ns, stat.st_size)
+    if cache:
+        cached = _cache.get(filepath)
+        if cached is not None and cached[0] == key:
+            return cached[1], cached[2]
+    intervals, errors = parse_file(filepath)
+    for _, line_number, cell in errors:
+        logger.warning("skipped blacklist cell %r on line %d of %s", cell, line_number, filepath)
+    _cache[filepath] = (key, intervals, errors)
+    return intervals, errors
+
+def source_files(source: str) -> list:
+    """Returns the blacklist files of a source, the source itself or the csv and txt files in a directory"""
+    if not os.path.isdir(source):
+        return [source]
+    return [os.path.join(source, name) for name in sorted(os.listdir(source))
+            if name.lower().endswith((".csv", ".txt"))]
+
+def load_blacklist(*sources: str, cache: bool = True) -> BlacklistIndex:
+    """Reads every number and range in one or more blacklist sources into a BlacklistIndex
+
+    Each source is a csv file, a text file or a directory of them. Cells can
+    hold a number (123) or an inclusive range (100-250). Empty cells are
+    skipped, invalid cells such as stray text are skipped and listed in the
+    index's errors, and logged as a warning when their file is parsed.
+    Parsed files are cached until their modification time or size changes,
+    so a re-draw only re-reads, and only warns about, files that were edited.
+
+    Args:
+        sources: paths to files or directories, relative paths are taken from the working directory
+        cache: reuse parsed files, False always re-reads them
+    """
+    intervals = []
+    errors = []
+    for source in sources:
+        for filepath in source_files(os.path.abspath(source)):
+            file_intervals, file_errors = cached_parse_file(filepath, cache)
+            intervals.extend(file_intervals)
+            errors.extend(file_errors)
+    return BlacklistIndex(intervals, errors)
@@ -0,0 +1,100 @@
+"""Draws winners without the Tk interface.
+
+Builds the same RandomGenerator pool as the GenerationPage, minus the
+blacklist, and writes count distinct winners to stdout as csv or json.
+
+Typical usage example:
+
+  python src/draw.py --max 600 --count 50 --blacklist blacklist.csv
+  python src/draw.py --max 250000 --count 5000 --format json > winners.json
+  python src/draw.py --max 600 --tiers 3,2,1
+"""
+
+import argparse
+import json
+import os
+import sys
+from csv import writer
+
+from blacklist import load_blacklist
+from draw_session import DrawSession
+from random_generator import RandomGenerator
+
+def resource_path(relative_path):
+    """Get absolute path to resource, works for dev and for PyInstaller"""
+    base_path = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base_path, relative_path)
+
+def winner_count(value: str) -> int:
+    """argparse type for a number of winners, a whole number of zero or more"""
+    try:
+        count = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid number of winners: {value!r}")
+    if count < 0:
+        raise argparse.ArgumentTypeError(f"the number of winners can not be negative: {count}")
+    return count
+
+def write_winners(winners: list, output_format: str, output, tiers: list = None) -> None:
+    """Writes the winners in draw order to an open text file
+
+    Args:
+        winners: a list of zero-padded number strings
+        output_format: "csv" for a draw,number table or "json" for a list of objects
+        output: a writable text file such as sys.stdout
+        tiers: the prize tier name of each winner, adds a tier column when given
+    """
+    if output_format == "csv":
+        csv_writer = writer(output, lineterminator="\n")
+        if tiers is None:
+            csv_writer.writerow(["draw", "number"])
+            csv_writer.writerows(enumerate(winners, start=1))
+        else:
+            csv_writer.writerow(["draw", "tier", "number"])
+            csv_writer.writerows((draw, tier, number) for draw, (tier, number)
+                                 in enumerate(zip(tiers, winners), start=1))
+    else:
+        output.write("[")
+        for draw, number in enumerate(winners, start=1):
+            if draw > 1:
+                output.write(",\n ")
+            record = {"draw": draw, "number": number}
+            if tiers is not None:
+                record["tier"] = tiers[draw - 1]
+            output.write(json.dumps(record))
+        output.write("]\n")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Draw distinct member numbers without the Tk interface")
+    parser.add_argument("--min", type=int, default=1, help="lowest member number (inclusive)")
+    parser.add_argument("--max", type=int, required=True, help="highest member number (inclusive)")
+    parser.add_argument("--count", type=winner_count, default=1, help="number of distinct winners to draw")
+    parser.add_argument("--blacklist", nargs="+", default=[resource_path("../blacklist.csv")],
+                        help="csv or text files, or directories of them, of numbers and ranges that can not be drawn")
+    parser.add_argument("--format", choices=["csv", "json"], default="csv", dest="output_format")
+    parser.add_argument("--tiers", help="winners per prize tier in draw order, e.g. 3,2,1, replaces --count")
+    parser.add_argument("--seed", type=int, help="seed the random number generator to repeat a draw")
+    args = parser.parse_args(argv)
+
+    blacklist = load_blacklist(*args.blacklist)
+    if args.tiers is not None:
+        try:
+            counts = [winner_count(count) for count in args.tiers.split(",")]
+            session = DrawSession(args.min, args.max, blacklist, DrawSession.numbered_tiers(counts), seed=args.seed)
+        except (argparse.ArgumentTypeError, ValueError) as error:
+            parser.error(str(error))
+        while not session.finished():
+            session.draw_winner()
+        tiers = [tier for tier, number in session.winners]
+        winners = [number for tier, number in session.winners]
+        write_winners(winners, args.output_format, sys.stdout, tiers)
+        return
+
+    ran_gen = RandomGenerator(args.min, args.max, blacklist, compact=True, seed=args.seed)
+    if args.count > ran_gen.size:
+        parser.error(f"cannot draw {args.count} winners from {ran_gen.size} eligible members")
+
+    write_winners(ran_gen.sample(args.count), args.output_format, sys.stdout)
+
+if __name__ == "__main__":
+    main()
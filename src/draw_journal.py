@@ -0,0 +1,194 @@
+import logging
+import os
+import struct
+import threading
+from queue import Queue
+from time import time
+from zlib import crc32
+
+logger = logging.getLogger(__name__)
+
+class RecentWinners:
+    """The members who won at or after a cutoff time, a live view of a DrawJournal's index
+
+    Checking a member is one dict lookup, so it can be used as a blacklist.
+
+    Attributes:
+        last_wins: winner -> timestamp of their latest win, shared with the journal
+        cutoff: the earliest win timestamp that counts
+    """
+
+    def __init__(self, last_wins: dict, cutoff: float) -> None:
+        self.last_wins = last_wins
+        self.cutoff = cutoff
+
+    def __contains__(self, number) -> bool:
+        return self.last_wins.get(number, self.cutoff - 1) >= self.cutoff
+
+    def __iter__(self):
+        """Yields every recent winner, in no particular order"""
+        return (number for number, timestamp in list(self.last_wins.items()) if timestamp >= self.cutoff)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+class DrawJournal:
+    """An append-only, crash-safe binary record of every winner drawn
+
+    The file starts with a magic header, followed by fixed-size records.
+    Each record holds:
+    - the time of the draw
+    - the pool it was drawn from (min, max and the number of eligible members)
+    - the session seed and draw number, which repeat the draw
+    - the prize tier
+    - the winner
+    Each record ends with a CRC32 of its fields.
+
+    Opening a journal reads it once to build an in-memory index of each
+    winner's latest win. A corrupt record is logged and skipped, the
+    records after it still count. A partial record at the end, left by a
+    crash mid-write, is logged and truncated.
+
+    append updates the index straight away and hands the bytes to a
+    background writer thread, so the frame loop never waits on the disk.
+    The writer writes, flushes and fsyncs, batching whatever has queued up
+    meanwhile.
+
+    Typical usage example:
+
+      journal = DrawJournal("draws.journal")
+      recent = journal.recent_winners(days = 30)
+      journal.append(1, 600, 598, seed, 1, "Prize 1", 123)
+      journal.close()
+
+    Attributes:
+        filepath: the journal file
+        last_wins: winner -> timestamp of their latest win
+        records: how many records the journal holds
+    """
+
+    MAGIC = b"AVHDRAW1"
+    #timestamp, min, max, pool size, seed, draw number, tier, winner
+    RECORD = struct.Struct("<dqqqQI32sq")
+    CRC = struct.Struct("<I")
+    RECORD_SIZE = RECORD.size + CRC.size
+
+    def __init__(self, filepath: str) -> None:
+        """Opens or creates a journal and loads its index
+
+        Raises:
+            ValueError: the file exists but is not a draw journal
+        """
+        self.filepath = filepath
+        self.last_wins = {}
+        self.records = 0
+        self.load()
+        self.queue = Queue()
+        self.writer = None
+
+    def load(self) -> None:
+        """Reads every record into the index, skipping corrupt records and truncating a torn tail"""
+        if not os.path.exists(self.filepath) or os.path.getsize(self.filepath) == 0:
+            os.makedirs(os.path.dirname(os.path.abspath(self.filepath)), exist_ok=True)
+            with open(self.filepath, "wb") as journal_file:
+                journal_file.write(self.MAGIC)
+                journal_file.flush()
+                os.fsync(journal_file.fileno())
+            return
+
+        size = os.path.getsize(self.filepath)
+        #Only a crash mid-write leaves a partial record, and only at the end
+        valid_end = size - (size - len(self.MAGIC)) % self.RECORD_SIZE
+        with open(self.filepath, "rb") as journal_file:
+            if journal_file.read(len(self.MAGIC)) != self.MAGIC:
+                raise ValueError(f"{self.filepath} is not a draw journal")
+            for index, data in enumerate(self.read_blocks(journal_file, valid_end)):
+                if not self.valid(data):
+                    #Later records are still good, so one bad record must not cost their winners
+                    logger.warning("skipped corrupt record %d of %s", index, self.filepath)
+                    continue
+                record = self.RECORD.unpack_from(data)
+                timestamp, winner = record[0], record[-1]
+                if timestamp > self.last_wins.get(winner, float("-inf")):
+                    self.last_wins[winner] = timestamp
+                self.records += 1
+
+        if valid_end < size:
+            logger.warning("truncating a partial record of %d bytes at the end of %s", size - valid_end, self.filepath)
+            with open(self.filepath, "r+b") as journal_file:
+                journal_file.truncate(valid_end)
+                os.fsync(journal_file.fileno())
+
+    def read_blocks(self, journal_file, end: int):
+        """Yields each whole record's bytes from the file's position up to end, valid or not"""
+        while journal_file.tell() + self.RECORD_SIZE <= end:
+            yield journal_file.read(self.RECORD_SIZE)
+
+    def valid(self, data: bytes) -> bool:
+        """Returns True if a record's CRC matches its fields"""
+        return crc32(data[:self.RECORD.size]) == self.CRC.unpack_from(data, self.RECORD.size)[0]
+
+    def append(self, min: int, max: int, pool_size: int, seed: int, draw: int, tier: str, winner: int,
+               timestamp: float = None) -> None:
+        """Records a winner without blocking, the index includes them straight away
+
+        Args:
+            min: the lowest member number of the pool
+            max: the highest member number of the pool
+            pool_size: how many members were eligible
+            seed: the seed of the session or generator the winner came from
+            draw: which draw of the session this was, from 1
+            tier: the prize tier, cut to 32 bytes
+            winner: the winning member number
+            timestamp: when the winner was drawn, now by default
+        """
+        timestamp = time() if timestamp is None else timestamp
+        fields = self.RECORD.pack(timestamp, min, max, pool_size, seed, draw,
+                                  (tier or "").encode()[:32], winner)
+        if timestamp > self.last_wins.get(winner, float("-inf")):
+            self.last_wins[winner] = timestamp
+        self.records += 1
+        if self.writer is None:
+            self.writer = threading.Thread(target=self.write_records, name="draw-journal", daemon=True)
+            self.writer.start()
+        self.queue.put(fields + self.CRC.pack(crc32(fields)))
+
+    def write_records(self) -> None:
+        """Writer thread, appends queued records until close puts None on the queue"""
+        with open(self.filepath, "ab") as journal_file:
+            while True:
+                data = self.queue.get()
+                batch = []
+                while data is not None:
+                    batch.append(data)
+                    if self.queue.empty():
+                        break
+                    data = self.queue.get()
+                if batch:
+                    journal_file.write(b"".join(batch))
+                    journal_file.flush()
+                    os.fsync(journal_file.fileno())
+                if data is None:
+                    return
+
+    def close(self, timeout: float = 5) -> None:
+        """Waits for queued records to reach the disk and stops the writer thread"""
+        if self.writer is not None:
+            self.queue.put(None)
+            self.writer.join(timeout)
+            self.writer = None
+
+    def recent_winners(self, days: float, now: float = None) -> RecentWinners:
+        """Returns the members who won in the last days days, checking one is O(1)"""
+        now = time() if now is None else now
+        return RecentWinners(self.last_wins, now - days*86400)
+
+    def read_records(self):
+        """Yields every valid record as a tuple of the RECORD fields, tier decoded, oldest first"""
+        with open(self.filepath, "rb") as journal_file:
+            journal_file.seek(len(self.MAGIC))
+            for data in self.read_blocks(journal_file, os.path.getsize(self.filepath)):
+                if not self.valid(data):
+                    continue
+                *fields, tier, winner = self.RECORD.unpack_from(data)
+                yield (*fields, tier.rstrip(b"\0").decode(errors="replace"), winner)
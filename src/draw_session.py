@@ -0,0 +1,116 @@
+from random_generator import RandomGenerator
+from weighted_generator import WeightedGenerator
+
+class DrawSession:
+    """Draws distinct winners for a sequence of prize tiers
+
+    Eligible members are the range minus the blacklist, held as a compact
+    RandomGenerator pool so the range is never materialised. Winners are
+    drawn with a partial Fisher-Yates shuffle over the pool's ranks: each
+    draw picks a random rank from the ones not yet drawn and swaps the last
+    undrawn rank into its place. Only swapped ranks are stored, so each draw
+    is O(1) and a session of K winners uses O(K) memory. A member can only
+    win once per session.
+
+    With weights the pool is a WeightedGenerator instead, each winner is
+    drawn from it by weight and then has its weight set to zero.
+
+    Attributes:
+        pool: the compact RandomGenerator, or WeightedGenerator, over the eligible members
+        tiers: (tier name, number of winners) pairs, drawn in order
+        winners: (tier name, number) pairs, in the order they were drawn
+        remaining: how many eligible members have not won yet
+        seed: the seed of the pool's Random, the same seed and tiers draw the same winners
+    """
+
+    def __init__(self, min: int, max: int, blacklist, tiers: list, weights: dict = None, seed: int = None) -> None:
+        """Initialises a DrawSession with no winners drawn
+
+        Args:
+            min: the lowest member number (inclusive)
+            max: the highest member number (inclusive)
+            blacklist: any container or iterable of numbers that can not win
+            tiers: (tier name, number of winners) pairs, drawn in order
+            weights: number -> weight for a weighted draw, None for every member equally likely
+            seed: an int to repeat a previous session, None for a fresh random seed
+
+        Raises:
+            ValueError: there are more prizes than eligible members
+        """
+        if weights is None:
+            self.pool = RandomGenerator(min, max, blacklist, compact=True, seed=seed)
+        else:
+            self.pool = WeightedGenerator(min, max, blacklist, weights, seed)
+        self.seed = self.pool.seed
+        self.tiers = list(tiers)
+        total = sum(count for name, count in self.tiers)
+        if total > self.pool.size:
+            raise ValueError(f"cannot draw {total} winners from {self.pool.size} eligible members")
+        self.winners = []
+        self.remaining = self.pool.size
+        #Ranks swapped away from their own position, position -> rank
+        self.swapped = {}
+
+    @staticmethod
+    def numbered_tiers(counts: list) -> list:
+        """Returns tiers named "Prize 1", "Prize 2", ... for a list of winner counts"""
+        return [(f"Prize {tier}", count) for tier, count in enumerate(counts, start=1)]
+
+    def state(self) -> dict:
+        """Returns the winners drawn so far and the sampler's state as plain values that can be saved as JSON"""
+        state = {"tiers": list(self.tiers), "winners": list(self.winners), "remaining": self.remaining,
+                 **self.pool.state()}
+        if isinstance(self.pool, RandomGenerator):
+            state["session_swapped"] = list(self.swapped.items())
+        return state
+
+    def restore(self, state: dict) -> None:
+        """Puts a session built over the same pool, tiers and seed back to a saved state
+
+        A weighted pool's state holds the winners' zeroed weights and when its
+        table was rebuilt, so the restored session draws the same winners next.
+        """
+        self.pool.restore(state)
+        self.winners = [(tier, number) for tier, number in state["winners"]]
+        self.remaining = state["remaining"]
+        if isinstance(self.pool, RandomGenerator):
+            self.swapped = {index: rank for index, rank in state["session_swapped"]}
+
+    def current_tier(self):
+        """Returns the name of the tier the next winner is for, or None once every prize is drawn"""
+        drawn = len(self.winners)
+        for name, count in self.tiers:
+            if drawn < count:
+                return name
+            drawn -= count
+        return None
+
+    def finished(self) -> bool:
+        """Returns True once every tier has all of its winners"""
+        return self.current_tier() is None
+
+    def draw_winner(self) -> tuple:
+        """Draws the next winner and returns (tier name, zero-padded number)
+
+        Raises:
+            ValueError: every tier already has all of its winners
+        """
+        tier = self.current_tier()
+        if tier is None:
+            raise ValueError("every prize in this session has been drawn")
+        if isinstance(self.pool, WeightedGenerator):
+            number = self.pool.draw_winner()
+            self.pool.set_weight(int(number), 0)
+            self.remaining -= 1
+            self.winners.append((tier, number))
+            return tier, number
+        index = self.pool.random.randrange(0, self.remaining, 1)
+        last = self.remaining - 1
+        rank = self.swapped.get(index, index)
+        self.swapped[index] = self.swapped.get(last, last)
+        #Position last can not be drawn again, so it does not need to be remembered
+        self.swapped.pop(last, None)
+        self.remaining = last
+        number = self.pool.select(rank)
+        self.winners.append((tier, number))
+        return tier, number
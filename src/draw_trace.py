@@ -0,0 +1,231 @@
+"""Records a run of the GenerationPage so it can be replayed frame for frame.
+
+A run depends on three things that change from launch to launch: the
+random generators' seeds, when the space bar is pressed, and the time each
+frame reads from the FrameScheduler's clock. TraceRecorder captures all of
+them:
+
+  clock    every reading of the scheduler's clock, in order
+  events   each setup, with the session state it started from, and each
+           space press, marked with how many frames and clock readings
+           came before it
+  sessions the seed and excluded recent winners of every draw session
+           started after a finished one
+  winners  every winner, to check a replay against
+  page     the page options that shape a spin, such as predetermined_winner
+
+TraceReplayer plays a trace back. It takes the scheduler's clock and its
+after() calls, so the replay runs each frame straight after the last one
+with the recorded times, fires the events between the same frames, and
+repeats the exact same frame sequence and winners however long each frame
+really takes. That makes frame cost comparable between versions on an
+identical workload, see benchmarks/replay_trace.py.
+
+A trace is gzipped JSON.
+
+Typical usage example:
+
+  page.trace = TraceRecorder("spin.trace", page)
+  ...
+  page.trace.close()
+
+  replayer = TraceReplayer(load_trace("spin.trace"), page)
+  while replayer.step():
+      app.update()
+"""
+
+import gzip
+import json
+import secrets
+from collections import deque
+
+#2 saves the weighted generators' weight changes in each setup's state
+VERSION = 2
+
+def load_trace(filepath: str) -> dict:
+    """Returns a trace written by TraceRecorder
+
+    Raises:
+        ValueError: the file is not a trace this version can replay
+    """
+    with gzip.open(filepath, "rt", encoding="utf-8") as trace_file:
+        trace = json.load(trace_file)
+    if trace.get("version") != VERSION:
+        raise ValueError(f"{filepath} is a version {trace.get('version')} trace, expected version {VERSION}")
+    return trace
+
+class TraceRecorder:
+    """Records the clock readings, events, sessions and winners of a GenerationPage run
+
+    Creating a recorder puts it between the page's scheduler and its clock.
+
+    Attributes:
+        filepath: where close writes the trace
+        page: the GenerationPage being recorded
+        readings: every clock reading so far
+        events: the setups and space presses so far
+        sessions: the (excluded_winners, seed) of the draw sessions started so far
+        winners: the winners so far, as number strings
+    """
+
+    def __init__(self, filepath: str, page) -> None:
+        self.filepath = filepath
+        self.page = page
+        self.readings = []
+        self.events = []
+        self.sessions = []
+        self.winners = []
+        self.closed = False
+        self.page_options = {
+            "predetermined_winner": page.predetermined_winner,
+            "spin_duration": page.spin_duration,
+            "winner_reveal_delay": page.winner_reveal_delay,
+        }
+        self.real_clock = page.scheduler.clock
+        page.scheduler.clock = self.clock
+
+    def clock(self) -> float:
+        """The scheduler's clock, recording each reading"""
+        now = self.real_clock()
+        self.readings.append(now)
+        return now
+
+    def event(self, kind: str, **fields) -> None:
+        self.events.append({"type": kind, "frame": self.page.scheduler.frames, "reading": len(self.readings),
+                            **fields})
+
+    def setup(self, state: dict) -> None:
+        """Called by the page's setup with the state the new session starts from"""
+        self.event("setup", state = state)
+
+    def space_pressed(self) -> None:
+        self.event("space")
+
+    def new_session(self, excluded_winners: list) -> tuple:
+        """Returns (excluded_winners, seed) for a new draw session, with a fresh seed"""
+        session = (excluded_winners, secrets.randbits(64))
+        self.sessions.append(session)
+        return session
+
+    def winner(self, winning_number: str) -> None:
+        self.winners.append(winning_number)
+
+    def close(self) -> None:
+        """Writes the trace, once"""
+        if self.closed:
+            return
+        self.closed = True
+        trace = {
+            "version": VERSION,
+            "frames": self.page.scheduler.frames,
+            "page": self.page_options,
+            "clock": self.readings,
+            "events": self.events,
+            "sessions": self.sessions,
+            "winners": self.winners,
+        }
+        with gzip.open(self.filepath, "wt", encoding="utf-8") as trace_file:
+            json.dump(trace, trace_file, separators=(",", ":"))
+
+class TraceReplayer:
+    """Drives a GenerationPage through a recorded trace
+
+    The replayer stands in for the scheduler's widget, so after() only
+    marks the next frame as due, and for its clock, which returns the
+    recorded readings in order. step runs one frame, firing any events that
+    came before it first. The page options are set from the trace.
+
+    Attributes:
+        page: the GenerationPage being driven
+        trace: the trace being replayed
+        frames: how many frames the recorded run had
+        winners: the winners of the replay so far
+        mismatches: events that fired at a different clock reading than recorded
+    """
+
+    def __init__(self, trace: dict, page) -> None:
+        self.trace = trace
+        self.page = page
+        self.frames = trace["frames"]
+        self.readings = deque(trace["clock"])
+        self.read = 0
+        self.events = deque(trace["events"])
+        self.sessions = deque(trace["sessions"])
+        self.winners = []
+        self.mismatches = 0
+        self.due = None
+        for option, value in trace["page"].items():
+            setattr(page, option, value)
+        page.trace = self
+        page.scheduler.widget = self
+        page.scheduler.clock = self.clock
+
+    def clock(self) -> float:
+        """Returns the next recorded reading
+
+        Raises:
+            RuntimeError: the replay read the clock more often than the recording did
+        """
+        if not self.readings:
+            raise RuntimeError("the replay has diverged from the trace, it read past the last clock reading")
+        self.read += 1
+        return self.readings.popleft()
+
+    def after(self, delay: int, callback) -> str:
+        self.due = callback
+        return "frame"
+
+    def after_idle(self, callback) -> str:
+        return self.after(0, callback)
+
+    def after_cancel(self, after_id) -> None:
+        self.due = None
+
+    def fire(self, event: dict) -> None:
+        """Repeats a recorded setup or space press"""
+        if event["reading"] != self.read:
+            self.mismatches += 1
+        if event["type"] == "setup":
+            state = event["state"]
+            self.page.start_page.member_num_input = state["max_member_number"]
+            self.page.start_page.prize_tiers = state["prize_tiers"]
+            self.page.setup(state)
+            if self.page.fingerprint != state["fingerprint"]:
+                raise RuntimeError("the blacklist, members or weights differ from the recorded run")
+        elif event["type"] == "space":
+            self.page.space_pressed(None)
+
+    def fire_due_events(self) -> None:
+        """Fires the events recorded before the next frame"""
+        while self.events and self.events[0]["frame"] <= self.page.scheduler.frames:
+            self.fire(self.events.popleft())
+
+    def run_frame(self) -> bool:
+        """Runs the next frame, returns False once the trace is done"""
+        if self.page.scheduler.frames >= self.frames or self.due is None:
+            return False
+        frame, self.due = self.due, None
+        frame()
+        return True
+
+    def step(self) -> bool:
+        """Fires the events due before the next frame and runs it, returns False once the trace is done"""
+        self.fire_due_events()
+        return self.run_frame()
+
+    #The page's hooks, a replay takes its sessions from the trace and records nothing else
+
+    def setup(self, state: dict) -> None:
+        pass
+
+    def space_pressed(self) -> None:
+        pass
+
+    def new_session(self, excluded_winners: list) -> tuple:
+        return tuple(self.sessions.popleft())
+
+    def winner(self, winning_number: str) -> None:
+        self.winners.append(winning_number)
+
+    def close(self) -> None:
+        pass
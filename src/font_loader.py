@@ -0,0 +1,84 @@
+"""Registers bundled font files with the platform's font system.
+
+Tk can only use a font by family name once the font system knows about the
+file. On Windows the file is added privately with GDI's AddFontResourceExW,
+on Linux and other fontconfig platforms it is added to the application's
+fontconfig configuration with FcConfigAppFontAddFile, which Tk's Xft
+renderer reads. Both only last for the process, so registration happens
+once per launch and is cached so later calls are free. ctypes and the
+platform libraries are only loaded when a font is registered.
+
+Typical usage example:
+
+  register_font(resource_path("../data/Poppins.ttf"))
+"""
+
+import logging
+import sys
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+FR_PRIVATE  = 0x10
+FR_NOT_ENUM = 0x20
+
+def loadfont(fontpath, private=True, enumerable=False):
+    """
+    Makes fonts located in file `fontpath` available to the font system, Windows only.
+
+    `private`     if True, other processes cannot see this font, and this
+                  font will be unloaded when the process dies
+    `enumerable`  if True, this font will appear when enumerating fonts
+
+    """
+    # This function was taken from
+    # https://github.com/ifwe/digsby/blob/f5fe00244744aa131e07f09348d10563f3d8fa99/digsby/src/gui/native/win/winfonts.py#L15
+    from ctypes import windll, byref, create_unicode_buffer, create_string_buffer
+
+    if isinstance(fontpath, str):
+        pathbuf = create_unicode_buffer(fontpath)
+        AddFontResourceEx = windll.gdi32.AddFontResourceExW
+    elif isinstance(fontpath, bytes):
+        pathbuf = create_string_buffer(fontpath)
+        AddFontResourceEx = windll.gdi32.AddFontResourceExA
+    else:
+        raise TypeError('fontpath must be of type str or unicode')
+
+    flags = (FR_PRIVATE if private else 0) | (FR_NOT_ENUM if not enumerable else 0)
+    numFontsAdded = AddFontResourceEx(byref(pathbuf), flags, 0)
+    return bool(numFontsAdded)
+
+def load_fontconfig_font(fontpath: str) -> bool:
+    """Adds a font file to this process's fontconfig configuration, returns False if fontconfig is missing"""
+    import ctypes
+    from ctypes.util import find_library
+
+    library = find_library("fontconfig")
+    if library is None:
+        return False
+    fontconfig = ctypes.CDLL(library)
+    fontconfig.FcConfigGetCurrent.restype = ctypes.c_void_p
+    fontconfig.FcConfigAppFontAddFile.argtypes = [ctypes.c_void_p, ctypes.c_char_p]
+    return bool(fontconfig.FcConfigAppFontAddFile(fontconfig.FcConfigGetCurrent(), fontpath.encode()))
+
+@lru_cache(maxsize=None)
+def register_font(fontpath: str) -> bool:
+    """Makes a font file available to Tk for the rest of the process, returns True if it was registered
+
+    When the platform has no supported font backend, or registration fails,
+    a warning is logged and Tk falls back to a default font.
+
+    Args:
+        fontpath: absolute path to a .ttf or .otf file
+    """
+    try:
+        if sys.platform == "win32":
+            registered = loadfont(fontpath)
+        else:
+            registered = load_fontconfig_font(fontpath)
+    except OSError as error:
+        logger.warning("could not register font %s: %s", fontpath, error)
+        return False
+    if not registered:
+        logger.warning("could not register font %s, using the default font", fontpath)
+    return registered
@@ -0,0 +1,123 @@
+from math import floor
+from time import perf_counter
+import tkinter as tk
+
+class FrameScheduler:
+    """Runs every registered animation callback from one frame loop
+
+    Frame deadlines are kept on a perf_counter timeline, one frame duration
+    apart, and each after() delay is measured to the next deadline rather
+    than to the end of the last frame, so rounding to whole milliseconds
+    never adds up to drift. When a frame runs so late that it passes later
+    deadlines, those frames are skipped instead of slowing the animation.
+
+    Callbacks are called with the real time since the previous frame in
+    seconds, so motion is time-based, and return False to be unregistered.
+
+    Attributes:
+        widget: the tk widget whose after() drives the loop
+        frame_duration: the time between frame deadlines, in seconds
+        clock: a function returning the current time in seconds
+        frame_stats: an optional FrameStats that records every frame
+        governor: an optional QualityGovernor told each frame's cost
+        callbacks: the registered callbacks, in the order they run
+        skipped_frames: frames skipped because the loop was running behind
+        frames: how many frames have run
+    """
+
+    def __init__(self, widget: tk.Misc, frame_duration: float = 1/60, clock = perf_counter, frame_stats = None) -> None:
+        """Initialises a stopped FrameScheduler
+
+        Args:
+            widget: the tk widget whose after() drives the loop
+            frame_duration: the time between frame deadlines, in seconds
+            clock: a function returning the current time in seconds
+            frame_stats: an optional FrameStats that records every frame
+        """
+        self.widget = widget
+        self.frame_duration = frame_duration
+        self.clock = clock
+        self.frame_stats = frame_stats
+        self.governor = None
+        self.callbacks = []
+        self.skipped_frames = 0
+        self.frames = 0
+        self.after_id = None
+        self.in_frame = False
+        self.next_deadline = None
+        self.last_frame = None
+        #How long the loop chose to wait before the current frame, in seconds
+        self.last_wait = 0
+
+    def register(self, callback) -> None:
+        """
+        Adds a callback(dt) to run every frame, starting the loop if it is stopped
+        """
+        if callback not in self.callbacks:
+            self.callbacks.append(callback)
+        if self.after_id is None and not self.in_frame:
+            self.last_frame = None
+            self.next_deadline = self.clock()
+            if self.frame_stats is not None:
+                self.frame_stats.pause()
+            self.after_id = self.widget.after_idle(self.run_frame)
+
+    def unregister(self, callback) -> None:
+        """
+        Removes a callback, the loop stops after the frame once no callbacks are left
+        """
+        if callback in self.callbacks:
+            self.callbacks.remove(callback)
+
+    def clear(self) -> None:
+        """
+        Removes every callback and cancels the pending frame
+        """
+        self.callbacks.clear()
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+
+    def run_frame(self) -> None:
+        """
+        Calls every registered callback with the time since the last frame and schedules the next frame
+
+        Every time the frame uses comes from clock, so a replayed clock repeats a frame sequence exactly.
+        """
+        self.after_id = None
+        self.frames += 1
+        frame_start = self.frame_stats.start_frame() if self.frame_stats is not None else None
+        now = self.clock()
+        dt = self.frame_duration if self.last_frame is None else now - self.last_frame
+        #The previous frame's callbacks, Tk's redraw after them and any timer lateness, without the wait
+        frame_cost = None if self.last_frame is None else max(0.0, dt - self.last_wait)
+        self.last_frame = now
+
+        #Callbacks registered while the frame runs join the loop at the next frame
+        self.in_frame = True
+        try:
+            for callback in list(self.callbacks):
+                if callback in self.callbacks and callback(dt) is False:
+                    self.unregister(callback)
+        finally:
+            self.in_frame = False
+
+        if not self.callbacks:
+            return
+
+        self.next_deadline += self.frame_duration
+        end = self.clock()
+        behind = 0
+        if end > self.next_deadline:
+            #Running behind, skip the frames whose deadlines have already passed
+            behind = floor((end - self.next_deadline)/self.frame_duration) + 1
+            self.skipped_frames += behind
+            self.next_deadline += behind*self.frame_duration
+        if self.governor is not None and frame_cost is not None:
+            self.governor.observe(frame_cost, behind)
+        now = self.clock()
+        delay = max(1, int((self.next_deadline - now)*1000))
+        self.last_wait = delay/1000
+        if frame_start is not None:
+            self.frame_stats.end_frame(frame_start, delay)
+        self.after_id = self.widget.after(delay, self.run_frame)
@@ -0,0 +1,111 @@
+import json
+import os
+from collections import Counter, deque
+from time import perf_counter
+
+class FrameStats:
+    """Records how long each animation frame takes and how late frames start
+
+    Each frame reports its work time and the delay it scheduled the next frame
+    with. The time between frame starts is the actual inter-frame interval,
+    and frames that start later than the target frame duration allows are
+    counted as missed deadlines.
+
+    Recent frames are kept for the on-screen summary and the whole session is
+    kept as millisecond histograms, so memory stays bounded over an evening.
+
+    Attributes:
+        target_frame_ms: the frame duration the animations aim for
+        frames: the number of frames recorded this session
+        missed_deadlines: frames that started more than tolerance_ms after their deadline
+        dropped_frames: whole frame slots skipped because a frame started late
+    """
+
+    def __init__(self, target_frame_ms: float = 16, tolerance_ms: float = 2, window: int = 600):
+        """Initialises an empty set of frame statistics
+
+        Args:
+            target_frame_ms: the frame duration the animations aim for, in ms
+            tolerance_ms: how late a frame may start before it counts as a missed deadline
+            window: the number of recent frames used for the live summary
+        """
+        self.target_frame_ms = target_frame_ms
+        self.tolerance_ms = tolerance_ms
+        self.frames = 0
+        self.missed_deadlines = 0
+        self.dropped_frames = 0
+        self.recent_work_ms = deque(maxlen=window)
+        self.recent_interval_ms = deque(maxlen=window)
+        self.work_histogram = Counter()
+        self.scheduled_histogram = Counter()
+        self.interval_histogram = Counter()
+        self._last_start = None
+
+    def start_frame(self) -> float:
+        """Marks the start of a frame and returns its start time for end_frame"""
+        start = perf_counter()
+        if self._last_start is not None:
+            interval_ms = (start - self._last_start)*1000
+            self.recent_interval_ms.append(interval_ms)
+            self.interval_histogram[int(interval_ms)] += 1
+            if interval_ms > self.target_frame_ms + self.tolerance_ms:
+                self.missed_deadlines += 1
+                self.dropped_frames += max(0, round(interval_ms/self.target_frame_ms) - 1)
+        self._last_start = start
+        return start
+
+    def end_frame(self, start: float, scheduled_ms: float) -> None:
+        """Records the work time of a frame and the delay it scheduled the next frame with
+
+        Args:
+            start: the value returned by start_frame
+            scheduled_ms: the delay passed to after() for the next frame
+        """
+        work_ms = (perf_counter() - start)*1000
+        self.frames += 1
+        self.recent_work_ms.append(work_ms)
+        self.work_histogram[int(work_ms)] += 1
+        self.scheduled_histogram[int(scheduled_ms)] += 1
+
+    def pause(self) -> None:
+        """Stops the gap until the next animation loop starts from counting as a frame interval"""
+        self._last_start = None
+
+    @staticmethod
+    def percentile(values, fraction: float) -> float:
+        """Returns the value at the given fraction (0 to 1) of the sorted values, 0 if empty"""
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(fraction*len(ordered)))]
+
+    def fps(self) -> float:
+        """Returns the frame rate over the recent frame intervals"""
+        if not self.recent_interval_ms:
+            return 0.0
+        return 1000*len(self.recent_interval_ms)/sum(self.recent_interval_ms)
+
+    def summary(self) -> str:
+        """Returns a one line summary of the recent frames for the on-screen overlay"""
+        return (f"FPS {self.fps():.0f}  "
+                f"p50 {self.percentile(self.recent_work_ms, 0.5):.1f} ms  "
+                f"p99 {self.percentile(self.recent_work_ms, 0.99):.1f} ms  "
+                f"dropped {self.dropped_frames}")
+
+    def export(self, filepath: str) -> None:
+        """Writes the session's frame histograms to a JSON file
+
+        Histograms map whole milliseconds to the number of frames in that bucket.
+        """
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        session = {
+            "target_frame_ms": self.target_frame_ms,
+            "frames": self.frames,
+            "missed_deadlines": self.missed_deadlines,
+            "dropped_frames": self.dropped_frames,
+            "work_ms": dict(sorted(self.work_histogram.items())),
+            "scheduled_ms": dict(sorted(self.scheduled_histogram.items())),
+            "interval_ms": dict(sorted(self.interval_histogram.items())),
+        }
+        with open(filepath, "w") as stats_file:
+            json.dump(session, stats_file, indent=2)
@@ -1,18 +1,35 @@
+import json
+import logging
 import os
 import sys
+from hashlib import sha1
 
-from csv import reader
 import tkinter as tk
+from tkinter import messagebox
 from tkinter.font import Font
-from time import time
-from PIL import ImageTk
-from PIL import Image
-
+from time import strftime
+
+from blacklist import BlacklistIndex, load_blacklist
+from draw_journal import DrawJournal
+from draw_session import DrawSession
+from frame_scheduler import FrameScheduler
+from frame_stats import FrameStats
+from glyph_cache import GlyphCache
+from member_source import RangeMemberSource, SQLiteMemberSource
+from quality_governor import QualityGovernor
 from number_box import NumberBox
+from number_prefetcher import NumberPrefetcher
 from random_generator import RandomGenerator
+from reel import Reel
+from session_snapshot import SessionSnapshot
+from spin_curve import SpinCurve
+from weighted_generator import WeightedGenerator, load_weights
 from start_page import StartPage
+from static_layers import point_size_to_pixels, static_layer, title_operations
 from win_window import WinWindow
 
+logger = logging.getLogger(__name__)
+
 def resource_path(relative_path):
     """Get absolute path to resource, works for dev and for PyInstaller"""
     base_path = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
@@ -29,7 +46,12 @@ class GenerationPage(tk.Frame):
         eggs: An integer count of the eggs we have laid.
     """
 
-    def __init__(self, parent: tk.Frame, app: tk.Tk, start_page: StartPage, background_colour: str):
+    #Idle scroll speed in pixels per second, 1 px per 16 ms frame
+    IDLE_SPEED = 1/0.016
+
+    def __init__(self, parent: tk.Frame, app: tk.Tk, start_page: StartPage, background_colour: str,
+                 predetermined_winner: bool = False, recent_winner_days: float = None,
+                 snapshot: SessionSnapshot = None):
         """Initialises a GenerationPage instance that will be shown when generating a random number
 
         Args:
@@ -37,15 +59,45 @@ class GenerationPage(tk.Frame):
             app: a tk.Tk app instance that will be used to quit the program
             start_page: a StartPage instance that the GenerationPage will return to and get blacklist from
             background_colour: a str that represents the desired background colour (e.g. #253556)
+            predetermined_winner: if True the winner is drawn when the spin starts and the reel
+                follows a fixed-length curve that stops that number under the pointer
+            recent_winner_days: members who won within this many days can not win, None to allow them
+            snapshot: where the open session is saved after every draw, None to not save it
         """
         tk.Frame.__init__(self, parent)
         self.start_page = start_page
         self.app = app
-        self.run_idle_animation = True
         self.space_times_pressed = 1
         self.background_colour = background_colour
+        self.predetermined_winner = predetermined_winner
         self.prev_screen_width = self.app.winfo_screenwidth()
         self.prev_screen_height = self.app.winfo_screenheight()
+        self.frame_stats = FrameStats(target_frame_ms = 1000/60)
+        #Every reel animation runs on this one frame loop
+        self.scheduler = FrameScheduler(self, frame_stats = self.frame_stats)
+        #Lowers the frame rate on slow PCs, the spins stay the same length because motion is time-based
+        self.scheduler.governor = QualityGovernor(self.scheduler)
+        self.stats_overlay = None
+        self.show_stats_overlay = False
+        #Widgets are built by the first setup and reused by every later draw
+        self.built = False
+        self.win_window = None
+        self.winner_shown = False
+        #Upcoming reel numbers, drawn from ran_gen while Tk is idle
+        self.number_source = None
+        #Every winner is recorded in the draw journal, opened by the first setup
+        self.journal = None
+        self.recent_winner_days = recent_winner_days
+        self.snapshot = snapshot
+        #Records or replays the run's seeds, space presses and frame times, see draw_trace.py
+        self.trace = None
+        #Winners for each prize tier, drawn one per predetermined spin
+        self.draw_session = None
+        self.winning_tier = None
+        #Length of a predetermined spin in seconds, None for the free spin's duration
+        self.spin_duration = None
+        #How long the reel rests on the winner before the winning window opens, in ms
+        self.winner_reveal_delay = 1000
         
         #Pre-setup background set
         self["bg"] = background_colour
@@ -64,13 +116,93 @@ class GenerationPage(tk.Frame):
 
         self.bind("<Configure>", self.on_resize)
 
-    def setup(self):
-        self.screen_height = self.app.winfo_screenheight()
-        self.screen_width = self.app.winfo_screenwidth()
+        self.bind("<F3>", self.toggle_stats_overlay)
+
+        self.bind("<Destroy>", self.export_frame_stats)
+
+        self.bind("<Destroy>", self.close_session, add="+")
+
+    def setup(self, saved_state: dict = None):
+        """Prepares the page for a draw with the current member number and blacklist
+
+        The widgets are built on the first call only. Later calls replace the
+        random generator, refresh the numbers on the reel and restart the idle
+        animation, cancelling whatever animation was still scheduled.
+
+        Args:
+            saved_state: a session loaded from the snapshot to carry on with, it is
+                only used if the blacklist, members and weights are unchanged
+
+        Raises:
+            ValueError: the prize tiers need more winners than there are eligible members
+        """
+        self.scheduler.clear()
 
         filepath = resource_path("../blacklist.csv")
         blacklist = self.get_blacklist(filepath)
-        self.ran_gen = RandomGenerator(1,self.start_page.member_num_input,blacklist)
+        #Eligible members, from the member file when there is one, minus the blacklist
+        member_source = self.get_member_source()
+        try:
+            ranges = member_source.eligible_ranges()
+        finally:
+            member_source.close()
+        self.min_member, self.max_member, self.blacklist = RandomGenerator.ranges_eligibility(ranges, blacklist)
+        if self.journal is None:
+            self.journal = DrawJournal(resource_path("../draws.journal"))
+        #Members holding more than one entry, optional
+        weights_path = resource_path("../weights.csv")
+        self.weights = load_weights(weights_path) if os.path.exists(weights_path) else None
+        self.fingerprint = self.eligibility_fingerprint()
+        if saved_state is not None and saved_state["fingerprint"] != self.fingerprint:
+            logger.warning("the blacklist, members or weights changed since the session was saved, starting a new session")
+            saved_state = None
+
+        #Recent winners are fixed when a pool is built, so a saved pool can be built the same way again
+        if saved_state is None:
+            self.generator_excluded_winners = self.recent_winner_list()
+        else:
+            self.generator_excluded_winners = saved_state["generator"]["excluded_winners"]
+        excluded = self.blacklist.union(self.generator_excluded_winners)
+        if self.weights is None:
+            self.ran_gen = RandomGenerator(self.min_member,self.max_member,excluded,compact=True)
+        else:
+            self.ran_gen = WeightedGenerator(self.min_member,self.max_member,excluded,self.weights)
+        if saved_state is not None:
+            self.ran_gen.restore(saved_state["generator"])
+        #Only the predetermined spin draws its winners from a session
+        if not self.predetermined_winner:
+            self.draw_session = None
+        elif saved_state is not None and saved_state["session"] is not None:
+            self.draw_session = self.new_draw_session(saved_state["session"])
+        else:
+            self.draw_session = self.new_draw_session()
+        if self.trace is not None:
+            #Before the prefetcher draws from the generator, so a replay starts from the same state
+            self.trace.setup(self.session_state())
+        if self.number_source is not None:
+            self.number_source.cancel()
+        self.number_source = NumberPrefetcher(self, self.ran_gen)
+
+        if not self.built:
+            self.build()
+            self.built = True
+        else:
+            self.reel.refresh(self.number_source)
+        #Tiles for the upcoming numbers are rendered while Tk is idle, not when their box wraps
+        self.number_source.set_prerender(self.numbers[0].tile_for)
+
+        self.win_window.hide()
+        self.winner_shown = False
+        self.space_times_pressed = 1
+        if self.show_stats_overlay:
+            self.scheduler.register(self.update_stats_overlay)
+        self.scheduler.register(self.idle_animation)
+        self.save_snapshot()
+
+    def build(self):
+        """Creates the canvases, number boxes, pointer and winner window, once per page"""
+        self.screen_height = self.app.winfo_screenheight()
+        self.screen_width = self.app.winfo_screenwidth()
 
         #Creating base frames
         #Sizing
@@ -83,6 +215,8 @@ class GenerationPage(tk.Frame):
         number_canvas = tk.Canvas(self, height = number_canvas_height, width = self.screen_width, borderwidth=0, highlightthickness=0)
         bottom_canvas = tk.Canvas(self, height = bottom_canvas_height, width = self.screen_width, borderwidth=0, highlightthickness=0)
 
+        self.number_canvas = number_canvas
+
         #placement
         top_canvas.pack()
         number_canvas.pack()
@@ -94,20 +228,20 @@ class GenerationPage(tk.Frame):
         self.numbers = []
         self.number_font = Font(family = "Segoe")
         self.number_font["size"] = -(int((self.screen_width/(num_boxes-2))/2.5))
+        #Room for the boxes on screen, the prefetched numbers and the winner, twice over
+        self.glyph_cache = GlyphCache(resource_path("../data/Poppins.ttf"),
+                                      maxsize = 2*(num_boxes + self.number_source.capacity + 1))
         
         for i in range(num_boxes):
-            self.numbers.append(NumberBox(number_canvas, self.number_font, num_boxes, self.screen_width, number_canvas_height, self.ran_gen))
+            self.numbers.append(NumberBox(number_canvas, self.number_font, num_boxes, self.screen_width, number_canvas_height, self.number_source,
+                                          glyph_cache = self.glyph_cache))
         
         #setting dimensions
         self.number_box_width = self.numbers[0].get_width()
-        padding = self.numbers[0].get_padding()
 
         #Placing in initial positions
-        posx = -self.number_box_width
-        posy = number_canvas_height/2
-        for number in self.numbers:
-            number.place_number(posx, posy)
-            posx = posx + self.number_box_width + padding
+        self.reel = Reel(number_canvas, self.numbers)
+        self.reel.place(-self.number_box_width, number_canvas_height/2)
 
         #Creating pointer
         triangle_width = self.screen_width//15
@@ -125,43 +259,42 @@ class GenerationPage(tk.Frame):
         self.pointer_line = number_canvas.create_polygon(points,
         width= self.screen_width//200, outline = "black", fill = "white")
 
+        #Frame statistics overlay, hidden until F3 is pressed
+        self.stats_overlay = number_canvas.create_text(self.screen_width//100, self.screen_width//100,
+            anchor = "nw", text = "", fill = "white", font = ("Consolas", 14), state = "hidden")
+
         #backgrounds
         top_canvas["bg"] = self.background_colour
         number_canvas["bg"] = self.background_colour
         bottom_canvas["bg"] = self.background_colour
 
-        #Logo
-        avh_logo_filepath = resource_path("../data/avh_logo_png.png")
-        avh_logo = Image.open(avh_logo_filepath)
-        avh_logo = avh_logo.resize((int(self.screen_width/2), int(bottom_canvas_height/1.2)))
-        avh_logo_width, avh_logo_height = avh_logo.size
+        #Logo, flattened with its black frame into one cached image
+        avh_logo_width, avh_logo_height = int(self.screen_width/2), int(bottom_canvas_height/1.2)
 
         avh_logo_ypos = bottom_canvas_height/2.2
 
         avh_logo_outline_offset = self.screen_width//250
-        bottom_canvas.create_rectangle(self.screen_width/2 - avh_logo_width/2 - avh_logo_outline_offset, 
-                                       avh_logo_ypos - avh_logo_height/2 - avh_logo_outline_offset,
-                                       self.screen_width/2 + avh_logo_width/2 + avh_logo_outline_offset, 
-                                       avh_logo_ypos + avh_logo_height/2 + avh_logo_outline_offset,
-                                       fill = "black")
-        self.avh_logo_image_tk = ImageTk.PhotoImage(avh_logo)
-        bottom_canvas.create_image(self.screen_width/2, avh_logo_ypos, image=self.avh_logo_image_tk)
-
-        #Top text
-        club17_font = tk.font.Font(self.app,font = "Poppins")
-        club17_font["size"] = int(self.screen_height//10)
+        self.bottom_layer = static_layer((self.screen_width, bottom_canvas_height), self.background_colour, [
+            ("rectangle", self.screen_width/2 - avh_logo_width/2 - avh_logo_outline_offset, 
+                          avh_logo_ypos - avh_logo_height/2 - avh_logo_outline_offset,
+                          self.screen_width/2 + avh_logo_width/2 + avh_logo_outline_offset, 
+                          avh_logo_ypos + avh_logo_height/2 + avh_logo_outline_offset,
+                          "black"),
+            ("image", "../data/avh_logo_png.png", self.screen_width/2, avh_logo_ypos, avh_logo_width, avh_logo_height)])
+        bottom_canvas.create_image(0, 0, anchor = "nw", image = self.bottom_layer)
+
+        #Top text, the same cached layer as the StartPage title
+        title_font_size = point_size_to_pixels(self.app, int(self.screen_height//10))
         outline_offset = self.screen_width//250
-        
-        # Create outline text items
-        outline_positions = [(-outline_offset, 0), (outline_offset, 0), (0, -outline_offset), (0, outline_offset)]
+        self.title_layer = static_layer((self.screen_width, top_canvas_height), self.background_colour,
+                                        title_operations(self.screen_width, top_canvas_height, title_font_size, outline_offset))
+        top_canvas.create_image(0, 0, anchor = "nw", image = self.title_layer)
 
-        for dx, dy in outline_positions:
-            top_canvas.create_text(self.screen_width / 2 + dx, top_canvas_height / 1.5 + dy, text="Club17 Member Draw", font=club17_font, fill="black")
-        
-        top_canvas.create_text(self.screen_width/2,top_canvas_height/1.5, 
-                                text="Club17 Member Draw", font = club17_font, fill="white")
-        
-        self.idle_animation()
+        #Winning frame, shown over the reel after each spin
+        winning_font = tk.font.Font(self.app,font = "Poppins")
+        winning_font["size"] = int(self.screen_height/5.5)
+        border_width = self.screen_width//45
+        self.win_window = WinWindow(self, font = winning_font, borderwidth=border_width, relief="solid")
 
     def on_resize(self, event):
         # Get new width and height
@@ -173,89 +306,217 @@ class GenerationPage(tk.Frame):
             print("screen resized")
             print(f"width: {self.app.winfo_screenwidth()}, height: {self.app.winfo_screenheight()}")
 
+    def toggle_stats_overlay(self, event):
+        """Shows or hides the frame statistics overlay"""
+        if self.stats_overlay is None:
+            return
+        self.show_stats_overlay = not self.show_stats_overlay
+        self.number_canvas.itemconfig(self.stats_overlay, text = self.frame_stats.summary(),
+            state = "normal" if self.show_stats_overlay else "hidden")
+        if self.show_stats_overlay:
+            self.scheduler.register(self.update_stats_overlay)
+        else:
+            self.scheduler.unregister(self.update_stats_overlay)
+
+    def update_stats_overlay(self, dt: float) -> bool:
+        """Refreshes the overlay a few times a second"""
+        if self.frame_stats.frames % 15 == 0:
+            self.number_canvas.itemconfig(self.stats_overlay, text = self.frame_stats.summary())
+        return True
+
+    def export_frame_stats(self, event):
+        """Writes this session's frame time histograms to the logs folder when the page is destroyed"""
+        if event.widget is self and self.frame_stats.frames > 0:
+            self.frame_stats.export(resource_path(f"../logs/frame_stats_{strftime('%Y%m%d_%H%M%S')}.json"))
+
     def space_pressed(self, event):
+        if self.trace is not None:
+            self.trace.space_pressed()
         if self.space_times_pressed == 1:
-            self.run_idle_animation = False
-            self.startTime = time()
-            self.run_normal_animation()
+            self.scheduler.unregister(self.idle_animation)
+            if self.predetermined_winner:
+                if not self.start_predetermined_spin():
+                    self.scheduler.register(self.idle_animation)
+                    return
+            else:
+                self.spin_elapsed = 0
+                self.scheduler.register(self.run_normal_animation)
             self.space_times_pressed += 1
-        elif self.space_times_pressed == 2:
+        elif self.space_times_pressed == 2 and self.winner_shown:
             #Close winning window, bring back to idle animation
             self.win_window.hide()
-            self.win_window = None
-            self.run_idle_animation = True
-            self.idle_animation()
+            self.winner_shown = False
+            self.scheduler.register(self.idle_animation)
             self.space_times_pressed = 1
 
-    def get_blacklist(self, filepath: str) -> list:
-        """
-        hi
+    def new_draw_session(self, state: dict = None, excluded_winners: list = None, seed: int = None) -> DrawSession:
+        """Returns a session for the prize tiers entered on the StartPage, or the saved session in state
+
+        Args:
+            state: a saved session to carry on with
+            excluded_winners: the recent winners a new session leaves out, read from the journal when it is None
+            seed: the seed of a new session, a random one when it is None
         """
-        # Get the directory path of the current script (__file__)
-        script_dir = os.path.dirname(sys.argv[0])
-
-        # Construct the path to excel_data.csv relative to the script's directory
-        csv_file_path = os.path.join(script_dir, filepath)
-        with open(csv_file_path, newline='') as blacklist_csv_file:
-            blacklist_reader = reader(blacklist_csv_file)
-            blacklist_list = []
-            for row in blacklist_reader:
-                for number_string in row:
-                    if number_string != "":
-                        blacklist_list.append(int(number_string))
-        return blacklist_list
-
-    def run_normal_animation(self):
-        timeStart = time()
-        elapsedTime = timeStart - self.startTime
-        dx = 150*pow(2,-0.6*(elapsedTime)) - 0.3
-        #print(f"Elapsed time: {elapsedTime}, dx: {dx}")
-        desired_frame_duration = 16
-        if dx > 0:
-            for number in self.numbers:
-                    number.move_number(dx)
-            elapsedTimeFrames = (time() - timeStart)*1000
-            #print(elapsedTime)
-            sleepTime = round(max(1,(desired_frame_duration-elapsedTimeFrames)))
-            #print(f"Sleeptime: {sleepTime}")
-            self.after(sleepTime,self.run_normal_animation)
+        if state is None:
+            self.session_excluded_winners = self.recent_winner_list() if excluded_winners is None else excluded_winners
+            tiers = DrawSession.numbered_tiers(self.start_page.prize_tiers)
         else:
-            self.check_final_pos()
+            self.session_excluded_winners = state["excluded_winners"]
+            tiers, seed = [tuple(tier) for tier in state["tiers"]], state["seed"]
+        session = DrawSession(self.min_member, self.max_member, self.blacklist.union(self.session_excluded_winners),
+                              tiers, self.weights, seed)
+        if state is not None:
+            session.restore(state)
+        return session
+
+    def recent_winner_list(self) -> list:
+        """Returns everyone who won within recent_winner_days, none when it is not set"""
+        if self.recent_winner_days is None:
+            return []
+        return sorted(self.journal.recent_winners(self.recent_winner_days))
+
+    def eligibility_fingerprint(self) -> str:
+        """Returns a hash of the eligible members and their weights, a saved session only fits the same ones"""
+        digest = sha1(f"{self.min_member},{self.max_member}".encode())
+        digest.update(self.blacklist.starts.tobytes())
+        digest.update(self.blacklist.ends.tobytes())
+        if self.weights is not None:
+            digest.update(json.dumps(sorted(self.weights.items())).encode())
+        return digest.hexdigest()
+
+    def session_state(self) -> dict:
+        """Returns the open session as plain values, setup can carry on from it"""
+        return {
+            "max_member_number": self.start_page.member_num_input,
+            "prize_tiers": list(self.start_page.prize_tiers),
+            "fingerprint": self.fingerprint,
+            "generator": {"excluded_winners": self.generator_excluded_winners, **self.ran_gen.state()},
+            "session": (None if self.draw_session is None else
+                        {"excluded_winners": self.session_excluded_winners, **self.draw_session.state()}),
+        }
+
+    def save_snapshot(self):
+        """Saves the open session so it can be restored after a crash, the write happens on the snapshot's own thread"""
+        if self.snapshot is not None:
+            self.snapshot.save(self.session_state())
+
+    def record_winner(self, winning_number: str):
+        """Appends the winner to the draw journal, the write happens on the journal's own thread"""
+        if self.predetermined_winner:
+            pool_size, seed = self.draw_session.pool.size, self.draw_session.seed
+            draw, tier = len(self.draw_session.winners), self.winning_tier
+        else:
+            pool_size, seed, draw, tier = self.ran_gen.size, self.ran_gen.seed, 0, None
+        self.journal.append(self.min_member, self.max_member, pool_size, seed, draw, tier, int(winning_number))
+        if self.trace is not None:
+            self.trace.winner(winning_number)
+
+    def close_session(self, event):
+        """Waits for the journal's writes to finish and removes the snapshot when the app closes cleanly"""
+        if event.widget is not self:
+            return
+        if self.trace is not None:
+            self.trace.close()
+        if self.journal is not None:
+            self.journal.close()
+        if self.snapshot is not None:
+            self.snapshot.delete()
+
+    def get_member_source(self):
+        """Returns the members.db source up to the StartPage's highest member number, or every number up to it without one"""
+        filepath = resource_path("../members.db")
+        if os.path.exists(filepath):
+            return SQLiteMemberSource(filepath, max_member_number = self.start_page.member_num_input)
+        return RangeMemberSource(self.start_page.member_num_input)
+
+    def get_blacklist(self, filepath: str) -> BlacklistIndex:
+        """Returns the index of the numbers and ranges in the blacklist csv file that should never be drawn"""
+        return load_blacklist(filepath)
+
+    def run_normal_animation(self, dt: float) -> bool:
+        self.spin_elapsed += dt
+        #Speed in pixels per 16 ms frame, the frame length the spin was tuned at
+        dx = 150*pow(2,-0.6*(self.spin_elapsed)) - 0.3
+        if dx > 0:
+            self.reel.move(dx*dt/0.016)
+            return True
+        self.check_final_pos()
+        return False
         
-    def idle_animation(self):
-        timeStart = time()
-        desired_frame_duration = 16
-        for number in self.numbers:
-                number.move_number(1)
-        if self.run_idle_animation:
-            elapsedTime = (time() - timeStart)*1000
-            sleepTime = round(max(1,(desired_frame_duration-elapsedTime)))
-            self.after(sleepTime,self.idle_animation)
+    def start_predetermined_spin(self) -> bool:
+        """Draws the session's next winner and starts a spin that will stop with it under the pointer
+
+        Once every prize tier has its winners the next spin starts a new session.
+        If the tiers need more winners than are still eligible, e.g. once
+        recent winners are left out, or the session has no prize left to draw,
+        the error is shown and no spin starts.
+
+        Returns:
+            True if the spin started
+        """
+        self.pointer_x = self.screen_width//2
+        if self.draw_session.finished():
+            excluded_winners, seed = self.recent_winner_list(), None
+            if self.trace is not None:
+                #A replay starts the same session as the recorded run
+                excluded_winners, seed = self.trace.new_session(excluded_winners)
+            try:
+                self.draw_session = self.new_draw_session(excluded_winners = excluded_winners, seed = seed)
+            except ValueError as error:
+                messagebox.showerror("Not enough eligible members", f"Can not start a new draw: {error}.",
+                                     parent = self)
+                return False
+        try:
+            self.winning_tier, winning_number = self.draw_session.draw_winner()
+        except ValueError as error:
+            #A new session with no prizes, e.g. tiers of all zeros from a saved session
+            messagebox.showerror("No prize to draw", f"Can not draw a winner: {error}.", parent = self)
+            return False
+        #The winner does not pass through the prefetcher, so its tile is rendered now rather than mid-spin
+        self.numbers[0].tile_for(winning_number)
+        distance = self.reel.plan_landing(self.pointer_x, SpinCurve.natural_distance(), winning_number)
+        self.spin_curve = SpinCurve(distance, self.spin_duration)
+        self.spin_travelled = 0
+        self.spin_elapsed = 0
+        self.scheduler.register(self.run_predetermined_animation)
+        return True
+
+    def run_predetermined_animation(self, dt: float) -> bool:
+        self.spin_elapsed += dt
+        position = self.spin_curve.position(self.spin_elapsed)
+        self.reel.move(position - self.spin_travelled)
+        self.spin_travelled = position
+        if self.spin_curve.finished(self.spin_elapsed):
+            self.check_final_pos()
+            return False
+        return True
+
+    def idle_animation(self, dt: float) -> bool:
+        self.reel.move(self.IDLE_SPEED*dt)
+        return True
 
     def check_final_pos(self):
         self.pointer_x = self.screen_width//2
-        valid_end = False
-        for number_box in self.numbers:
-            x_pos = int(number_box.get_xpos())
-            val_range = range(x_pos,x_pos + int(self.number_box_width))
-            if self.pointer_x in val_range:
-                valid_end = True
-                winning_number = number_box
-        if not valid_end:
-            self.after(16, self.run_joiner_animation)
-        else:
-            winning_number = winning_number.get_number_as_str()
-            self.after(1000, self.show_winner_window(winning_number))
-    
-    def run_joiner_animation(self):
-        for number_object in self.numbers:
-            number_object.move_number(1)
-        self.after(16,self.check_final_pos)
+        winning_number = self.reel.box_under(self.pointer_x)
+        if winning_number is None:
+            #Stopped in the gap between two boxes, bring the next box up to the pointer
+            winning_number, distance = self.reel.next_box(self.pointer_x)
+            self.reel.move(distance)
+        self.winning_number = winning_number.get_number_as_str()
+        self.record_winner(self.winning_number)
+        self.save_snapshot()
+        self.reveal_elapsed = 0
+        self.scheduler.register(self.reveal_winner)
+
+    def reveal_winner(self, dt: float) -> bool:
+        """Rests the reel on the winner for winner_reveal_delay ms, then opens the winning window"""
+        self.reveal_elapsed += dt
+        if self.reveal_elapsed*1000 < self.winner_reveal_delay:
+            return True
+        self.show_winner_window(self.winning_number)
+        return False
     
     def show_winner_window(self, winning_number: str):
-        #Create winning frame
-        winning_font = tk.font.Font(self.app,font = "Poppins")
-        winning_font["size"] = int(self.screen_height/5.5)
-        border_width = self.screen_width//45
-        self.win_window = WinWindow(self, font = winning_font, borderwidth=border_width, relief="solid")
-        self.win_window.show_winner(winning_number=winning_number)
\ No newline at end of file
+        tier = self.winning_tier if self.predetermined_winner else None
+        self.win_window.show_winner(winning_number=winning_number, tier=tier)
+        self.winner_shown = True
@@ -0,0 +1,91 @@
+from collections import OrderedDict
+from functools import lru_cache
+
+@lru_cache(maxsize=None)
+def load_font(font_path: str, font_size: int) -> tuple:
+    """Returns (font, digit_top, digit_height) for a font file at a pixel size, loaded once per process
+
+    The digit metrics are the top and height of the ink of the digits, so
+    numbers can be centred on the digits themselves rather than the font's
+    ascent and descent.
+    """
+    #PIL is imported on first use so it does not slow down the StartPage
+    from PIL import ImageFont
+
+    font = ImageFont.truetype(font_path, font_size)
+    left, top, right, bottom = font.getbbox("0123456789", anchor="ls")
+    return font, top, bottom - top
+
+class GlyphCache:
+    """A bounded cache of pre-rendered number tiles for the reel
+
+    A tile is the whole number box as one image: the white rectangle, its
+    black border and the number centred inside. The reel swaps a box's image
+    when it wraps instead of re-laying out a large font on the canvas.
+
+    Tiles are keyed by (number, tile size, border width, font size, font file)
+    and the least recently used tile is dropped once maxsize is reached.
+    A miss renders the tile with PIL, which is far slower than a hit, so the
+    GenerationPage renders upcoming numbers while Tk is idle (see
+    NumberPrefetcher) and sizes the cache to hold them.
+    Fonts and their digit metrics are loaded once per font size and shared
+    by every GlyphCache. PIL is only imported when the first tile is drawn.
+
+    Attributes:
+        font_path: the .ttf file the numbers are rendered with
+        maxsize: the most tiles kept at once
+    """
+
+    def __init__(self, font_path: str, maxsize: int = 64) -> None:
+        """Initialises an empty GlyphCache
+
+        Args:
+            font_path: the .ttf file the numbers are rendered with
+            maxsize: the most tiles kept at once, it should be well above the
+                number of boxes on the reel plus the numbers rendered ahead
+        """
+        self.font_path = font_path
+        self.maxsize = maxsize
+        self.tiles = OrderedDict()
+
+    def font(self, font_size: int) -> tuple:
+        """Returns (font, digit_top, digit_height) for a pixel font size, see load_font"""
+        return load_font(self.font_path, font_size)
+
+    def render(self, number: str, size: tuple, font_size: int, border_width: int) -> "Image.Image":
+        """Draws a tile with PIL, the slow part of a cache miss, see tile for the arguments"""
+        from PIL import Image, ImageDraw
+
+        width, height = size
+        font, digit_top, digit_height = self.font(font_size)
+        image = Image.new("RGB", size, "white")
+        draw = ImageDraw.Draw(image)
+        draw.rectangle((0, 0, width - 1, height - 1), fill="white", outline="black", width=border_width)
+        #Baseline so the ink of the digits is vertically centred
+        baseline = (height - digit_height)/2 - digit_top
+        draw.text((width/2, baseline), number, font=font, fill="black", anchor="ms")
+        return image
+
+    def tile(self, number: str, size: tuple, font_size: int, border_width: int) -> "ImageTk.PhotoImage":
+        """Returns the tile for a number, rendering it if it is not cached
+
+        Args:
+            number: the zero-padded number string to show
+            size: the (width, height) of the whole box in pixels, border included
+            font_size: the pixel size of the number
+            border_width: the width of the black border in pixels
+        """
+        key = (number, size, border_width, font_size, self.font_path)
+        tile = self.tiles.get(key)
+        if tile is not None:
+            self.tiles.move_to_end(key)
+            return tile
+
+        from PIL import ImageTk
+
+        tile = ImageTk.PhotoImage(self.render(number, size, font_size, border_width))
+        self.tiles[key] = tile
+        if len(self.tiles) > self.maxsize:
+            #Boxes keep a reference to the tile they show, so an evicted tile stays on screen
+            self.tiles.popitem(last=False)
+        return tile
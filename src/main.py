@@ -1,46 +1,43 @@
+import argparse
+import logging
 import os, sys
-from ctypes import windll, byref, create_unicode_buffer, create_string_buffer
 
+from font_loader import register_font
 from generator_app import GeneratorApp
 from start_page import StartPage
+from draw_trace import TraceRecorder
 from generation_page import GenerationPage
-
-FR_PRIVATE  = 0x10
-FR_NOT_ENUM = 0x20
+from session_snapshot import SessionSnapshot
 
 def resource_path(relative_path):
     """Get absolute path to resource, works for dev and for PyInstaller"""
     base_path = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
     return os.path.join(base_path, relative_path)
 
-def loadfont(fontpath, private=True, enumerable=False):
-    """
-    Makes fonts located in file `fontpath` available to the font system.
-
-    `private`     if True, other processes cannot see this font, and this
-                  font will be unloaded when the process dies
-    `enumerable`  if True, this font will appear when enumerating fonts
+def first_frame_shown(app, event):
+    """Quits once the StartPage has been drawn, benchmarks/bench_startup.py times the launch to the exit"""
+    event.widget.unbind("<Expose>")
+    #Idle callbacks run after the redraws the Expose event queued
+    app.after_idle(app.destroy)
 
-    """
-    # This function was taken from
-    # https://github.com/ifwe/digsby/blob/f5fe00244744aa131e07f09348d10563f3d8fa99/digsby/src/gui/native/win/winfonts.py#L15
-    if isinstance(fontpath, str):
-        pathbuf = create_unicode_buffer(fontpath)
-        AddFontResourceEx = windll.gdi32.AddFontResourceExW
-    elif isinstance(fontpath, bytes):
-        pathbuf = create_string_buffer(fontpath)
-        AddFontResourceEx = windll.gdi32.AddFontResourceExA
-    else:
-        raise TypeError('fontpath must be of type str or unicode')
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the member draw")
+    parser.add_argument("--spin", choices=["free", "predetermined"], default="free",
+                        help="free: the reel slows down and the winner is whichever number stops under the pointer, "
+                             "predetermined: the winners of each prize tier are drawn first and the reel lands on them")
+    parser.add_argument("--recent-winner-days", type=float, metavar="DAYS",
+                        help="members who won within DAYS days can not win again, by default anyone eligible can win")
+    parser.add_argument("--exit-after-first-frame", action="store_true",
+                        help="quit as soon as the start page is drawn, for benchmarks/bench_startup.py")
+    parser.add_argument("--record-trace", metavar="PATH",
+                        help="record the run to PATH when the app closes, for benchmarks/replay_trace.py")
+    args = parser.parse_args(argv)
 
-    flags = (FR_PRIVATE if private else 0) | (FR_NOT_ENUM if not enumerable else 0)
-    numFontsAdded = AddFontResourceEx(byref(pathbuf), flags, 0)
-    return bool(numFontsAdded)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s: %(message)s")
 
-def main():
     #Load the font
     font_filepath = resource_path("../data/Poppins.ttf")
-    loadfont(font_filepath)
+    register_font(font_filepath)
 
     #Create fonts
     fonts = dict()
@@ -51,21 +48,43 @@ def main():
     #Set colour of the app's background
     background_colour = "#253556"
 
+    #A session left open by a crash is saved here, a benchmark launch leaves it alone
+    snapshot = None if args.exit_after_first_frame else SessionSnapshot(resource_path("../session.snapshot"))
+    saved_state = None if snapshot is None else snapshot.load()
+
     #Create an app
     app = GeneratorApp()
 
     #Create each page
     start_page = StartPage(parent=app.frame, app=app, fonts=fonts, 
-                           background_colour=background_colour)
+                           background_colour=background_colour,
+                           predetermined_winner=args.spin == "predetermined")
     generation_page = GenerationPage(parent=app.frame, app=app, start_page=start_page, 
-                                        background_colour=background_colour)
+                                        background_colour=background_colour,
+                                        predetermined_winner=args.spin == "predetermined",
+                                        recent_winner_days=args.recent_winner_days,
+                                        snapshot=snapshot)
+
+    #Record the run for benchmarks/replay_trace.py
+    if args.record_trace:
+        generation_page.trace = TraceRecorder(args.record_trace, generation_page)
 
     #Add each page to the app
     app.add_frame(start_page, "StartPage")
     app.add_frame(generation_page, "GenerationPage")
 
-    #Show the start page
-    app.show_frame("StartPage")
+    if args.exit_after_first_frame:
+        app.show_frame("StartPage")
+        start_page.bind("<Expose>", lambda event: first_frame_shown(app, event))
+    elif saved_state is not None:
+        #Carry on with the open session, skipping the start page
+        start_page.member_num_input = saved_state["max_member_number"]
+        start_page.prize_tiers = saved_state["prize_tiers"]
+        generation_page.setup(saved_state)
+        app.show_frame("GenerationPage")
+    else:
+        #Show the start page
+        app.show_frame("StartPage")
 
     # Driver Code
     app.mainloop()
@@ -0,0 +1,150 @@
+import sqlite3
+from datetime import date, timedelta
+
+class RangeMemberSource:
+    """Every member number from 1 up to the highest member number typed into the StartPage
+
+    Attributes:
+        max_member_number: the highest member number (inclusive)
+    """
+
+    def __init__(self, max_member_number: int) -> None:
+        self.max_member_number = max_member_number
+
+    def close(self) -> None:
+        """Nothing to close, here so every member source can be used the same way"""
+
+    def eligible_ranges(self, on: date = None) -> list:
+        """Returns the eligible member numbers as inclusive (start, end) ranges"""
+        return [(1, self.max_member_number)] if self.max_member_number >= 1 else []
+
+    def count(self, on: date = None) -> int:
+        """Returns how many members are eligible"""
+        return max(self.max_member_number, 0)
+
+    def eligible_ids(self, on: date = None):
+        """Yields every eligible member number in ascending order"""
+        yield from range(1, self.max_member_number + 1)
+
+class SQLiteMemberSource:
+    """Eligible members read from a local SQLite file of member records
+
+    Each member has a join date, a status and optionally the date a
+    suspension ends, with dates stored as ISO YYYY-MM-DD text. A member is
+    eligible on a day if their status is one of the eligible statuses, they
+    joined at least min_membership_days before, and they are not suspended.
+    The members table has a covering index on (status, join_date,
+    suspended_until) and an index on suspended_until. add_members runs
+    ANALYZE, so SQLite uses the index when few members are eligible and
+    scans in id order when most are.
+
+    eligible_ranges is the fast path: it folds the streamed ids into runs of
+    consecutive numbers batch by batch and returns only the ranges, which is
+    all a compact RandomGenerator needs. Grouping the runs in SQL with a
+    window function (gaps and islands) was slower than folding in Python.
+    count answers from the covering index alone. eligible_ids streams the
+    ids for callers that need each one.
+
+    Typical usage example:
+
+      source = SQLiteMemberSource("members.db", min_membership_days = 30)
+      ran_gen = RandomGenerator.from_ranges(source.eligible_ranges(), blacklist)
+
+    Attributes:
+        connection: the sqlite3 connection to the member file
+        statuses: the statuses that can win
+        min_membership_days: how many days a member must have been a member to win
+        max_member_number: the highest member number that can win, None for no limit
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS members (
+            id INTEGER PRIMARY KEY,
+            join_date TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'active',
+            suspended_until TEXT
+        );
+        CREATE INDEX IF NOT EXISTS members_eligibility ON members (status, join_date, suspended_until);
+        CREATE INDEX IF NOT EXISTS members_suspended_until ON members (suspended_until);
+    """
+
+    def __init__(self, filepath: str, statuses: tuple = ("active",), min_membership_days: int = 0,
+                 max_member_number: int = None) -> None:
+        """Opens the member file, creating the table and indexes if they are missing
+
+        Args:
+            filepath: path to the SQLite file
+            statuses: the statuses that can win
+            min_membership_days: how many days a member must have been a member to win
+            max_member_number: the highest member number that can win, None for no limit
+        """
+        self.connection = sqlite3.connect(filepath)
+        self.connection.executescript(self.SCHEMA)
+        self.statuses = tuple(statuses)
+        self.min_membership_days = min_membership_days
+        self.max_member_number = max_member_number
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def add_members(self, members) -> None:
+        """Inserts or replaces (id, join_date, status, suspended_until) rows in one transaction
+
+        The table statistics are refreshed afterwards so the query planner
+        knows how selective each status is.
+        """
+        with self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO members VALUES (?, ?, ?, ?)",
+                                        ((member_id, str(join_date), status,
+                                          None if suspended_until is None else str(suspended_until))
+                                         for member_id, join_date, status, suspended_until in members))
+        self.connection.execute("ANALYZE")
+
+    def eligibility_filter(self, on: date = None) -> tuple:
+        """Returns the WHERE clause and its parameters for the members eligible on a day, today by default"""
+        on = on or date.today()
+        joined_by = on - timedelta(days = self.min_membership_days)
+        clause = (f"status IN ({','.join('?'*len(self.statuses))}) AND join_date <= ?"
+                  " AND (suspended_until IS NULL OR suspended_until < ?)")
+        parameters = [*self.statuses, joined_by.isoformat(), on.isoformat()]
+        if self.max_member_number is not None:
+            clause += " AND id <= ?"
+            parameters.append(self.max_member_number)
+        return clause, parameters
+
+    def eligible_ranges(self, on: date = None, batch: int = 20000) -> list:
+        """Returns the eligible member numbers as inclusive (start, end) ranges in ascending order"""
+        starts = []
+        ends = []
+        for ids in self.eligible_id_batches(on, batch):
+            #A run ends wherever the next id is not one more than the last
+            breaks = [index for index in range(1, len(ids)) if ids[index] - ids[index-1] != 1]
+            first = 0
+            for end in breaks + [len(ids)]:
+                if ends and ends[-1] + 1 == ids[first]:
+                    ends[-1] = ids[end-1]
+                else:
+                    starts.append(ids[first])
+                    ends.append(ids[end-1])
+                first = end
+        return list(zip(starts, ends))
+
+    def count(self, on: date = None) -> int:
+        """Returns how many members are eligible"""
+        clause, parameters = self.eligibility_filter(on)
+        return self.connection.execute(f"SELECT COUNT(*) FROM members WHERE {clause}", parameters).fetchone()[0]
+
+    def eligible_id_batches(self, on: date = None, batch: int = 20000):
+        """Yields lists of up to batch eligible member numbers, in ascending order"""
+        clause, parameters = self.eligibility_filter(on)
+        cursor = self.connection.execute(f"SELECT id FROM members WHERE {clause} ORDER BY id", parameters)
+        while True:
+            rows = cursor.fetchmany(batch)
+            if not rows:
+                return
+            yield [member_id for (member_id,) in rows]
+
+    def eligible_ids(self, on: date = None, batch: int = 20000):
+        """Yields every eligible member number in ascending order, fetching batch rows at a time"""
+        for ids in self.eligible_id_batches(on, batch):
+            yield from ids
@@ -12,18 +12,31 @@ fix winner selection function
 import tkinter as tk
 
 class NumberBox:
-    """Summary of class here.
+    """One white box with a number in it on the reel
 
-    Longer class information...
-    Longer class information...
+    A NumberBox owns its canvas items and its current number. Where the box
+    is on the canvas is tracked by the Reel it belongs to.
+
+    With a GlyphCache the box is one image item showing a pre-rendered tile,
+    otherwise it is a rectangle item with a text item on top.
 
     Attributes:
-        likes_spam: A boolean indicating if we like SPAM or not.
-        eggs: An integer count of the eggs we have laid.
+        number: the zero-padded number string currently displayed
+        tag: the canvas tag shared by this box's rectangle and text
     """
 
-    def __init__(self, canvas: tk.Canvas, font, num_boxes: int, canvas_width: int, canvas_height: int, ran_gen, ) -> None:
+    __slots__ = ("canvas", "font", "ran_gen", "num_boxes", "canvas_width", "canvas_height", "padding",
+                 "rectangle_width", "rectangle_height", "canvas_rectangle", "tag", "box_width", "box_height",
+                 "min_x", "number", "canvas_text", "text_height", "text_width", "inner_padding",
+                 "glyph_cache", "border_width", "tile", "canvas_image")
+
+    #Text size of the numbers per font, measured once instead of once per box
+    text_metrics = {}
+
+    def __init__(self, canvas: tk.Canvas, font, num_boxes: int, canvas_width: int, canvas_height: int, ran_gen,
+                 reel_tag: str = "reel", glyph_cache = None) -> None:
         self.canvas = canvas
+        self.glyph_cache = glyph_cache
         self.font = font
         self.ran_gen = ran_gen
         self.num_boxes = num_boxes
@@ -37,49 +50,94 @@ class NumberBox:
         #width =  + (num_boxes-2)*(width_boxes)
         #width - borderwidth*(num_boxes-2) - num_padding*padding_width =  (num_boxes-2)*(width_boxes)
         border_width = self.canvas_width//150
+        self.border_width = border_width
         self.rectangle_width = (self.canvas_width - border_width*(num_boxes - 2)- (self.padding*num_padding))/(num_boxes - 2)
         self.rectangle_height = self.canvas_height//2
-        self.canvas_rectangle = canvas.create_rectangle(0,0, self.rectangle_width, self.rectangle_height, fill="white", outline = "black", width = border_width)
         
         self.box_width = self.rectangle_width + border_width
         self.box_height = self.rectangle_height + border_width
 
         self.min_x = -self.box_width
 
-        self.canvas_text = canvas.create_text(0,0, text = ran_gen.generate_number(), fill = "black", font = font)
+        self.number = ran_gen.generate_number()
+        self.canvas_rectangle = None
+        self.canvas_text = None
+        self.canvas_image = None
+        self.tile = None
 
-        
-        # TODO: Use a command like this to get the width and height of a box
-        text_bound_box = self.canvas.bbox(self.canvas_text)
-        self.text_height = text_bound_box[3] - text_bound_box[1]
-        self.text_width = text_bound_box[2] - text_bound_box[0]
+        if glyph_cache is not None:
+            self.tile = self.get_tile()
+            self.canvas_image = canvas.create_image(0,0, image = self.tile, anchor = "nw")
+            first_item = self.canvas_image
+        else:
+            self.canvas_rectangle = canvas.create_rectangle(0,0, self.rectangle_width, self.rectangle_height, fill="white", outline = "black", width = border_width)
+            self.canvas_text = canvas.create_text(0,0, text = self.number, fill = "black", font = font)
+            first_item = self.canvas_rectangle
+
+        # Every item carries the reel tag so the whole strip moves in one call,
+        # and a tag of the box's own so a wrapping box moves in one call
+        self.tag = f"number_box_{first_item}"
+        for item in (self.canvas_image, self.canvas_rectangle, self.canvas_text):
+            if item is not None:
+                canvas.itemconfig(item, tags = (reel_tag, self.tag))
+
+        if glyph_cache is None:
+            metrics_key = (str(font), len(self.number))
+            if metrics_key not in NumberBox.text_metrics:
+                text_bound_box = self.canvas.bbox(self.canvas_text)
+                NumberBox.text_metrics[metrics_key] = (text_bound_box[2] - text_bound_box[0],
+                                                       text_bound_box[3] - text_bound_box[1])
+            self.text_width, self.text_height = NumberBox.text_metrics[metrics_key]
+        else:
+            self.text_width, self.text_height = 0, 0
 
         self.inner_padding = (self.box_width-self.text_width)/2
 
+    def get_tile(self):
+        """
+        Returns the pre-rendered image of this box showing its current number
+        """
+        return self.tile_for(self.number)
+
+    def tile_for(self, number: str):
+        """
+        Returns the pre-rendered image of a box like this one showing number, rendering it if it is not cached
+        """
+        size = (round(self.box_width), round(self.box_height))
+        return self.glyph_cache.tile(number, size, abs(int(self.font["size"])), self.border_width)
+
     def place_number(self, posx: float, posy: float) -> None:
         """
         Places the middle left side of the number box at (posx, posy)
         """
+        if self.canvas_image is not None:
+            self.canvas.coords(self.canvas_image, posx, posy - self.box_height/2)
+            return
         #Top left corner of rectangle is placed at coordinates
-        self.posx_rectangle = posx
-        self.posy_rectangle = posy - self.box_height/2
-        self.canvas.moveto(self.canvas_rectangle, self.posx_rectangle, self.posy_rectangle)
+        self.canvas.moveto(self.canvas_rectangle, posx, posy - self.box_height/2)
         #Text is placed top left
-        self.posx_text = posx + self.text_width/2 + self.inner_padding
-        self.posy_text = posy
-        self.canvas.coords(self.canvas_text, self.posx_text, self.posy_text)
-
-    def move_number(self, dx):
-        if self.posx_rectangle > self.min_x:
-            self.canvas.move(self.canvas_text, -dx, 0)
-            self.canvas.move(self.canvas_rectangle, -dx, 0)
-            self.posx_rectangle -= dx
+        self.canvas.coords(self.canvas_text, posx + self.text_width/2 + self.inner_padding, posy)
+
+    def wrap(self, distance: float, number: str = None) -> None:
+        """
+        Moves the box right by distance to the other end of the reel and gives it a new number
+
+        The new number is drawn from the random generator unless one is given.
+        """
+        self.show_number(number if number is not None else self.ran_gen.generate_number())
+        self.canvas.move(self.tag, distance, 0)
+
+    def show_number(self, number: str) -> None:
+        """
+        Changes the number displayed by the box without moving it
+        """
+        self.number = number
+        if self.canvas_image is not None:
+            self.tile = self.get_tile()
+            self.canvas.itemconfig(self.canvas_image, image=self.tile)
         else:
-            self.canvas.itemconfig(self.canvas_text, text=self.ran_gen.generate_number())
-            self.canvas.move(self.canvas_text, (self.num_boxes)*(self.box_width + self.padding) - dx, 0)
-            self.canvas.move(self.canvas_rectangle, (self.num_boxes)*(self.box_width + self.padding) - dx, 0)
-            self.posx_rectangle += (self.num_boxes)*(self.box_width + self.padding) - dx
-                
+            self.canvas.itemconfig(self.canvas_text, text=self.number)
+
     def get_width(self) -> float:
         """
         Returns the width of the number box (float)
@@ -96,10 +154,4 @@ class NumberBox:
         """
         Return current number being displayed by number box
         """
-        return self.canvas.itemcget(self.canvas_text, "text")
-    
-    def get_xpos(self) -> float:
-        """
-        Returns the current x position of the left side of the rectangle
-        """
-        return self.posx_rectangle
\ No newline at end of file
+        return self.number
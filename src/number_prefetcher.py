@@ -0,0 +1,90 @@
+from collections import deque
+import tkinter as tk
+
+class NumberPrefetcher:
+    """A bounded buffer of upcoming reel numbers, filled while Tk is idle
+
+    The reel takes a number every time a box wraps. Taking it from this
+    buffer is an O(1) pop, and the RandomGenerator work of drawing it, and
+    any regenerate it triggers, happens in after_idle callbacks between
+    frames instead of inside the frame.
+
+    Contract with the winner draw: the buffer only changes when numbers are
+    drawn, not which numbers are drawn. It holds the next numbers of the
+    generator's generate_number stream in order, so the reel shows exactly
+    the sequence it would have shown drawing each number at wrap time. A
+    predetermined winner is drawn separately by the DrawSession and given
+    straight to its box by the Reel, so it never passes through the buffer.
+    In the free spin the winner is whichever displayed number stops under
+    the pointer, as before.
+
+    With a prerender callback, the idle refills also hand each upcoming
+    number to it, a few at a time, so the reel's tile for a number is
+    rendered before the box that shows it wraps rather than inside the frame.
+
+    Attributes:
+        ran_gen: the RandomGenerator the numbers are drawn from
+        capacity: the most numbers held at once
+        buffer: the upcoming numbers, next number first
+        prerender: called with each upcoming number while Tk is idle, None to not prerender
+    """
+
+    def __init__(self, widget: tk.Misc, ran_gen, capacity: int = 32, batch: int = 8, prerender = None,
+                 prerender_batch: int = 2) -> None:
+        """Initialises a NumberPrefetcher and fills it for the first time
+
+        Args:
+            widget: the tk widget whose after_idle runs the refills
+            ran_gen: the RandomGenerator the numbers are drawn from
+            capacity: the most numbers held at once
+            batch: the most numbers drawn in one idle callback, so a refill never delays a frame for long
+            prerender: called with each upcoming number while Tk is idle, None to not prerender
+            prerender_batch: the most numbers prerendered in one idle callback
+        """
+        self.widget = widget
+        self.ran_gen = ran_gen
+        self.capacity = capacity
+        self.batch = batch
+        self.buffer = deque()
+        self.prerender = prerender
+        self.prerender_batch = prerender_batch
+        #Numbers drawn into the buffer that have not been prerendered yet
+        self.unrendered = deque(maxlen = capacity)
+        self.refill_id = None
+        self.fill(capacity)
+
+    def fill(self, count: int) -> None:
+        """Draws up to count numbers into the buffer, stopping when it is full"""
+        for _ in range(min(count, self.capacity - len(self.buffer))):
+            number = self.ran_gen.generate_number()
+            self.buffer.append(number)
+            self.unrendered.append(number)
+
+    def refill(self) -> None:
+        """Idle callback that tops the buffer up one batch at a time, then prerenders a few numbers"""
+        self.refill_id = None
+        self.fill(self.batch)
+        if self.prerender is not None:
+            for _ in range(min(self.prerender_batch, len(self.unrendered))):
+                self.prerender(self.unrendered.popleft())
+        if len(self.buffer) < self.capacity or (self.prerender is not None and self.unrendered):
+            self.refill_id = self.widget.after_idle(self.refill)
+
+    def set_prerender(self, prerender) -> None:
+        """Starts prerendering upcoming numbers, including those already in the buffer"""
+        self.prerender = prerender
+        if self.refill_id is None:
+            self.refill_id = self.widget.after_idle(self.refill)
+
+    def generate_number(self) -> str:
+        """Returns the next number, drawing it directly only if the buffer has run dry"""
+        number = self.buffer.popleft() if self.buffer else self.ran_gen.generate_number()
+        if self.refill_id is None:
+            self.refill_id = self.widget.after_idle(self.refill)
+        return number
+
+    def cancel(self) -> None:
+        """Cancels any pending refill, used when the generator is replaced"""
+        if self.refill_id is not None:
+            self.widget.after_cancel(self.refill_id)
+            self.refill_id = None
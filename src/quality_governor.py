@@ -0,0 +1,118 @@
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+class QualityGovernor:
+    """Steps the reel's frame rate down under load and back up when there is headroom
+
+    Every reel animation is time-based, so a lower frame rate means coarser
+    motion steps but the same speed, and a spin still takes exactly as long
+    at every level.
+
+    The governor watches how much of each frame's budget the frame cost. A
+    frame's cost is measured from its start to the next frame's start, less
+    the time the loop chose to wait, so a Tk redraw of the canvas after the
+    callbacks, most of the work on a slow PC, counts once it makes the next
+    frame late. When recent frames run over budget or frames keep being
+    skipped, it steps down a level. When recent frames would fit comfortably
+    into the next level up, without skipping, it steps back up. The windows
+    are long enough that a single slow frame does not change the level.
+
+    A redraw that fits in the wait does not show in the cost, so a level can
+    look like it has headroom when the next level up would still be too
+    slow. Each time a step up has to be undone within up_window frames, the
+    governor waits twice as long before trying again, up to max_backoff
+    times up_window.
+
+    Attributes:
+        levels: (name, frames per second) pairs, best quality first
+        level: the index of the current level in levels
+    """
+
+    LEVELS = (("full", 60), ("reduced", 45), ("low", 30))
+
+    def __init__(self, scheduler, levels: tuple = LEVELS, down_load: float = 0.8,
+                 up_load: float = 0.4, window: int = 30, up_window: int = 180, max_backoff: int = 16) -> None:
+        """Initialises a QualityGovernor at the best level and applies it to the scheduler
+
+        Args:
+            scheduler: the FrameScheduler whose frame_duration is adjusted
+            levels: (name, frames per second) pairs, best quality first
+            down_load: the fraction of the frame budget the recent average may use before stepping down
+            up_load: the fraction of the higher level's frame budget the average must stay under to step up
+            window: how many frames the average and the skipped frame count for stepping down cover
+            up_window: how many frames in a row must have headroom before stepping up
+            max_backoff: the most up_window is multiplied by after failed steps up
+        """
+        self.scheduler = scheduler
+        self.levels = levels
+        self.down_load = down_load
+        self.up_load = up_load
+        self.recent_work = deque(maxlen=window)
+        #Whether each recent frame was followed by skipped frames
+        self.recent_skips = deque(maxlen=window)
+        self.up_window = up_window
+        self.max_backoff = max_backoff
+        self.backoff = 1
+        self.frames_with_headroom = 0
+        #Frames since the last change of level, and whether it was a step up
+        self.frames_at_level = 0
+        self.stepped_up = False
+        self.level = 0
+        self.apply()
+
+    def apply(self) -> None:
+        """Sets the scheduler's frame duration for the current level"""
+        name, frames_per_second = self.levels[self.level]
+        self.scheduler.frame_duration = 1/frames_per_second
+        if self.scheduler.frame_stats is not None:
+            self.scheduler.frame_stats.target_frame_ms = 1000/frames_per_second
+
+    def set_level(self, level: int, reason: str) -> None:
+        """Switches to a level, logging the change"""
+        if level > self.level and self.stepped_up and self.frames_at_level < self.up_window:
+            self.backoff = min(2*self.backoff, self.max_backoff)
+        self.stepped_up = level < self.level
+        self.frames_at_level = 0
+        self.level = level
+        self.recent_work.clear()
+        self.recent_skips.clear()
+        self.frames_with_headroom = 0
+        self.apply()
+        name, frames_per_second = self.levels[level]
+        logger.info("Reel quality level %s (%d fps): %s", name, frames_per_second, reason)
+
+    def observe(self, work: float, skipped: int) -> None:
+        """Records one frame's cost and how many frames were skipped after it
+
+        Args:
+            work: the time the frame took, from its start to the next frame's start less the
+                time the loop waited in between, in seconds, so a redraw that made the next frame late is included
+            skipped: the number of frame deadlines that passed while the frame ran
+        """
+        budget = self.scheduler.frame_duration
+        self.frames_at_level += 1
+        self.recent_work.append(work)
+        self.recent_skips.append(skipped > 0)
+        average = sum(self.recent_work)/len(self.recent_work)
+
+        if self.level < len(self.levels) - 1 and len(self.recent_work) == self.recent_work.maxlen:
+            #More than one, so a single hitch does not change the level
+            skipping = sum(self.recent_skips)
+            if skipped > 0 and skipping > 1:
+                self.set_level(self.level + 1, f"skipped frames after {skipping} of the last {len(self.recent_skips)} frames")
+                return
+            if average > budget*self.down_load:
+                self.set_level(self.level + 1, f"average work {average*1000:.1f} ms of a {budget*1000:.1f} ms frame")
+                return
+
+        if self.level > 0:
+            higher_budget = 1/self.levels[self.level - 1][1]
+            #A redraw that fits in the wait is not seen in the cost, skipped frames show it did not fit
+            if average < higher_budget*self.up_load and not any(self.recent_skips):
+                self.frames_with_headroom += 1
+            else:
+                self.frames_with_headroom = 0
+            if self.frames_with_headroom >= self.up_window*self.backoff:
+                self.set_level(self.level - 1, f"average work {average*1000:.1f} ms leaves headroom")
@@ -1,64 +1,268 @@
-from random import randrange
+from array import array
+from bisect import bisect_right
+from random import Random
+from secrets import randbits
+
+from blacklist import BlacklistIndex
 
 class RandomGenerator:
-    """Summary of class here.
+    """Draws member numbers without replacement from a fixed pool
+
+    The numbers that are still available always sit at the front of the pool
+    and the numbers that have been drawn are swapped to the back, so a draw
+    and a reset are both O(1).
 
-    Longer class information...
-    Longer class information...
+    The pool is either a list of zero-padded number strings, or in compact
+    mode the range minus the blacklist stored as runs of eligible numbers.
+    Compact mode only formats a number when it is drawn and its memory grows
+    with the blacklist rather than with the range.
 
     Attributes:
-        likes_spam: A boolean indicating if we like SPAM or not.
-        eggs: An integer count of the eggs we have laid.
+        number_list: a list of zero-padded number strings, or None in compact mode
+        size: the number of eligible numbers in the pool
+        available: the number of slots at the front of the pool that can still be drawn
+        count: how many numbers have been drawn since the last regenerate
+        seed: the seed of this generator's own Random, so its draws can be repeated
+        random: the Random instance every draw uses
     """
 
     #intialise all the variables
-    def __init__(self, min, max, blacklist):
+    def __init__(self, min, max, blacklist, compact=False, seed=None):
         """Initialise the random generator
 
         :min: minimum number to generate from (inclusive)
         :max: maximum number to generate up to (inclusive)
-        :blacklist: python list containing all the numbers not to be drawn -- needs to be something with contains
+        :blacklist: a BlacklistIndex, or any container or iterable of the numbers not to be drawn
+        :compact: keep the pool as runs of eligible numbers instead of a list of strings
+        :seed: an int to repeat a previous sequence of draws, None for a fresh random seed
         """
-        self.number_list = []
-        self.deleted_number_list = []
+        excluded = self.exclusion_index(blacklist)
+        self.set_runs(*self.eligible_runs(min, max, excluded), compact)
+        self.set_seed(seed)
+
+    def set_seed(self, seed=None) -> None:
+        """Restarts the generator's Random from a seed, a fresh 64 bit seed when it is None"""
+        self.seed = randbits(64) if seed is None else seed
+        self.random = Random(self.seed)
+
+    def set_runs(self, run_starts: array, run_offsets: array, size: int, compact: bool) -> None:
+        """Fills the pool from runs of eligible numbers, as returned by eligible_runs"""
+        if compact:
+            self.number_list = None
+            self.run_starts, self.run_offsets, self.size = run_starts, run_offsets, size
+            # Slots that have been swapped away from their own position, slot -> rank
+            self.swapped = {}
+        else:
+            run_ends = run_offsets[1:] + array("q", [size])
+            self.number_list = [f"{number:04d}" for start, offset, end in zip(run_starts, run_offsets, run_ends)
+                                for number in range(start, start + end - offset)]
+            self.size = size
+        self.available = self.size
         self.count = 0
-        for number in range(min,max+1):
-            if number not in blacklist:
-                if number < 10:
-                    number = "000" + str(number)
-                elif number < 100:
-                    number = "00" + str(number)
-                elif number < 1000:
-                    number = "0" + str(number)
-                else:
-                    number = str(number)
-                self.number_list.append(number)
-        
-        #ADT needs to be able to index to get a value, and needs to have contains. thats all
-    
-    def generate_number(self) -> str:
+
+    @staticmethod
+    def sorted_ranges(ranges) -> list:
+        """Returns inclusive (start, end) ranges sorted and with overlaps merged, only re-sorting if they need it"""
+        ranges = list(ranges)
+        if any(later[0] <= earlier[1] for earlier, later in zip(ranges, ranges[1:])):
+            ranges = list(BlacklistIndex(ranges).intervals())
+        return ranges
+
+    @staticmethod
+    def ranges_eligibility(ranges, blacklist=()) -> tuple:
+        """Returns (min, max, excluded) for a pool of the numbers in some ranges minus a blacklist
+
+        The gaps between the ranges are excluded along with the blacklist, so
+        any pool that takes min, max and a blacklist, such as a DrawSession or
+        a WeightedGenerator, can be built over the ranges.
+
+        :ranges: an iterable of inclusive (start, end) pairs, e.g. from a member source
+        :blacklist: a BlacklistIndex, or any container or iterable of the numbers not to be drawn
+        """
+        ranges = RandomGenerator.sorted_ranges(ranges)
+        if not ranges:
+            return 1, 0, BlacklistIndex([])
+        low, high = ranges[0][0], ranges[-1][1]
+        gaps = [(earlier[1] + 1, later[0] - 1) for earlier, later in zip(ranges, ranges[1:])
+                if later[0] > earlier[1] + 1]
+        blacklisted = RandomGenerator.excluded_intervals(RandomGenerator.exclusion_index(blacklist), low, high)
+        return low, high, BlacklistIndex([*gaps, *blacklisted])
+
+    @classmethod
+    def from_ranges(cls, ranges, blacklist=(), compact=False, seed=None) -> "RandomGenerator":
+        """Returns a generator over the numbers in some inclusive (start, end) ranges minus a blacklist
+
+        The ranges become the pool's runs directly, with the blacklist cut out
+        of them in one pass, so sorted ranges from a member source cost O(ranges + blacklist).
+        """
+        ran_gen = cls.__new__(cls)
+        excluded = cls.excluded_intervals(cls.exclusion_index(blacklist))
+        ran_gen.set_runs(*cls.runs_of(cls.sorted_ranges(ranges), excluded), compact)
+        ran_gen.set_seed(seed)
+        return ran_gen
+
+    @classmethod
+    def from_numbers(cls, numbers, blacklist=(), compact=False, seed=None) -> "RandomGenerator":
+        """Returns a generator over an iterable of numbers minus a blacklist
+
+        The numbers are folded into ranges as they are read, so a stream of
+        consecutive ids costs no more than one range.
         """
-        array set method:
-        generate a set from min to max numbers
-        generate a set of blacklisted numbers
-        difference set1 to set2
-        generate an int from the range(len(set1))
-        number = set1.array[int]
+        return cls.from_ranges(BlacklistIndex.from_numbers(numbers).intervals(), blacklist, compact, seed)
+
+    @staticmethod
+    def exclusion_index(blacklist):
+        """Returns an index of the blacklist with fast membership checks
+
+        A BlacklistIndex or a set is used as it is, anything else is hashed into a set.
+
+        :blacklist: a BlacklistIndex, e.g. from GenerationPage.get_blacklist, or any container or iterable of ints
+        """
+        if isinstance(blacklist, (set, frozenset, BlacklistIndex)):
+            return blacklist
+        return set(blacklist)
+
+    @staticmethod
+    def excluded_intervals(excluded, min: int = None, max: int = None):
+        """Returns the excluded numbers as sorted (start, end) intervals, only those from min to max when given
+
+        A BlacklistIndex is walked interval by interval, so a blacklisted range
+        costs the same as a single number.
+        """
+        if isinstance(excluded, BlacklistIndex):
+            return excluded.intervals(min, max)
+        return ((number, number) for number in sorted(excluded)
+                if (min is None or number >= min) and (max is None or number <= max))
+
+    @staticmethod
+    def runs_of(ranges, excluded) -> tuple:
+        """Cuts sorted (start, end) excluded intervals out of sorted, disjoint ranges and returns the runs left
+
+        Returns (run_starts, run_offsets, size) where run_offsets[i] is how many
+        eligible numbers come before run i and size is the total count.
         """
-        index = randrange(0,len(self.number_list),1)
-        value = self.number_list[index]
-        if (len(self.number_list) <= 1) or (self.count >= 20):
+        run_starts = array("q")
+        run_offsets = array("q")
+        size = 0
+        excluded = iter(excluded)
+        cut = next(excluded, None)
+        for start, end in ranges:
+            while cut is not None and cut[1] < start:
+                cut = next(excluded, None)
+            while cut is not None and cut[0] <= end:
+                if cut[0] > start:
+                    run_starts.append(start)
+                    run_offsets.append(size)
+                    size += cut[0] - start
+                start = cut[1] + 1
+                if cut[1] > end:
+                    #The cut runs on into the next range
+                    break
+                cut = next(excluded, None)
+            if start <= end:
+                run_starts.append(start)
+                run_offsets.append(size)
+                size += end - start + 1
+        return run_starts, run_offsets, size
+
+    @staticmethod
+    def eligible_runs(min: int, max: int, excluded) -> tuple:
+        """Splits range(min, max+1) minus the excluded numbers into runs of consecutive numbers
+
+        Returns (run_starts, run_offsets, size) as runs_of does.
+        """
+        return RandomGenerator.runs_of([(min, max)], RandomGenerator.excluded_intervals(excluded, min, max))
+
+    def number_at(self, slot: int) -> str:
+        """Returns the zero-padded number held in a slot of the pool"""
+        if self.number_list is not None:
+            return self.number_list[slot]
+        return self.select(self.swapped.get(slot, slot))
+
+    def select(self, rank: int) -> str:
+        """Returns the rank-th smallest eligible number (from 0), compact mode only
+
+        Unlike number_at, this does not depend on which numbers have been drawn.
+        """
+        run = bisect_right(self.run_offsets, rank) - 1
+        return f"{self.run_starts[run] + rank - self.run_offsets[run]:04d}"
+
+    def generate_number(self) -> str:
+        """Draws a random number from the available part of the pool
+
+        The drawn number is swapped with the last available number and the
+        available boundary moves down by one, so nothing is shifted in the pool.
+        """
+        index = self.random.randrange(0,self.available,1)
+        value = self.number_at(index)
+        if (self.available <= 1) or (self.count >= 20):
             self.regenerate()
         else:
-            self.deleted_number_list.append(value)
-            self.number_list.pop(index)
+            last = self.available - 1
+            if self.number_list is not None:
+                self.number_list[index] = self.number_list[last]
+                self.number_list[last] = value
+            else:
+                rank = self.swapped.get(index, index)
+                self.swapped[index] = self.swapped.get(last, last)
+                self.swapped[last] = rank
+            self.available = last
             self.count += 1
         return value
     
     def regenerate(self) -> None:
-        """Resets the number generator and count"""
-        for number in self.deleted_number_list:
-            self.number_list.append(number)
-        self.deleted_number_list = []
+        """Resets the number generator and count
+
+        Drawn numbers are already stored behind the available boundary,
+        so moving the boundary back to the end returns them all to the pool.
+        """
+        self.available = self.size
         self.count = 0
+        if self.number_list is None:
+            self.swapped.clear()
+
+    def draw_winner(self) -> str:
+        """Draws one number from the whole pool, every eligible number equally likely
+
+        This is independent of generate_number and does not move the available boundary.
+        """
+        return self.number_at(self.random.randrange(0,self.size,1))
+
+    def sample(self, count: int) -> list:
+        """Draws count distinct numbers from the whole pool in O(count)
+
+        This is independent of generate_number, it does not move the available
+        boundary and every eligible number is equally likely.
+        """
+        return [self.number_at(slot) for slot in self.random.sample(range(self.size), count)]
+
+    def state(self) -> dict:
+        """Returns the draw position and Random state as plain values that can be saved as JSON
+
+        A compact pool only needs its swapped slots, which regenerate clears
+        every 21 draws. A list pool saves its whole order.
+        """
+        state = {"seed": self.seed, "random": self.random.getstate(), "available": self.available,
+                 "count": self.count, "deleted": self.deleted_number_list}
+        if self.number_list is None:
+            state["swapped"] = list(self.swapped.items())
+        else:
+            state["order"] = [int(number) for number in self.number_list]
+        return state
+
+    def restore(self, state: dict) -> None:
+        """Puts a generator built over the same pool back to a saved state"""
+        version, internal_state, gauss_next = state["random"]
+        self.seed = state["seed"]
+        self.random.setstate((version, tuple(internal_state), gauss_next))
+        self.available = state["available"]
+        self.count = state["count"]
+        if self.number_list is None:
+            self.swapped = {slot: rank for slot, rank in state["swapped"]}
+        else:
+            self.number_list = [f"{number:04d}" for number in state["order"]]
 
+    @property
+    def deleted_number_list(self) -> list:
+        """Returns the numbers drawn since the last regenerate"""
+        return [self.number_at(slot) for slot in range(self.available, self.size)]
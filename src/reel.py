@@ -0,0 +1,122 @@
+from math import ceil
+import tkinter as tk
+
+class Reel:
+    """The strip of number boxes that scrolls across the number canvas
+
+    Every canvas item of every box carries the reel tag, so moving the whole
+    strip is a single canvas.move call per frame. Individual boxes are only
+    touched when one scrolls off the left side and wraps to the right end.
+
+    The boxes are evenly spaced and wrap in order, so the reel's whole layout
+    is the index of the leftmost box and that box's x position. Every box's
+    position, and the box under any x coordinate, is arithmetic on those two.
+
+    Wraps are counted, so a number can be scheduled for the box that will
+    land under the pointer at the end of a spin of known length.
+
+    Attributes:
+        canvas: the tk.Canvas the boxes are drawn on
+        numbers: the NumberBox instances in the reel, in left to right order at placement
+        tag: the canvas tag shared by every item in the reel
+        box_width: the width of one box including its border
+        pitch: the distance between the left sides of neighbouring boxes
+        head: the index in numbers of the leftmost box
+        head_x: the x position of the left side of the leftmost box
+        wraps: how many times a box has wrapped since the reel was created
+        scheduled_numbers: a dict of wrap count -> number to show on the box wrapping at that count
+    """
+
+    __slots__ = ("canvas", "numbers", "tag", "box_width", "pitch", "min_x", "wrap_distance", "head", "head_x",
+                 "wraps", "scheduled_numbers")
+
+    def __init__(self, canvas: tk.Canvas, numbers: list, tag: str = "reel") -> None:
+        """Initialises a Reel over number boxes that were created with the same tag
+
+        Args:
+            canvas: the tk.Canvas the boxes are drawn on
+            numbers: a list of NumberBox instances created with reel_tag=tag
+            tag: the canvas tag shared by every item in the reel
+        """
+        self.canvas = canvas
+        self.numbers = numbers
+        self.tag = tag
+        self.box_width = numbers[0].get_width()
+        self.pitch = self.box_width + numbers[0].get_padding()
+        self.min_x = -self.box_width
+        self.wrap_distance = len(numbers)*self.pitch
+        self.head = 0
+        self.head_x = 0.0
+        self.wraps = 0
+        self.scheduled_numbers = {}
+
+    def place(self, posx: float, posy: float) -> None:
+        """
+        Places the boxes side by side with the middle left side of the first box at (posx, posy)
+        """
+        self.head = 0
+        self.head_x = posx
+        for number in self.numbers:
+            number.place_number(posx, posy)
+            posx += self.pitch
+
+    def move(self, dx: float) -> None:
+        """
+        Moves the whole reel left by dx, wrapping any box that has gone off screen
+        """
+        self.head_x -= dx
+        self.canvas.move(self.tag, -dx, 0)
+        while self.head_x <= self.min_x:
+            self.wraps += 1
+            self.numbers[self.head].wrap(self.wrap_distance, self.scheduled_numbers.pop(self.wraps, None))
+            self.head = (self.head + 1) % len(self.numbers)
+            self.head_x += self.pitch
+
+    def plan_landing(self, x: float, min_distance: float, number: str) -> float:
+        """
+        Returns a distance of at least min_distance that stops a box centred on x, and schedules number for that box
+
+        The reel is treated as an endless strip, where strip box k is k boxes
+        right of the current leftmost box. The landing box is at least a whole
+        reel away, so it is still to be wrapped into place during the spin and
+        the number is given to it when it wraps.
+        """
+        count = len(self.numbers)
+        offset = x - self.head_x
+        strip_box = max(count, ceil((min_distance + offset - self.box_width/2)/self.pitch))
+        self.scheduled_numbers[self.wraps + strip_box - count + 1] = number
+        return strip_box*self.pitch + self.box_width/2 - offset
+
+    def refresh(self, ran_gen) -> None:
+        """
+        Switches every box to a new number source (anything with generate_number) and shows a fresh number on each
+        """
+        self.scheduled_numbers.clear()
+        for number in self.numbers:
+            number.ran_gen = ran_gen
+            number.show_number(ran_gen.generate_number())
+
+    def positions(self) -> list:
+        """
+        Returns the x position of the left side of each box, in the same order as numbers
+        """
+        count = len(self.numbers)
+        return [self.head_x + ((index - self.head) % count)*self.pitch for index in range(count)]
+
+    def box_under(self, x: float):
+        """
+        Returns the NumberBox covering x, or None if x falls in a gap or outside the reel
+        """
+        offset = x - self.head_x
+        slot = int(offset // self.pitch)
+        if offset < 0 or slot >= len(self.numbers) or offset - slot*self.pitch >= self.box_width:
+            return None
+        return self.numbers[(self.head + slot) % len(self.numbers)]
+
+    def next_box(self, x: float) -> tuple:
+        """
+        Returns (box, distance) for the first box whose left side is right of x and how far the reel has to move left to bring it to x
+        """
+        offset = x - self.head_x
+        slot = int(offset // self.pitch) + 1
+        return self.numbers[(self.head + slot) % len(self.numbers)], slot*self.pitch - offset
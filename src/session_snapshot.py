@@ -0,0 +1,117 @@
+import gzip
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+class SessionSnapshot:
+    """Keeps the open draw session in a small file so it survives a crash
+
+    Each save replaces the whole file atomically: the snapshot is written to
+    a temporary file in the same folder, flushed and fsynced, then moved over
+    the old one with os.replace, so a crash leaves either the old snapshot or
+    the new one and never a mix. The snapshot is gzipped JSON.
+
+    Saves run on a background thread so a draw never waits on the disk. If
+    several saves queue up while one is being written, only the latest is
+    written next.
+
+    Typical usage example:
+
+      snapshot = SessionSnapshot("session.snapshot")
+      state = snapshot.load()
+      snapshot.save({"max_member_number": 600, ...})
+      snapshot.delete()
+
+    Attributes:
+        filepath: the snapshot file
+    """
+
+    #2 saves the weighted generators' weight changes
+    VERSION = 2
+
+    def __init__(self, filepath: str) -> None:
+        self.filepath = filepath
+        self.condition = threading.Condition()
+        #The latest state waiting to be written, None when there is nothing to write
+        self.pending = None
+        self.writing = False
+        self.writer = None
+
+    def load(self):
+        """Returns the saved state, or None if there is no snapshot or it can not be read"""
+        if not os.path.exists(self.filepath):
+            return None
+        try:
+            with gzip.open(self.filepath, "rt", encoding="utf-8") as snapshot_file:
+                state = json.load(snapshot_file)
+        except (OSError, EOFError, ValueError) as error:
+            logger.warning("ignoring unreadable session snapshot %s: %s", self.filepath, error)
+            return None
+        if state.get("version") != self.VERSION:
+            logger.warning("ignoring session snapshot %s with version %s", self.filepath, state.get("version"))
+            return None
+        return state
+
+    def save(self, state: dict) -> None:
+        """Queues state to be written, returns straight away
+
+        Args:
+            state: plain values that can be saved as JSON, it must not be changed after it is passed in
+        """
+        with self.condition:
+            self.pending = state
+            if self.writer is None:
+                self.writer = threading.Thread(target=self.write_snapshots, name="session-snapshot", daemon=True)
+                self.writer.start()
+            self.condition.notify()
+
+    def write_snapshots(self) -> None:
+        """Writer thread, writes the latest pending state whenever there is one"""
+        while True:
+            with self.condition:
+                while self.pending is None:
+                    self.condition.wait()
+                state, self.pending = self.pending, None
+                self.writing = True
+            try:
+                self.write({"version": self.VERSION, **state})
+            except OSError as error:
+                logger.warning("could not save session snapshot %s: %s", self.filepath, error)
+            with self.condition:
+                self.writing = False
+                self.condition.notify_all()
+
+    def write(self, state: dict) -> None:
+        """Writes state to the snapshot file atomically"""
+        data = gzip.compress(json.dumps(state, separators=(",", ":")).encode("utf-8"))
+        directory = os.path.dirname(os.path.abspath(self.filepath))
+        os.makedirs(directory, exist_ok=True)
+        temporary = f"{self.filepath}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as snapshot_file:
+            snapshot_file.write(data)
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+        os.replace(temporary, self.filepath)
+        if hasattr(os, "O_DIRECTORY"):
+            #The rename itself is only durable once the folder is synced
+            directory_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(directory_fd)
+            finally:
+                os.close(directory_fd)
+
+    def flush(self, timeout: float = 5) -> None:
+        """Waits until every queued save has been written"""
+        with self.condition:
+            self.condition.wait_for(lambda: self.pending is None and not self.writing, timeout)
+
+    def delete(self) -> None:
+        """Removes the snapshot once the session is closed cleanly"""
+        with self.condition:
+            self.pending = None
+        self.flush()
+        if os.path.exists(self.filepath):
+            os.remove(self.filepath)
@@ -0,0 +1,71 @@
+from array import array
+from math import ceil, log, log2
+
+class SpinCurve:
+    """A precomputed position-vs-time table for a spin of fixed distance and duration
+
+    The reel's speed follows the free spin's deceleration, a*2^(-rate*t) - b,
+    with b chosen so the speed reaches exactly zero at the end of the spin.
+    The positions are scaled so the reel has travelled exactly distance
+    pixels when the spin ends, then sampled every step seconds. Looking up a
+    frame's position is an index and a linear interpolation, so the motion
+    does not depend on the frame rate.
+
+    Attributes:
+        distance: how far the reel travels over the whole spin, in pixels
+        duration: how long the spin lasts, in seconds
+        step: the time between table entries, in seconds
+    """
+
+    #The free spin starts at 150 px per 16 ms frame and decelerates at 2^(-0.6t)
+    RATE = 0.6
+    START_SPEED = 150/0.016
+    END_SPEED_RATIO = 0.3/150
+
+    def __init__(self, distance: float, duration: float = None, step: float = 0.001):
+        """Builds the position table for a spin
+
+        Args:
+            distance: how far the reel travels over the whole spin, in pixels
+            duration: how long the spin lasts in seconds, defaults to the free spin's duration
+            step: the time between table entries, in seconds
+        """
+        self.distance = distance
+        self.duration = duration if duration is not None else self.natural_duration()
+        self.step = step
+        end_factor = pow(2, -self.RATE*self.duration)
+        entries = ceil(self.duration/step)
+        total = self.unscaled_position(self.duration, end_factor)
+        self.table = array("d", (distance*self.unscaled_position(min(index*step, self.duration), end_factor)/total
+                                 for index in range(entries + 1)))
+
+    @classmethod
+    def natural_duration(cls) -> float:
+        """Returns how long the free spin takes to slow from its start speed to a stop, in seconds"""
+        return log2(1/cls.END_SPEED_RATIO)/cls.RATE
+
+    @classmethod
+    def natural_distance(cls) -> float:
+        """Returns how far the free spin travels before it stops, in pixels"""
+        duration = cls.natural_duration()
+        return cls.START_SPEED*cls.unscaled_position(duration, pow(2, -cls.RATE*duration))
+
+    @classmethod
+    def unscaled_position(cls, time: float, end_factor: float) -> float:
+        """Returns the distance travelled by time for a start speed of 1 that reaches 0 at the end"""
+        return (1 - pow(2, -cls.RATE*time))/(cls.RATE*log(2)) - end_factor*time
+
+    def position(self, elapsed: float) -> float:
+        """Returns how far the reel should have travelled elapsed seconds into the spin"""
+        if elapsed >= self.duration:
+            return self.distance
+        if elapsed <= 0:
+            return 0.0
+        scaled = elapsed/self.step
+        index = int(scaled)
+        fraction = scaled - index
+        return self.table[index] + (self.table[index + 1] - self.table[index])*fraction
+
+    def finished(self, elapsed: float) -> bool:
+        """Returns True once elapsed seconds is at or past the end of the spin"""
+        return elapsed >= self.duration
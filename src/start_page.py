@@ -1,8 +1,10 @@
 import os
 import sys
 import tkinter as tk
+from tkinter import messagebox
 from typing import Dict
-from PIL import ImageTk, Image  
+
+from static_layers import point_size_to_pixels, static_layer, title_operations
 
 
 def resource_path(relative_path):
@@ -17,7 +19,8 @@ class StartPage(tk.Frame):
     It also contains text instructions on how to use the generator
     """
 
-    def __init__(self, parent: tk.Frame, app: tk.Tk, fonts: Dict[str,tuple], background_colour: str):
+    def __init__(self, parent: tk.Frame, app: tk.Tk, fonts: Dict[str,tuple], background_colour: str,
+                 predetermined_winner: bool = False):
         """Initializes the instance based on spam preference.
 
         Args:
@@ -26,9 +29,14 @@ class StartPage(tk.Frame):
             fonts: a dictionary that contains tuples of font information in 
                 tk.Font format ("name", size, other specifiers)
             background_colour: a str that represents the desired background colour (e.g. #253556)
+            predetermined_winner: if True the draw has prize tiers, so the page asks for them,
+                the free spin draws one winner per spin and ignores tiers
         """
         self.app = app
+        self.predetermined_winner = predetermined_winner
         self.member_num_input = 0
+        #Winners per prize tier, in the order the tiers are drawn
+        self.prize_tiers = [1]
         
         #create frame
         tk.Frame.__init__(self, parent)
@@ -61,43 +69,39 @@ class StartPage(tk.Frame):
         bottom_canvas.pack()
 
         #Title
-        #Top text
-        club17_font = tk.font.Font(self.app,font = fonts["title"])
-        club17_font["size"] = int(self.screen_height//10)
+        #Top text, flattened with its outline into one cached image
+        title_font_size = point_size_to_pixels(self.app, int(self.screen_height//10))
         outline_offset = self.screen_width//250
-        
-        # Create outline text items
-        outline_positions = [(-outline_offset, 0), (outline_offset, 0), (0, -outline_offset), (0, outline_offset)]
-
-        for dx, dy in outline_positions:
-            top_canvas.create_text(self.screen_width / 2 + dx, top_canvas_height / 1.5 + dy, text="Club17 Member Draw", font=club17_font, fill="black")
-        
-        top_canvas.create_text(self.screen_width/2,top_canvas_height/1.5, 
-                                text="Club17 Member Draw", font = club17_font, fill="white")
+        self.title_layer = static_layer((self.screen_width, top_canvas_height), background_colour,
+                                        title_operations(self.screen_width, top_canvas_height, title_font_size, outline_offset))
+        top_canvas.create_image(0, 0, anchor = "nw", image = self.title_layer)
         
         # Creating Input text 
-        # Create outline text items
         input_text_xpos = self.screen_width / 2
         input_text_ypos = lower_top_canvas_height / 2
 
-        outline_offset = 2
-        outline_positions = [(-outline_offset, 0), (outline_offset, 0), (0, -outline_offset), (0, outline_offset)]
-
-        for dx, dy in outline_positions:
-            lower_top_canvas.create_text(input_text_xpos + dx, input_text_ypos + dy, text="Please input the current highest member number below", font=fonts["start_page"], fill="black")
-        
-        lower_top_canvas.create_text(input_text_xpos, input_text_ypos, 
-                                    text="Please input the current highest member number below", 
-                                    font = fonts["start_page"], fill="white")
+        self.input_text_layer = static_layer((self.screen_width, lower_top_canvas_height), background_colour, [
+            ("text", input_text_xpos, input_text_ypos, "Please input the current highest member number below",
+             point_size_to_pixels(self.app, fonts["start_page"][1]), "white", 2, "black")])
+        lower_top_canvas.create_image(0, 0, anchor = "nw", image = self.input_text_layer)
 
         member_num_entry = tk.Entry(centre_canvas, font = fonts["start_page"], width = 10)
         # TODO: Automate this so that it saves to a file and reads that each time so number is always correct
         member_num_entry.insert(0,"600")
         member_num_entry.pack()
+
+        #Prize tiers, e.g. 3,2,1 draws three winners for the first prize, then two, then one
+        prize_tiers_entry = tk.Entry(centre_canvas, font = fonts["start_page"], width = 10)
+        prize_tiers_entry.insert(0,"1")
+        if predetermined_winner:
+            prize_tiers_label = tk.Label(centre_canvas, font = fonts["instruction"], text = "Winners per prize (e.g. 3,2,1)",
+                                         bg = background_colour, fg = "white")
+            prize_tiers_label.pack(pady = (20, 0))
+            prize_tiers_entry.pack()
         
         #next page button 
         onto_generation_button = tk.Button(centre_canvas, text ="Draw Number", font = fonts["start_page"],
-            command=lambda : self.next_page(member_num_entry.get()))
+            command=lambda : self.next_page(member_num_entry.get(), prize_tiers_entry.get()))
         onto_generation_button.pack(pady = 30, ipadx = 40, ipady = 20, side = "bottom")
 
         #Instructions
@@ -115,19 +119,16 @@ class StartPage(tk.Frame):
                                     "Enter information and then press Draw Number\n" + 
                                     "Press space on the next screen to show numbers scrolling\n" +
                                     "Press space again to roll for a number\n" +
+                                    ("Each roll draws the next prize, a member can only win once\n" if predetermined_winner else "") +
                                     "Press space again after to reset\n")
         instruction_text.pack()
 
-        #Import picture
-        avh_logo_black = resource_path("../data/avh_black_logo.jpg")
-        avh_logo = Image.open(avh_logo_black)
-        avh_logo = avh_logo.resize((600, 325))
-        self.avh_logo_image_tk = ImageTk.PhotoImage(avh_logo)
-
         #Place picture
         avh_logo_x = self.screen_width/2
         avh_logo_y = bottom_canvas_height/3
-        bottom_canvas.create_image(avh_logo_x, avh_logo_y, image=self.avh_logo_image_tk)
+        self.bottom_layer = static_layer((self.screen_width, bottom_canvas_height), background_colour, [
+            ("image", "../data/avh_black_logo.jpg", avh_logo_x, avh_logo_y, 600, 325)])
+        bottom_canvas.create_image(0, 0, anchor = "nw", image = self.bottom_layer)
 
         #quit button
         quit_button = tk.Button(bottom_canvas, text = "Quit", font = fonts["start_page"], command = lambda : app.destroy())
@@ -142,7 +143,37 @@ class StartPage(tk.Frame):
 
         self.bind("<Escape>",escapeKey)
     
-    def next_page(self, member_num_entry: str):
-        self.member_num_input = int(member_num_entry)
-        self.app.frames["GenerationPage"].setup()
+    def next_page(self, member_num_entry: str, prize_tiers_entry: str = "1"):
+        """Starts the draw, or shows why it can not start and stays on this page
+
+        The prize tiers are only read for a predetermined spin, each needs at least one winner.
+        """
+        try:
+            self.member_num_input = int(member_num_entry)
+            if self.predetermined_winner:
+                self.prize_tiers = self.parse_prize_tiers(prize_tiers_entry)
+            self.app.frames["GenerationPage"].setup()
+        except ValueError as error:
+            messagebox.showerror("Can not start the draw", str(error), parent = self)
+            return
         self.app.show_frame("GenerationPage")
+
+    @staticmethod
+    def parse_prize_tiers(prize_tiers_entry: str) -> list:
+        """Returns the winners per prize from a comma separated entry, [1] when it is empty
+
+        Raises:
+            ValueError: a count is not a whole number or is less than one
+        """
+        counts = []
+        for count in prize_tiers_entry.split(","):
+            if not count.strip():
+                continue
+            try:
+                count = int(count)
+            except ValueError:
+                raise ValueError(f"invalid number of winners: {count.strip()!r}")
+            if count < 1:
+                raise ValueError(f"every prize needs at least one winner: {count}")
+            counts.append(count)
+        return counts or [1]
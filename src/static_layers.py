@@ -0,0 +1,100 @@
+"""Flattens the decoration that never moves into one cached image per canvas.
+
+A layer is a canvas size, a background colour and a list of drawing
+operations. It is rendered once with PIL and saved as a PNG in the asset
+cache, keyed by everything that affects how it looks. Later calls, from any
+page or draw, reuse the loaded PhotoImage, so a canvas only needs one image
+item for all of its static decoration.
+
+Operations are tuples:
+
+  ("text", x, y, text, font_size, fill, outline_offset, outline_fill)
+      text centred on (x, y), with copies offset left, right, up and down by
+      outline_offset pixels drawn underneath in outline_fill
+  ("rectangle", x0, y0, x1, y1, fill)
+  ("image", relative_path, x, y, width, height)
+      an asset scaled to (width, height) and centred on (x, y)
+
+Typical usage example:
+
+  layer = static_layer((1920, 240), "#253556",
+                       [("text", 960, 160, "Club17 Member Draw", 144, "white", 7, "black")])
+  canvas.create_image(0, 0, anchor="nw", image=layer)
+"""
+
+import os
+import tkinter as tk
+from hashlib import sha1
+
+from asset_cache import cache_dir, resource_path, scaled_image_path, source_hash
+
+FONT_PATH = "../data/Poppins.ttf"
+
+#Loaded layers shared by every page, keyed by the layer's cache key
+_layers = {}
+
+def layer_key(size: tuple, background: str, operations: list) -> str:
+    """Returns a hex key that changes whenever anything that affects the rendered layer changes"""
+    sources = [source_hash(resource_path(FONT_PATH))]
+    for operation in operations:
+        if operation[0] == "image":
+            sources.append(source_hash(resource_path(operation[1])))
+    return sha1(repr((tuple(size), background, list(operations), sources)).encode()).hexdigest()
+
+def render_layer(size: tuple, background: str, operations: list, filepath: str) -> None:
+    """Draws the layer with PIL and saves it as a PNG at filepath"""
+    from PIL import Image, ImageDraw, ImageFont
+
+    layer = Image.new("RGBA", size, background)
+    draw = ImageDraw.Draw(layer)
+    fonts = {}
+    for operation in operations:
+        if operation[0] == "text":
+            _, x, y, text, font_size, fill, outline_offset, outline_fill = operation
+            if font_size not in fonts:
+                fonts[font_size] = ImageFont.truetype(resource_path(FONT_PATH), font_size)
+            font = fonts[font_size]
+            outline_positions = [(-outline_offset, 0), (outline_offset, 0), (0, -outline_offset), (0, outline_offset)]
+            for dx, dy in outline_positions:
+                draw.text((x + dx, y + dy), text, font=font, fill=outline_fill, anchor="mm")
+            draw.text((x, y), text, font=font, fill=fill, anchor="mm")
+        elif operation[0] == "rectangle":
+            _, x0, y0, x1, y1, fill = operation
+            draw.rectangle((x0, y0, x1, y1), fill=fill)
+        elif operation[0] == "image":
+            _, relative_path, x, y, width, height = operation
+            with Image.open(scaled_image_path(relative_path, (width, height))) as image:
+                image = image.convert("RGBA")
+                layer.alpha_composite(image, (round(x - width/2), round(y - height/2)))
+        else:
+            raise ValueError(f"unknown layer operation {operation[0]!r}")
+
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    temporary = f"{filepath}.{os.getpid()}.tmp"
+    layer.convert("RGB").save(temporary, format="PNG")
+    os.replace(temporary, filepath)
+
+def static_layer(size: tuple, background: str, operations: list) -> tk.PhotoImage:
+    """Returns the flattened layer as a PhotoImage, rendering it only if it is not cached
+
+    Args:
+        size: the (width, height) of the canvas in pixels
+        background: the canvas background colour, e.g. "#253556"
+        operations: the drawing operations described in the module docstring, drawn in order
+    """
+    size = (int(size[0]), int(round(size[1])))
+    key = layer_key(size, background, operations)
+    if key not in _layers:
+        filepath = os.path.join(cache_dir(), f"layer_{key[:24]}.png")
+        if not os.path.exists(filepath):
+            render_layer(size, background, operations, filepath)
+        _layers[key] = tk.PhotoImage(file=filepath)
+    return _layers[key]
+
+def title_operations(canvas_width: float, canvas_height: float, font_size: int, outline_offset: int) -> list:
+    """Returns the operations for the outlined "Club17 Member Draw" title both pages show"""
+    return [("text", canvas_width/2, canvas_height/1.5, "Club17 Member Draw", font_size, "white", outline_offset, "black")]
+
+def point_size_to_pixels(widget: tk.Misc, point_size: float) -> int:
+    """Converts a Tk font size in points to the pixel size PIL uses"""
+    return round(point_size*float(widget.tk.call("tk", "scaling")))
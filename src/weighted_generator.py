@@ -0,0 +1,247 @@
+import logging
+from array import array
+from bisect import bisect_left
+from csv import reader
+from math import isfinite
+from random import Random
+from secrets import randbits
+
+from random_generator import RandomGenerator
+
+logger = logging.getLogger(__name__)
+
+def load_weights(filepath: str) -> dict:
+    """Reads a weights csv file of number,weight rows into a dict
+
+    A member's weight is how many entries they hold, e.g. 3 for two bonus
+    tickets on top of their own entry. Members missing from the file hold one
+    entry. Empty rows and a number,weight header row are skipped. Every other
+    row should hold a whole number and a weight of zero or more, rows that do
+    not are skipped and logged as a warning, as blacklist.py does for bad cells.
+
+    Args:
+        filepath: path to the csv file, relative paths are taken from the working directory
+    """
+    weights = {}
+    with open(filepath, newline='') as weights_csv_file:
+        for line_number, row in enumerate(reader(weights_csv_file), start=1):
+            cells = [cell.strip() for cell in row if cell.strip() != ""]
+            if not cells:
+                continue
+            if line_number == 1 and not cells[0].lstrip("-").isdigit():
+                continue
+            try:
+                number, weight = int(cells[0]), float(cells[1])
+            except (IndexError, ValueError):
+                number, weight = None, None
+            if len(cells) != 2 or weight is None or not isfinite(weight) or weight < 0:
+                logger.warning("skipped weights row %r on line %d of %s", ",".join(row), line_number, filepath)
+                continue
+            weights[number] = weight
+    return weights
+
+class WeightedGenerator:
+    """Draws member numbers with probability proportional to their weights
+
+    The draws use a Walker/Vose alias table: each of the n table slots holds
+    a member, an alias member and the probability of keeping the member. A
+    draw picks a slot uniformly and keeps the member or takes its alias, so
+    every draw is O(1) however uneven the weights are. Building the table is
+    O(n).
+
+    Lowering a weight, including to zero when a member is blacklisted or has
+    won, does not rebuild the table. The member keeps its slot and a draw of
+    it is only accepted with probability current weight / built weight.
+    Raising a weight, or adding a member, marks the table stale and it is
+    rebuilt before the next draw. The table is also rebuilt once less than
+    half of its weight is left, so a draw never takes more than two tries on
+    average.
+
+    Every weight change is logged, with how many of them the table was last
+    built with, so a saved state rebuilds the exact same table and a
+    restored generator carries on with the same draws.
+
+    It can replace a RandomGenerator as the reel's number source, every
+    display draw is independent and weighted the same as the winner draw.
+
+    Attributes:
+        min: the lowest member number (inclusive)
+        max: the highest member number (inclusive)
+        members: the member numbers in the table, ascending
+        size: the number of members in the table, it counts every member the table was built
+            with, including those whose weight has been set to zero since
+        total_weight: the sum of the current weights
+        seed: the seed of this generator's own Random, so its draws can be repeated
+        random: the Random instance every draw uses
+        changes: every (number, weight) set since the generator was built, in order
+        built_changes: how many of the changes the table was last built with
+    """
+
+    def __init__(self, min: int, max: int, blacklist, weights: dict, seed: int = None) -> None:
+        """Initialises a WeightedGenerator and builds its alias table
+
+        Args:
+            min: the lowest member number (inclusive)
+            max: the highest member number (inclusive)
+            blacklist: a BlacklistIndex, or any container or iterable of numbers that can not be drawn
+            weights: number -> weight, members not in it have a weight of 1
+            seed: an int to repeat a previous sequence of draws, None for a fresh random seed
+
+        Raises:
+            ValueError: no member has a weight above zero
+        """
+        self.min = min
+        self.max = max
+        self.seed = randbits(64) if seed is None else seed
+        self.random = Random(self.seed)
+        run_starts, run_offsets, size = RandomGenerator.eligible_runs(min, max, RandomGenerator.exclusion_index(blacklist))
+        run_ends = run_offsets[1:] + array("q", [size])
+        members = array("q")
+        for start, offset, end in zip(run_starts, run_offsets, run_ends):
+            members.extend(range(start, start + end - offset))
+        current = array("d", (weights.get(number, 1) for number in members))
+        #Weights raised, or members added, since the table was built
+        self.pending = {}
+        self.changes = []
+        self.build(members, current)
+
+    def build(self, members: array, weights: array) -> None:
+        """Builds the alias table for members with the given weights, dropping zero weights"""
+        if any(weight == 0 for weight in weights):
+            kept = [index for index, weight in enumerate(weights) if weight > 0]
+            members = array("q", (members[index] for index in kept))
+            weights = array("d", (weights[index] for index in kept))
+        n = len(members)
+        total = sum(weights)
+        if n == 0 or total <= 0:
+            raise ValueError("no member has a weight above zero")
+
+        probability = array("d", bytes(8*n))
+        alias = array("q", range(n))
+        scaled = [weight*n/total for weight in weights]
+        small = [index for index, value in enumerate(scaled) if value < 1]
+        large = [index for index, value in enumerate(scaled) if value >= 1]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            probability[less] = scaled[less]
+            alias[less] = more
+            scaled[more] += scaled[less] - 1
+            if scaled[more] < 1:
+                small.append(more)
+            else:
+                large.append(more)
+        #Whatever is left is 1 up to rounding error
+        for index in small + large:
+            probability[index] = 1
+
+        self.members = members
+        self.probability = probability
+        self.alias = alias
+        #Weights the table was built with, and the weights now
+        self.built_weights = weights
+        self.current_weights = array("d", weights)
+        self.built_total = total
+        self.total_weight = total
+        self.size = n
+        self.pending.clear()
+        self.stale = False
+        self.built_changes = len(self.changes)
+
+    def rebuild(self) -> None:
+        """Rebuilds the alias table from the current and pending weights"""
+        weights = {number: weight for number, weight in zip(self.members, self.current_weights)}
+        weights.update(self.pending)
+        members = array("q", sorted(weights))
+        self.build(members, array("d", (weights[number] for number in members)))
+
+    def index_of(self, number: int):
+        """Returns the table slot of a member, or None if it is not in the table"""
+        index = bisect_left(self.members, number)
+        if index < len(self.members) and self.members[index] == number:
+            return index
+        return None
+
+    def weight_of(self, number: int) -> float:
+        """Returns a member's current weight, 0 for numbers that can not be drawn"""
+        if number in self.pending:
+            return self.pending[number]
+        index = self.index_of(number)
+        return 0 if index is None else self.current_weights[index]
+
+    def set_weight(self, number: int, weight: float) -> None:
+        """Changes a member's weight, rebuilding the table before the next draw only if it went up
+
+        Raises:
+            ValueError: the weight is negative or the number is outside min to max
+        """
+        if weight < 0:
+            raise ValueError(f"weight of member {number} is negative: {weight}")
+        if not self.min <= number <= self.max:
+            raise ValueError(f"member {number} is outside {self.min} to {self.max}")
+        self.changes.append((number, weight))
+        index = self.index_of(number)
+        if index is not None and weight <= self.built_weights[index]:
+            self.pending.pop(number, None)
+            self.total_weight += weight - self.current_weights[index]
+            self.current_weights[index] = weight
+        elif index is None and weight == 0:
+            self.pending.pop(number, None)
+        else:
+            self.pending[number] = weight
+            self.stale = True
+
+    def exclude(self, numbers) -> None:
+        """Sets the weight of every number in an iterable to zero, e.g. new blacklist entries"""
+        for number in numbers:
+            if self.min <= number <= self.max:
+                self.set_weight(number, 0)
+
+    def draw_index(self) -> int:
+        """Returns the table slot of a weighted random member"""
+        if self.stale or self.total_weight < self.built_total/2:
+            self.rebuild()
+        while True:
+            index = self.random.randrange(0, self.size, 1)
+            if self.random.random() >= self.probability[index]:
+                index = self.alias[index]
+            built = self.built_weights[index]
+            current = self.current_weights[index]
+            if current == built or self.random.random()*built < current:
+                return index
+
+    def generate_number(self) -> str:
+        """Draws a weighted random number for the reel to display"""
+        #draw_index can rebuild the table, so members is read after it
+        index = self.draw_index()
+        return f"{self.members[index]:04d}"
+
+    def draw_winner(self) -> str:
+        """Draws a weighted random winner, the pool is not changed"""
+        index = self.draw_index()
+        return f"{self.members[index]:04d}"
+
+    def state(self) -> dict:
+        """Returns the Random state and weight changes as plain values that can be saved as JSON"""
+        return {"seed": self.seed, "random": self.random.getstate(),
+                "changes": list(self.changes), "built_changes": self.built_changes}
+
+    def restore(self, state: dict) -> None:
+        """Puts a generator just built over the same pool and weights back to a saved state
+
+        The changes the table was built with are made and the table rebuilt,
+        then the later changes are made without a rebuild, as they were.
+        """
+        changes, built_changes = state["changes"], state["built_changes"]
+        for number, weight in changes[:built_changes]:
+            self.set_weight(number, weight)
+        if built_changes:
+            self.rebuild()
+        for number, weight in changes[built_changes:]:
+            self.set_weight(number, weight)
+        version, internal_state, gauss_next = state["random"]
+        self.seed = state["seed"]
+        self.random.setstate((version, tuple(internal_state), gauss_next))
+
+    def regenerate(self) -> None:
+        """Display draws are independent, so there is nothing to reset"""
@@ -14,12 +14,22 @@ class WinWindow:
     def __init__(self, controller: tk.Frame, font, borderwidth: int, relief: str) -> None:
         self.frame = tk.Frame(controller, borderwidth=borderwidth, relief=relief)
         self.label = tk.Label(self.frame, font=font)
+        #Prize tier above the number, a quarter of the number's size
+        self.tier_font = font.copy()
+        self.tier_font["size"] = font["size"]//4
+        self.tier_label = tk.Label(self.frame, font=self.tier_font)
 
-    def show_winner(self, winning_number: str):
+    def show_winner(self, winning_number: str, tier: str = None):
         self.label["text"] = winning_number
         self.frame.place(relx = 0.5, rely = 0.45, anchor = "center", relheight= 0.6, relwidth = 0.9)
         self.label.place(relx = 0.5, rely = 0.5, anchor = "center")
+        if tier is not None:
+            self.tier_label["text"] = tier
+            self.tier_label.place(relx = 0.5, rely = 0.12, anchor = "center")
+        else:
+            self.tier_label.place_forget()
 
     def hide(self):
         self.frame.place_forget()
         self.label.place_forget()
+        self.tier_label.place_forget()
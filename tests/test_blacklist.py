@@ -0,0 +1,16 @@
+import logging
+
+from blacklist import load_blacklist
+
+
+def test_bad_cells_are_warned_about_once_per_parse(tmp_path, caplog):
+    blacklist_file = tmp_path / "blacklist.csv"
+    blacklist_file.write_text("1,abc,3-5\n")
+    with caplog.at_level(logging.WARNING, logger="blacklist"):
+        for _ in range(3):
+            index = load_blacklist(str(blacklist_file))
+    assert [record.getMessage() for record in caplog.records] == [
+        f"skipped blacklist cell 'abc' on line 1 of {blacklist_file}"]
+    #The cached index still lists the bad cell
+    assert index.errors == [(str(blacklist_file), 1, "abc")]
+    assert list(index.intervals(1, 10)) == [(1, 1), (3, 5)]
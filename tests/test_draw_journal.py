@@ -0,0 +1,54 @@
+import logging
+
+from draw_journal import DrawJournal
+
+
+def write_journal(path, winners):
+    journal = DrawJournal(str(path))
+    for draw, winner in enumerate(winners, start=1):
+        journal.append(1, 600, 598, 42, draw, "Prize 1", winner, timestamp=1000.0 + draw)
+    journal.close()
+
+
+def test_records_round_trip(tmp_path):
+    path = tmp_path / "draws.journal"
+    write_journal(path, [5, 9, 5])
+    journal = DrawJournal(str(path))
+    assert journal.records == 3
+    assert journal.last_wins == {5: 1003.0, 9: 1002.0}
+    assert [record[-2:] for record in journal.read_records()] == [("Prize 1", 5), ("Prize 1", 9), ("Prize 1", 5)]
+    assert 9 in journal.recent_winners(days=1, now=1002.0 + 3600)
+    assert 9 not in journal.recent_winners(days=1, now=1002.0 + 2*86400)
+
+
+def test_corrupt_record_is_skipped_and_later_records_kept(tmp_path, caplog):
+    path = tmp_path / "draws.journal"
+    write_journal(path, list(range(1, 11)))
+    data = bytearray(path.read_bytes())
+    data[len(DrawJournal.MAGIC) + 2*DrawJournal.RECORD_SIZE + 5] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    with caplog.at_level(logging.WARNING, logger="draw_journal"):
+        journal = DrawJournal(str(path))
+    assert journal.records == 9
+    assert sorted(journal.last_wins) == [1, 2, 4, 5, 6, 7, 8, 9, 10]
+    assert path.stat().st_size == len(data)
+    assert "skipped corrupt record 2" in caplog.text
+
+
+def test_partial_tail_is_truncated(tmp_path, caplog):
+    path = tmp_path / "draws.journal"
+    write_journal(path, [1, 2, 3])
+    whole = path.stat().st_size
+    with open(path, "ab") as journal_file:
+        journal_file.write(b"\1"*(DrawJournal.RECORD_SIZE//2))
+
+    with caplog.at_level(logging.WARNING, logger="draw_journal"):
+        journal = DrawJournal(str(path))
+    assert journal.records == 3
+    assert path.stat().st_size == whole
+    assert "truncating" in caplog.text
+
+    journal.append(1, 600, 598, 42, 4, "Prize 1", 4, timestamp=2000.0)
+    journal.close()
+    assert DrawJournal(str(path)).records == 4
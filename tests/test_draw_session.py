@@ -0,0 +1,38 @@
+from collections import Counter
+
+import pytest
+
+from draw_session import DrawSession
+
+
+def test_uniform_session_draws_distinct_winners_in_tier_order():
+    session = DrawSession(1, 50, [3, 7], DrawSession.numbered_tiers([3, 2]), seed=1)
+    drawn = [session.draw_winner() for _ in range(5)]
+    assert [tier for tier, number in drawn] == ["Prize 1"]*3 + ["Prize 2"]*2
+    numbers = [number for tier, number in drawn]
+    assert len(set(numbers)) == 5
+    assert not {"0003", "0007"} & set(numbers)
+    assert session.finished()
+
+
+def test_weighted_session_draws_distinct_winners():
+    weights = {number: number % 4 + 1 for number in range(1, 41)}
+    for seed in range(200):
+        session = DrawSession(1, 40, [5], [("a", 20), ("b", 19)], weights=weights, seed=seed)
+        numbers = [session.draw_winner()[1] for _ in range(39)]
+        assert len(set(numbers)) == 39, seed
+        assert "0005" not in numbers
+
+
+def test_weighted_session_never_draws_a_zero_weight_member():
+    winners = Counter()
+    for seed in range(500):
+        session = DrawSession(1, 6, [], [("a", 5)], weights={2: 0, 4: 3}, seed=seed)
+        winners.update(session.draw_winner()[1] for _ in range(5))
+    assert "0002" not in winners
+    assert set(winners) == {"0001", "0003", "0004", "0005", "0006"}
+
+
+def test_weighted_session_counts_zero_weight_members_as_ineligible():
+    with pytest.raises(ValueError):
+        DrawSession(1, 6, [], [("a", 6)], weights={2: 0})
@@ -0,0 +1,61 @@
+from frame_scheduler import FrameScheduler
+from quality_governor import QualityGovernor
+
+
+class SimulatedTk:
+    """Runs a FrameScheduler on a virtual clock, with a redraw of redraw seconds after every frame"""
+
+    def __init__(self, callback_time: float, redraw: float) -> None:
+        self.now = 0.0
+        self.callback_time = callback_time
+        self.redraw = redraw
+        self.due = None
+
+    def clock(self) -> float:
+        return self.now
+
+    def after(self, delay: int, callback) -> str:
+        #The redraw runs while Tk is idle, the timer can not fire before it is done
+        self.due = (self.now + max(delay/1000, self.redraw), callback)
+        return "frame"
+
+    def after_idle(self, callback) -> str:
+        self.due = (self.now, callback)
+        return "frame"
+
+    def after_cancel(self, after_id) -> None:
+        self.due = None
+
+    def work(self, dt: float) -> bool:
+        self.now += self.callback_time
+        return True
+
+    def run(self, frames: int) -> None:
+        for _ in range(frames):
+            self.now, callback = self.due
+            callback()
+
+
+def governed(callback_time: float, redraw: float, frames: int = 600) -> FrameScheduler:
+    tk = SimulatedTk(callback_time, redraw)
+    scheduler = FrameScheduler(tk, clock=tk.clock)
+    scheduler.governor = QualityGovernor(scheduler)
+    scheduler.register(tk.work)
+    tk.run(frames)
+    return scheduler
+
+
+def test_slow_redraw_steps_down_even_when_callbacks_are_fast():
+    assert governed(callback_time=0.0005, redraw=0.025).governor.level == 2
+
+
+def test_light_load_stays_at_full_quality():
+    scheduler = governed(callback_time=0.0005, redraw=0.004)
+    assert scheduler.governor.level == 0
+    assert scheduler.skipped_frames == 0
+
+
+def test_failed_steps_up_back_off():
+    scheduler = governed(callback_time=0.0005, redraw=0.025, frames=20000)
+    assert scheduler.governor.backoff == scheduler.governor.max_backoff
+    assert scheduler.skipped_frames < 100
@@ -0,0 +1,116 @@
+import json
+from random import Random
+
+import pytest
+
+from blacklist import BlacklistIndex
+from random_generator import RandomGenerator
+
+
+def eligible(ranges, blacklist) -> list:
+    """The pool worked out the slow way, every number in the ranges that is not blacklisted"""
+    numbers = {number for start, end in ranges for number in range(start, end + 1)}
+    return sorted(numbers - set(blacklist))
+
+
+def pool_of(ran_gen: RandomGenerator) -> list:
+    return sorted(int(ran_gen.number_at(slot)) for slot in range(ran_gen.size))
+
+
+def random_cases(count: int):
+    """Yields (min, max, blacklist) with blacklists at the ends, in runs and covering everything"""
+    random = Random(7)
+    yield 1, 1, []
+    yield 1, 5, [1, 2, 3, 4, 5]
+    yield 1, 20, [1, 20]
+    for _ in range(count):
+        low = random.randint(0, 50)
+        high = low + random.randint(0, 80)
+        blacklist = random.sample(range(low - 5, high + 6), random.randint(0, high - low + 5))
+        yield low, high, blacklist
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_pool_matches_brute_force(compact):
+    for low, high, blacklist in random_cases(200):
+        ran_gen = RandomGenerator(low, high, blacklist, compact=compact, seed=1)
+        expected = eligible([(low, high)], blacklist)
+        assert ran_gen.size == len(expected)
+        assert pool_of(ran_gen) == expected
+        if compact:
+            assert [int(ran_gen.select(rank)) for rank in range(ran_gen.size)] == expected
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_from_ranges_matches_brute_force(compact):
+    random = Random(3)
+    for _ in range(200):
+        ranges = []
+        for _ in range(random.randint(0, 5)):
+            start = random.randint(1, 100)
+            ranges.append((start, start + random.randint(0, 15)))
+        blacklist = random.sample(range(1, 120), random.randint(0, 40))
+        expected = eligible(ranges, blacklist)
+        ran_gen = RandomGenerator.from_ranges(ranges, BlacklistIndex.from_numbers(blacklist), compact=compact, seed=1)
+        assert pool_of(ran_gen) == expected
+        numbers = [number for start, end in ranges for number in range(start, end + 1)]
+        assert pool_of(RandomGenerator.from_numbers(numbers, blacklist, compact=compact)) == expected
+        low, high, excluded = RandomGenerator.ranges_eligibility(ranges, blacklist)
+        assert pool_of(RandomGenerator(low, high, excluded, compact=compact)) == expected
+
+
+def test_list_and_compact_pools_draw_the_same_numbers():
+    for low, high, blacklist in random_cases(50):
+        list_pool = RandomGenerator(low, high, blacklist, seed=11)
+        compact_pool = RandomGenerator(low, high, blacklist, compact=True, seed=11)
+        if list_pool.size == 0:
+            continue
+        #A reset leaves the list pool in its shuffled order but puts the compact pool back in rank order,
+        #so the draws only match up to the first reset
+        first_cycle = min(21, list_pool.size)
+        assert [list_pool.generate_number() for _ in range(first_cycle)] == \
+               [compact_pool.generate_number() for _ in range(first_cycle)]
+        list_pool, compact_pool = (RandomGenerator(low, high, blacklist, compact=compact, seed=12) for compact in (False, True))
+        assert [list_pool.draw_winner() for _ in range(50)] == [compact_pool.draw_winner() for _ in range(50)]
+        assert list_pool.sample(list_pool.size) == compact_pool.sample(compact_pool.size)
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_generate_number_never_repeats_before_the_pool_is_reset(compact):
+    for size in (1, 2, 5, 21, 22, 40):
+        ran_gen = RandomGenerator(1, size, [], compact=compact, seed=size)
+        drawn = []
+        for _ in range(500):
+            resets = ran_gen.count == 0 and ran_gen.available == ran_gen.size
+            if resets:
+                assert len(drawn) == len(set(drawn))
+                drawn = []
+            drawn.append(ran_gen.generate_number())
+            #Drawn numbers sit behind the boundary, the pool itself never changes
+            assert pool_of(ran_gen) == list(range(1, size + 1))
+            assert set(ran_gen.deleted_number_list) <= set(drawn)
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_draw_winner_ignores_the_available_boundary(compact):
+    ran_gen = RandomGenerator(1, 6, [3], compact=compact, seed=2)
+    for _ in range(4):
+        ran_gen.generate_number()
+    behind = set(ran_gen.deleted_number_list)
+    available, count = ran_gen.available, ran_gen.count
+    winners = {ran_gen.draw_winner() for _ in range(300)}
+    assert winners == {"0001", "0002", "0004", "0005", "0006"}
+    assert behind <= winners
+    assert (ran_gen.available, ran_gen.count) == (available, count)
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_state_round_trip_continues_the_same_draws(compact):
+    for drawn in (0, 3, 20, 21, 45):
+        ran_gen = RandomGenerator(1, 60, [4, 5, 30], compact=compact, seed=9)
+        for _ in range(drawn):
+            ran_gen.generate_number()
+        restored = RandomGenerator(1, 60, [4, 5, 30], compact=compact)
+        restored.restore(json.loads(json.dumps(ran_gen.state())))
+        assert restored.deleted_number_list == ran_gen.deleted_number_list
+        assert [restored.generate_number() for _ in range(100)] == [ran_gen.generate_number() for _ in range(100)]
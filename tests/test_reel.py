@@ -0,0 +1,102 @@
+from random import Random
+
+import pytest
+
+from reel import Reel
+
+
+class FakeCanvas:
+    """Keeps the x position of each box's tag, the only canvas state a Reel changes"""
+
+    def __init__(self) -> None:
+        self.x = {}
+
+    def move(self, tag, dx, dy) -> None:
+        for box_tag in self.x:
+            if tag in ("reel", box_tag):
+                self.x[box_tag] += dx
+
+
+class FakeBox:
+    def __init__(self, canvas: FakeCanvas, index: int, width: float, padding: float) -> None:
+        self.canvas = canvas
+        self.tag = f"box_{index}"
+        self.width = width
+        self.padding = padding
+        self.number = f"{index:04d}"
+        self.drawn = 0
+
+    def get_width(self) -> float:
+        return self.width
+
+    def get_padding(self) -> float:
+        return self.padding
+
+    def place_number(self, posx: float, posy: float) -> None:
+        self.canvas.x[self.tag] = posx
+
+    def wrap(self, distance: float, number: str = None) -> None:
+        self.drawn += 1
+        self.number = number if number is not None else f"x{self.drawn}"
+        self.canvas.move(self.tag, distance, 0)
+
+    def left(self) -> float:
+        return self.canvas.x[self.tag]
+
+
+def make_reel(width: float = 366.4, padding: float = 19, count: int = 7) -> Reel:
+    canvas = FakeCanvas()
+    reel = Reel(canvas, [FakeBox(canvas, index, width, padding) for index in range(count)])
+    reel.place(-width, 200)
+    return reel
+
+
+def test_box_arithmetic_matches_the_box_positions():
+    random = Random(4)
+    reel = make_reel()
+    for _ in range(300):
+        reel.move(random.uniform(0, 400))
+        assert reel.positions() == pytest.approx([box.left() for box in reel.numbers])
+        for _ in range(20):
+            x = random.uniform(-reel.box_width, 1920)
+            covering = [box for box in reel.numbers if box.left() <= x < box.left() + reel.box_width]
+            under = reel.box_under(x)
+            if under is None:
+                assert not covering or min(abs(x - box.left() - reel.box_width) for box in covering) < 1e-6
+            else:
+                assert covering == [under]
+            box, distance = reel.next_box(x)
+            right_of_x = [candidate for candidate in reel.numbers if candidate.left() > x]
+            assert box is min(right_of_x, key=FakeBox.left)
+            assert box.left() - distance == pytest.approx(x)
+
+
+def test_boxes_wrap_off_the_left_side_in_order():
+    reel = make_reel()
+    #The first box is placed just off the left side, so it wraps with the first pixel of movement
+    reel.move(reel.pitch*10 + 5)
+    assert reel.wraps == 11
+    assert reel.head == 11 % 7
+    assert min(box.left() for box in reel.numbers) > -reel.box_width
+    lefts = sorted(box.left() for box in reel.numbers)
+    assert [b - a for a, b in zip(lefts, lefts[1:])] == pytest.approx([reel.pitch]*6)
+
+
+def test_plan_landing_stops_the_scheduled_number_centred_on_x():
+    random = Random(5)
+    pointer_x = 960
+    for spin in range(200):
+        reel = make_reel()
+        reel.move(random.uniform(0, 3000))
+        min_distance = random.uniform(0, 20000)
+        distance = reel.plan_landing(pointer_x, min_distance, "WIN")
+        assert distance >= min_distance
+        travelled = 0
+        while travelled < distance:
+            step = min(random.uniform(1, 300), distance - travelled)
+            reel.move(step)
+            travelled += step
+        box = reel.box_under(pointer_x)
+        assert box.number == "WIN", spin
+        assert box.left() + reel.box_width/2 == pytest.approx(pointer_x)
+        assert not reel.scheduled_numbers
@@ -0,0 +1,69 @@
+import gzip
+import json
+
+import pytest
+
+from draw_session import DrawSession
+from random_generator import RandomGenerator
+from session_snapshot import SessionSnapshot
+from weighted_generator import WeightedGenerator
+
+WEIGHTS = {number: number % 4 + 1 for number in range(1, 21)}
+
+
+def saved_and_restored(session: DrawSession, weights=None) -> DrawSession:
+    """Saves a session through a snapshot file and restores it into a new session"""
+    state = json.loads(json.dumps(session.state()))
+    restored = DrawSession(1, 20, [7], [tuple(tier) for tier in state["tiers"]], weights, state["seed"])
+    restored.restore(state)
+    return restored
+
+
+@pytest.mark.parametrize("weights", [None, WEIGHTS])
+def test_restored_session_draws_the_same_winners(weights):
+    for seed in range(40):
+        for drawn in range(0, 19):
+            session = DrawSession(1, 20, [7], [("Prize 1", 10), ("Prize 2", 9)], weights, seed)
+            for _ in range(drawn):
+                session.draw_winner()
+            restored = saved_and_restored(session, weights)
+            assert restored.winners == session.winners
+            assert [restored.draw_winner() for _ in range(19 - drawn)] == \
+                   [session.draw_winner() for _ in range(19 - drawn)], (seed, drawn)
+
+
+def test_restored_generators_draw_the_same_numbers():
+    uniform = RandomGenerator(1, 600, [5, 6], compact=True, seed=3)
+    weighted = WeightedGenerator(1, 600, [5, 6], WEIGHTS, seed=3)
+    for _ in range(30):
+        uniform.generate_number()
+        weighted.generate_number()
+    weighted.exclude(range(1, 400))
+    restored_uniform = RandomGenerator(1, 600, [5, 6], compact=True)
+    restored_uniform.restore(json.loads(json.dumps(uniform.state())))
+    restored_weighted = WeightedGenerator(1, 600, [5, 6], WEIGHTS)
+    restored_weighted.restore(json.loads(json.dumps(weighted.state())))
+    assert [restored_uniform.generate_number() for _ in range(50)] == [uniform.generate_number() for _ in range(50)]
+    assert [restored_weighted.generate_number() for _ in range(50)] == [weighted.generate_number() for _ in range(50)]
+
+
+def test_snapshot_file_round_trip(tmp_path):
+    snapshot = SessionSnapshot(str(tmp_path / "session.snapshot"))
+    assert snapshot.load() is None
+    session = DrawSession(1, 20, [7], [("Prize 1", 3)], WEIGHTS, 5)
+    session.draw_winner()
+    snapshot.save({"session": session.state()})
+    snapshot.flush()
+    loaded = snapshot.load()
+    assert loaded["version"] == SessionSnapshot.VERSION
+    assert loaded["session"] == json.loads(json.dumps(session.state()))
+    snapshot.delete()
+    assert snapshot.load() is None
+
+
+def test_snapshot_of_another_version_is_ignored(tmp_path):
+    path = tmp_path / "session.snapshot"
+    path.write_bytes(gzip.compress(json.dumps({"version": 0}).encode()))
+    assert SessionSnapshot(str(path)).load() is None
+    path.write_bytes(b"not gzip")
+    assert SessionSnapshot(str(path)).load() is None
@@ -0,0 +1,32 @@
+import pytest
+
+from spin_curve import SpinCurve
+
+
+@pytest.mark.parametrize("distance, duration", [(12345.6, None), (500, 2.5), (30000, 8)])
+def test_spin_travels_exactly_distance_and_ends_at_rest(distance, duration):
+    curve = SpinCurve(distance, duration)
+    assert curve.position(-1) == 0
+    assert curve.position(0) == 0
+    assert curve.position(curve.duration) == distance
+    assert curve.position(curve.duration + 1) == distance
+    assert not curve.finished(curve.duration - 0.001)
+    assert curve.finished(curve.duration)
+    positions = [curve.position(frame/60) for frame in range(int(curve.duration*60) + 2)]
+    assert all(later >= earlier for earlier, later in zip(positions, positions[1:]))
+    end_speed = (distance - curve.position(curve.duration - 0.01))/0.01
+    start_speed = curve.position(0.01)/0.01
+    assert end_speed < start_speed/100
+
+
+def test_natural_spin_matches_the_free_spin():
+    #The free spin moves 150*2^(-0.6t) - 0.3 pixels per 16 ms until that reaches zero
+    elapsed, travelled, dt = 0.0, 0.0, 0.0005
+    while True:
+        elapsed += dt
+        dx = 150*pow(2, -0.6*elapsed) - 0.3
+        if dx <= 0:
+            break
+        travelled += dx*dt/0.016
+    assert SpinCurve.natural_duration() == pytest.approx(elapsed, abs=0.01)
+    assert SpinCurve.natural_distance() == pytest.approx(travelled, rel=0.001)
@@ -0,0 +1,14 @@
+import pytest
+
+from start_page import StartPage
+
+
+def test_parse_prize_tiers_reads_counts_in_order():
+    assert StartPage.parse_prize_tiers("3, 2,1") == [3, 2, 1]
+    assert StartPage.parse_prize_tiers("") == [1]
+
+
+@pytest.mark.parametrize("entry", ["0", "-2", "3,0", "2,x"])
+def test_parse_prize_tiers_rejects_counts_below_one(entry):
+    with pytest.raises(ValueError):
+        StartPage.parse_prize_tiers(entry)
@@ -0,0 +1,32 @@
+import logging
+from collections import Counter
+
+from draw_session import DrawSession
+from weighted_generator import WeightedGenerator, load_weights
+
+
+def test_zeroed_member_is_never_drawn_after_a_rebuild():
+    ran_gen = WeightedGenerator(1, 5, [], {1: 10}, seed=3)
+    ran_gen.set_weight(1, 0)
+    #Raising a weight makes the next draw rebuild the table without member 1
+    ran_gen.set_weight(2, 5)
+    draws = Counter(ran_gen.draw_winner() for _ in range(2000))
+    assert "0001" not in draws
+    assert set(draws) == {"0002", "0003", "0004", "0005"}
+
+
+def test_weighted_session_never_repeats_a_winner():
+    for seed in range(2000):
+        session = DrawSession(1, 5, [], [("a", 5)], weights={1: 10}, seed=seed)
+        winners = [session.draw_winner()[1] for _ in range(5)]
+        assert sorted(winners) == ["0001", "0002", "0003", "0004", "0005"], seed
+
+
+def test_load_weights_skips_malformed_rows(tmp_path, caplog):
+    weights_file = tmp_path / "weights.csv"
+    weights_file.write_text("number,weight\n1,3\n2\n\n3,lots\n4,-1\n5,2,9\n6,0.5\n")
+    with caplog.at_level(logging.WARNING, logger="weighted_generator"):
+        weights = load_weights(str(weights_file))
+    assert weights == {1: 3, 6: 0.5}
+    assert [record.getMessage().split(" on ")[1] for record in caplog.records] == [
+        f"line {line} of {weights_file}" for line in (3, 5, 6, 7)]